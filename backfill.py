@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+backfill.py (아카이브 피드 스냅샷 재실행 → 날짜별 다이제스트, scoring 가중치 / taxonomy 키워드 튜닝용)
+- 입력: 날짜별 스냅샷 디렉터리 (utils/replay.py 형식: <root>/<날짜>/manifest.json + 키워드별 XML,
+  bench/record_fixtures.py 로 녹화·합성). root 자체가 스냅샷이면 그것 하나
+  시간창 = 녹화 시각(created_at) - lookback_hours ~ 녹화 시각 (pubDate 평행 이동 없음)
+- 작업 단위 (날짜, 소분류)를 프로세스 풀에 흩뿌림
+    작업: 재생 수집 → 1차필터/파싱 → 소분류 dedupe → 사전 점수 → 선발 후보
+          (전역 URL 중복은 아직 모름 → 앞 소분류들이 가져갈 수 있는 K × 순번만큼 여유를 두고 보관)
+    병합(부모, 날짜·taxonomy 순서): 전역 URL 중복 제외 상위 K → 전역 제목 유사도 dedupe → 렌더
+  → 작업 분할·완료 순서와 무관하게 run_once(AI 끔)와 같은 기사 선발
+  소스가 여럿이면 소스 간 제목 지문 합치기가 소분류 순서에 의존하므로 날짜 단위로만 나눈다
+- AI 판정·요약·발송·상태 저장소(발송 이력)·캐시는 쓰지 않음 (휴리스틱 관련성)
+- 출력: <out>/<날짜>/digest.html, digest.txt, items.json, backfill.log + <out>/backfill_report.json
+
+    python backfill.py <스냅샷 root> [--out backfill_out] [--workers N] [--split minor|day] [--config config.yaml]
+"""
+
+import os, io, sys, json, time, argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import news_pipeline as npl
+from utils.config import load_config, get_runtime
+from utils.dedupe import dedupe_stream, dedupe_by_title_similarity
+from utils.render import render_digest
+from utils.replay import MANIFEST, load_manifest
+from utils.sources import sources_from_config
+
+REPORT_NAME = "backfill_report.json"
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    name: str           # 날짜(디렉터리 이름)
+    path: str
+    created_at: float   # 녹화 시각 epoch = 시간창 끝
+
+
+@dataclass
+class MinorResult:
+    mi: int
+    raw: int
+    deduped: int
+    candidates: list    # 선발 순서의 Article (전역 URL 중복 제외 전)
+
+
+def find_snapshots(root: str) -> list:
+    """root 아래 manifest.json 이 있는 디렉터리 (이름순). root 자체가 스냅샷이면 [root]"""
+    dirs = [root] if os.path.exists(os.path.join(root, MANIFEST)) else [
+        os.path.join(root, d) for d in sorted(os.listdir(root))
+        if os.path.exists(os.path.join(root, d, MANIFEST))]
+    out = []
+    for d in dirs:
+        created = load_manifest(d).get("created_at")
+        if created is None:
+            print(f"[WARN] {d}: manifest has no created_at → skipped")
+            continue
+        out.append(Snapshot(os.path.basename(os.path.normpath(d)), d, float(created)))
+    return out
+
+
+def backfill_config(path: str) -> dict:
+    """config.yaml → backfill 용 cfg (캐시 끔, 재생 시 pubDate 이동 없음). 프로세스 간 전달용으로 컴파일 결과 제외"""
+    cfg = {k: v for k, v in load_config(path).items() if not k.startswith("_")}
+    cfg["cache"] = dict(cfg.get("cache") or {}, enabled=False)
+    cfg["fetch"] = dict(cfg.get("fetch") or {}, replay_rebase=False)
+    return cfg
+
+
+def window(cfg, snap: Snapshot):
+    tz = get_runtime(cfg).app.tz
+    end_dt = datetime.fromtimestamp(snap.created_at, tz)
+    return end_dt - timedelta(hours=get_runtime(cfg).app.lookback_hours), end_dt
+
+
+# ----------------- 작업 (워커 프로세스) -----------------
+
+_CFG = None
+
+
+def _init_worker(cfg):
+    global _CFG
+    _CFG = cfg
+
+
+def run_task(snap: Snapshot, mis: list):
+    """스냅샷 1개의 소분류 mis → ([MinorResult], entries_raw, 로그, CPU 초). 출력은 로그로 모아 반환"""
+    t0 = time.process_time()
+    cfg = _CFG
+    cfg["fetch"]["replay_dir"] = snap.path      # 워커는 작업을 하나씩 처리 → 제자리 교체
+    rt = get_runtime(cfg)
+    start_dt, end_dt = window(cfg, snap)
+    mode = rt.app.selection_mode
+    k = rt.app.max_items_per_subcategory
+    taxonomy = cfg["taxonomy"]
+    log = io.StringIO()
+    results = []
+    with redirect_stdout(log):
+        sources = sources_from_config(cfg)
+        feeds = npl.fetch_feeds([taxonomy[mi] for mi in mis], cfg, sources=sources)
+        links = npl.resolve_links(feeds, cfg)
+        index = npl.EntryIndex(cfg, rt.app.tz, start_dt, end_dt, cross_source=len(sources) > 1, links=links)
+        index.plan_release([taxonomy[mi] for mi in mis], feeds, sources)
+        for i, mi in enumerate(mis):
+            tax = taxonomy[mi]
+            sel = npl.MinorSelection(tax, cfg, mode, cap=k * (mi + 1))
+            stream = dedupe_stream(sel.counted(npl.iter_minor_items(tax, feeds, index, sources)))
+            if mode in ("scored", "global"):
+                stream = npl.prescore_items(stream, tax["keywords"], cfg)
+            sel.feed(stream)
+            cands = [it for _, it in sel.keep.ranked()]
+            for it in cands:
+                it.hits = None          # 용어 스캔 결과(매처 참조)는 선발 후 쓰지 않음 → 전달 크기 절약
+            results.append(MinorResult(mi, sel.raw, sel.deduped, cands))
+            index.release(i)
+    return results, index.raw, log.getvalue(), time.process_time() - t0
+
+
+def plan_tasks(snaps, cfg, split: str) -> list:
+    """[(스냅샷, 소분류 번호 목록)]. split=minor 라도 소스가 여럿이면 날짜 단위"""
+    n = len(cfg["taxonomy"])
+    if split == "minor" and len(sources_from_config(cfg)) > 1:
+        print("[INFO] multiple sources → cross-source merge depends on minor order → split=day")
+        split = "day"
+    if split == "day":
+        return [(s, list(range(n))) for s in snaps]
+    return [(s, [mi]) for s in snaps for mi in range(n)]
+
+
+# ----------------- 병합 (부모) -----------------
+
+def merge_day(cfg, snap, results: dict):
+    """소분류 결과 {mi: MinorResult} → (grouped_clean, final, 소분류별 집계). taxonomy 순서로 확정"""
+    k = get_runtime(cfg).app.max_items_per_subcategory
+    grouped, stats, seen = {}, {}, set()
+    for mi, tax in enumerate(cfg["taxonomy"]):
+        r = results[mi]
+        kept = npl.take_unseen(r.candidates, k, seen)
+        grouped.setdefault(tax["major"], {})[tax["minor"]] = kept
+        stats[f"{tax['major']}/{tax['minor']}"] = {"raw": r.raw, "deduped": r.deduped, "kept": len(kept), "final": 0}
+    final = dedupe_by_title_similarity((it for minors in grouped.values() for its in minors.values() for it in its),
+                                       threshold=0.88, min_overlap=2)
+    grouped_clean = {}
+    for it in final:
+        grouped_clean.setdefault(it.major, {}).setdefault(it.minor, []).append(it)
+        stats[f"{it.major}/{it.minor}"]["final"] += 1
+    return grouped_clean, final, stats
+
+
+def write_day(out_dir, cfg, snap, grouped_clean, final, log_text):
+    d = os.path.join(out_dir, snap.name)
+    os.makedirs(d, exist_ok=True)
+    start_dt, end_dt = window(cfg, snap)
+    digest = render_digest(grouped_clean, cfg, start_dt, end_dt)
+    files = {"digest.html": digest.html, "digest.txt": digest.text, "backfill.log": log_text,
+             "items.json": json.dumps([{"major": it.major, "minor": it.minor, "title": it.title, "link": it.link,
+                                        "published": it.published_local, "base_score": it.base_score,
+                                        "pre_score": it.pre_score} for it in final], ensure_ascii=False, indent=1)}
+    for name, text in files.items():
+        with open(os.path.join(d, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def backfill(root, out_dir, cfg, workers=None, split="minor") -> dict:
+    """스냅샷 전체 재실행 → 리포트 dict (workers=1 이면 같은 작업을 이 프로세스에서 순서대로)"""
+    t0 = time.perf_counter()
+    snaps = find_snapshots(root)
+    tasks = plan_tasks(snaps, cfg, split)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    if workers == 1:
+        _init_worker(cfg)
+        outs = [run_task(s, mis) for s, mis in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cfg,)) as pool:
+            outs = list(pool.map(run_task, *zip(*tasks)))
+    work_secs = time.perf_counter() - t0
+
+    by_day = {s.name: {"results": {}, "raw": 0, "logs": [], "secs": 0.0} for s in snaps}
+    for (snap, _), (results, raw, log_text, secs) in zip(tasks, outs):
+        day = by_day[snap.name]
+        day["results"].update((r.mi, r) for r in results)
+        day["raw"] += raw
+        day["logs"].append(log_text)
+        day["secs"] += secs
+
+    report = {"root": root, "days": [], "minors": {}, "workers": workers, "split": split, "tasks": len(tasks)}
+    for snap in snaps:
+        day = by_day[snap.name]
+        grouped_clean, final, stats = merge_day(cfg, snap, day["results"])
+        write_day(out_dir, cfg, snap, grouped_clean, final, "".join(day["logs"]))
+        start_dt, end_dt = window(cfg, snap)
+        report["days"].append({"day": snap.name, "window": [start_dt.isoformat(), end_dt.isoformat()],
+                               "entries_raw": day["raw"], "final": len(final),
+                               "cpu_secs": round(day["secs"], 3), "minors": stats})
+        for minor, st in stats.items():
+            agg = report["minors"].setdefault(minor, {"raw": 0, "deduped": 0, "kept": 0, "final": 0})
+            for key in agg:
+                agg[key] += st[key]
+        print(f"[BACKFILL] {snap.name}: entries_raw={day['raw']}, final={len(final)}")
+    cpu_secs = sum(o[3] for o in outs)
+    # parallelism = 작업 CPU 시간 합 / 작업 구간 경과 시간 (코어를 몇 개분 썼는지)
+    report.update(wall_secs=round(time.perf_counter() - t0, 3), work_secs=round(work_secs, 3),
+                  cpu_secs=round(cpu_secs, 3),
+                  parallelism=round(cpu_secs / work_secs, 2) if work_secs else None)
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, REPORT_NAME), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    print(f"[BACKFILL] days={len(snaps)}, tasks={len(tasks)}, workers={workers}, "
+          f"wall={report['wall_secs']}s, cpu={report['cpu_secs']}s, parallelism={report['parallelism']} → {os.path.join(out_dir, REPORT_NAME)}")
+    return report
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("root", help="날짜별 스냅샷 디렉터리 (또는 스냅샷 1개)")
+    ap.add_argument("--out", default="backfill_out")
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--workers", type=int, default=0, help="프로세스 수 (0 = CPU 코어 수, 1 = 순차)")
+    ap.add_argument("--split", choices=("minor", "day"), default="minor", help="작업 단위")
+    args = ap.parse_args(argv)
+    if not os.path.isdir(args.root):
+        print(f"❌ {args.root}: not a directory")
+        return 1
+    backfill(args.root, args.out, backfill_config(args.config), workers=args.workers or None, split=args.split)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
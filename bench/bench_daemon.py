@@ -0,0 +1,105 @@
+# bench/bench_daemon.py
+"""
+상주 실행 벤치 (녹화/합성 RSS 재생 + OpenAIStub + FakeSMTP, 네트워크 없음)
+- cold : run_once() — 실행마다 세션/AI 클라이언트/상태/매처/파싱을 새로
+- warm : run_once(ctx) — WarmContext 재사용 (1회차는 자원 생성, 2회차부터 웜)
+- alert: 속보 알림 tick (1회차 = lookback 범위 전체, 2회차 = 새 기사 없음)
+- 웜 실행·알림 tick 은 APScheduler 처럼 매번 다른 스레드에서, ctx.close() 는 메인 스레드에서
+  (스레드에 묶인 자원이 있으면 여기서 예외)
+캐시/상태 저장소는 켠 채로 임시 디렉터리에서 실행
+
+    python -m bench.bench_daemon [--scale 1] [--fixtures DIR] [--ai-latency 0.05]
+"""
+import io, os, sys, json, time, shutil, argparse, tempfile, threading
+from contextlib import redirect_stdout
+
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.stubs import OpenAIStub, FakeSMTP
+from bench.record_fixtures import synthesize
+from utils.daemon import WarmContext, schedules_from_config
+
+
+def _timed(fn, verbose):
+    t0 = time.perf_counter()
+    with redirect_stdout(sys.stdout if verbose else io.StringIO()):
+        fn()
+    return round(time.perf_counter() - t0, 3)
+
+
+def _on_thread(fn):
+    """fn 을 새 스레드에서 실행 (예외는 호출한 스레드로 다시 발생)"""
+    out = {}
+
+    def run():
+        try:
+            out["value"] = fn()
+        except BaseException as ex:
+            out["error"] = ex
+
+    t = threading.Thread(target=run)
+    t.start()
+    t.join()
+    if "error" in out:
+        raise out["error"]
+    return out["value"]
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--config", default=os.path.join(ROOT, "config.yaml"))
+    ap.add_argument("--fixtures", help="녹화 픽스처 디렉터리 (없으면 합성)")
+    ap.add_argument("--scale", type=int, default=1)
+    ap.add_argument("--ai-latency", type=float, default=0.05)
+    ap.add_argument("-v", "--verbose", action="store_true")
+    args = ap.parse_args(argv)
+
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ.setdefault("GMAIL_USER", "bench@example.com")
+    os.environ.setdefault("GMAIL_PASS", "bench")
+    import news_pipeline as npl
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+    workdir = tempfile.mkdtemp(prefix="bench_daemon_")
+    fixtures = args.fixtures or synthesize(os.path.join(workdir, "rss"), cfg, scale=args.scale)
+    cfg.setdefault("fetch", {}).update(replay_dir=os.path.abspath(fixtures), replay_scale=1)
+    cfg.setdefault("cache", {}).update(enabled=True, dir=os.path.join(workdir, ".cache"))
+    cfg.setdefault("state", {})["enabled"] = True
+    alert = next((s for s in schedules_from_config(cfg) if s["kind"] == "alert"), None) or \
+        schedules_from_config({"daemon": {"schedules": [{"name": "price_alert", "kind": "alert"}]}})[0]
+
+    cwd = os.getcwd()
+    res = {}
+    try:
+        with OpenAIStub(latency=args.ai_latency) as stub, FakeSMTP.patch():
+            cfg.setdefault("openai", {})["base_url"] = stub.base_url
+            with open(os.path.join(workdir, "config.yaml"), "w", encoding="utf-8") as f:
+                yaml.safe_dump(cfg, f, allow_unicode=True)
+            os.chdir(workdir)
+            res["cold_run_once"] = [_timed(npl.run_once, args.verbose) for _ in range(2)]
+            shutil.rmtree(os.path.join(workdir, ".cache"), ignore_errors=True)   # 웜 측정은 같은 조건(빈 캐시)에서 시작
+            ctx = WarmContext("config.yaml")
+            try:
+                res["warm_run_once"] = [_on_thread(lambda: _timed(lambda: npl.run_once(ctx), args.verbose))
+                                        for _ in range(2)]
+                res["memo_entries"] = len(ctx.memo)
+                res["alert_tick"] = [_on_thread(lambda: _timed(lambda: npl.run_alert(ctx, alert), args.verbose))
+                                     for _ in range(2)]
+                with open("alert_report.json", "r", encoding="utf-8") as f:
+                    res["alert_counters"] = json.load(f)["counters"]
+            finally:
+                ctx.close()
+            res["ai_requests"] = stub.requests
+            res["mails"] = len(FakeSMTP.sent)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps(res, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
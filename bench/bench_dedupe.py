@@ -0,0 +1,79 @@
+# bench/bench_dedupe.py
+"""
+제목 dedupe 벤치마크 (100 ~ 20,000 제목)
+- 기존 O(n²) 전수 비교 구현 vs TitleDeduper 엔진
+- 기존 구현은 느리므로 --ref-max 이하 크기에서만 실행하고, 실행한 크기에서는 결과 동일성 확인
+
+  python -m bench.bench_dedupe [--ref-max 2000]
+"""
+import sys, time, random
+
+from utils.dedupe import dedupe_items, dedupe_by_title_similarity, is_similar_title, is_duplicate_by_overlap, normalize_url
+
+SIZES = (100, 500, 1000, 2000, 5000, 10000, 20000)
+
+
+def _ref_dedupe_items(items):
+    """기존 dedupe_items (남긴 제목 전체와 쌍별 비교)"""
+    seen_urls, result = set(), []
+    for it in items:
+        nu = normalize_url(it["link"])
+        if nu in seen_urls:
+            continue
+        t = (it.get("title") or "").strip()
+        if any(is_similar_title(t, (p.get("title") or "").strip(), threshold=0.88) or
+               is_duplicate_by_overlap(t, (p.get("title") or "").strip(), min_overlap=2) for p in result):
+            continue
+        seen_urls.add(nu)
+        result.append(it)
+    return result
+
+
+def _ref_global(items, threshold=0.88, min_overlap=2):
+    result, seen = [], []
+    for it in items:
+        t = (it.get("title") or "").strip()
+        if not any(is_similar_title(t, s, threshold=threshold) or is_duplicate_by_overlap(t, s, min_overlap=min_overlap) for s in seen):
+            result.append(it)
+            seen.append(t)
+    return result
+
+
+def synth_items(n, seed=0):
+    """뉴스 제목 유사 합성 데이터: 고유 어휘 조합 + 일부 변형 중복"""
+    rnd = random.Random(seed)
+    vocab = [f"{a}{b}" for a in "가나다라마바사아자차카타파하" for b in "유가경휘발등중항공정제수협해운철도"]
+    items = []
+    for i in range(n):
+        if items and rnd.random() < 0.25:
+            base = items[rnd.randrange(len(items))]["title"]
+            title = base + rnd.choice([" 종합", " (속보)", "…", " - 연합뉴스"])
+        else:
+            title = " ".join(rnd.sample(vocab, rnd.randint(4, 9)))
+        items.append({"title": title, "link": f"https://news.google.com/rss/articles/{i}?utm_source=x"})
+    return items
+
+
+def main():
+    ref_max = 2000
+    if "--ref-max" in sys.argv:
+        ref_max = int(sys.argv[sys.argv.index("--ref-max") + 1])
+    print(f"{'n':>6} {'stage':>7} {'kept':>6} {'engine s':>9} {'ref s':>8} {'speedup':>8}")
+    for n in SIZES:
+        items = synth_items(n)
+        for stage, fn, ref in (("minor", dedupe_items, _ref_dedupe_items),
+                               ("global", lambda x: dedupe_by_title_similarity(x, threshold=0.88, min_overlap=2), _ref_global)):
+            t0 = time.perf_counter()
+            out = fn(items)
+            t1 = time.perf_counter()
+            ref_s, speed = "-", "-"
+            if n <= ref_max:
+                expected = ref(items)
+                t2 = time.perf_counter()
+                assert [id(x) for x in out] == [id(x) for x in expected], f"결과 불일치 (n={n}, {stage})"
+                ref_s, speed = f"{t2 - t1:.3f}", f"{(t2 - t1) / max(t1 - t0, 1e-9):.1f}x"
+            print(f"{n:>6} {stage:>7} {len(out):>6} {t1 - t0:>9.3f} {ref_s:>8} {speed:>8}")
+
+
+if __name__ == "__main__":
+    main()
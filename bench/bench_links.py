@@ -0,0 +1,143 @@
+# bench/bench_links.py
+"""
+링크 해석 벤치 (로컬 리다이렉트 스탠드인, 네트워크 없음)
+- decode : 구형 Google News 토큰 오프라인 디코드 (건당 µs, 요청 없음)
+- head   : 디코드 불가 토큰 → 로컬 서버가 302 로 원문에 보냄. 동시 HEAD(concurrency) vs 순차(1), 재실행은 캐시 적중
+- effect : 같은 기사가 다른 토큰으로 여러 번 실린 피드 + 차단 도메인 기사 → EntryIndex 고유 키 / 차단 수 비교
+            (해석 전: 토큰마다 별개 기사, 차단 도메인 미검출 / 해석 후: URL 로 합쳐지고 파싱 전에 차단)
+
+    python -m bench.bench_links --links 200 --latency-ms 40
+"""
+import sys, json, time, base64, argparse, tempfile, threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytz
+
+import news_pipeline as npl
+from utils.config import compile_config
+from utils.links import LinkResolver, decode_gnews_token
+from utils.matcher import SCORING_GROUPS
+from utils.metrics import reset_metrics
+
+
+def legacy_token(url: str) -> str:
+    """구형 토큰 형식으로 인코딩 (08 13 22 <len> url d2 01 00)"""
+    raw = url.encode("utf-8")
+    n = len(raw)
+    ln = bytes([n]) if n < 0x80 else bytes([(n & 0x7F) | 0x80, n >> 7])
+    return base64.urlsafe_b64encode(b"\x08\x13\x22" + ln + raw + b"\xd2\x01\x00").decode().rstrip("=")
+
+
+def opaque_token(i: int) -> str:
+    return "AU_yqL" + base64.urlsafe_b64encode(f"opaque-{i:05d}".encode()).decode().rstrip("=")
+
+
+class _Redirect(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def log_message(self, *a):
+        pass
+
+    def _reply(self):
+        time.sleep(self.latency)
+        if self.path.startswith("/rss/articles/"):
+            tok = self.path.split("/")[-1].split("?")[0]
+            self.send_response(302)
+            self.send_header("Location", f"http://localhost:{self.server.server_port}/news/{tok[-8:]}")   # 다른 호스트명 = 원문
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_HEAD = do_GET = _reply
+
+
+def bench_decode(n):
+    toks = [legacy_token(f"https://www.yna.co.kr/view/AKR2025{i:08d}") for i in range(n)]
+    t0 = time.perf_counter()
+    ok = sum(decode_gnews_token(t) is not None for t in toks)
+    secs = time.perf_counter() - t0
+    return {"tokens": n, "decoded": ok, "us_per_token": round(secs / n * 1e6, 2)}
+
+
+def bench_head(n, latency, concurrency):
+    _Redirect.latency = latency
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Redirect)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    host = f"127.0.0.1:{srv.server_port}"
+    links = [f"http://{host}/rss/articles/{opaque_token(i)}?oc=5" for i in range(n)]
+    out = {}
+    with tempfile.TemporaryDirectory() as d:
+        for name, conc in (("serial", 1), ("concurrent", concurrency), ("cached", concurrency)):
+            reset_metrics()
+            cfg = {"cache": {"enabled": name != "serial", "dir": d},
+                   "links": {"hosts": [host], "concurrency": conc, "deadline_secs": 120}}
+            r = LinkResolver(cfg)
+            t0 = time.perf_counter()
+            got = r.resolve(links)
+            secs = time.perf_counter() - t0
+            out[name] = {"secs": round(secs, 3), "resolved": len(got), "head": r.via_head, "cache_hits": r.cache.hits}
+            r.close()
+    srv.shutdown()
+    out["speedup"] = round(out["serial"]["secs"] / out["concurrent"]["secs"], 1)
+    return out
+
+
+def bench_effect(n):
+    """n 개 기사 × 3 토큰(신디케이션) + 기사 10% 는 차단 도메인"""
+    tz = pytz.timezone("Asia/Seoul")
+    now = datetime.now(tz)
+    pub = (now - timedelta(minutes=5)).astimezone(pytz.utc).timetuple()
+    cfg = {"app": {"timezone": "Asia/Seoul", "lookback_hours": 24, "max_items_per_subcategory": 5},
+           "sources": {"google_news": {"base": "http://127.0.0.1/rss/search", "hl": "ko", "gl": "KR", "ceid": "KR:ko"}},
+           "filters": {"block_domains": ["blog.naver.com"]},
+           "scoring": {g: {"terms": [], "weight": 1} for g in SCORING_GROUPS},
+           "taxonomy": [{"major": "m", "minor": "n", "keywords": ["경유"]}]}
+    compile_config(cfg)
+    entries = []
+    for i in range(n):
+        host = "blog.naver.com" if i % 10 == 0 else "www.yna.co.kr"
+        for v in range(3):   # 같은 원문, 다른 토큰 (utm 파라미터만 다름)
+            url = f"https://{host}/view/{i}?utm_source=gn{v}"
+            entries.append({"title": f"경유 기사 {i} - 매체{v}", "link": f"https://news.google.com/rss/articles/{legacy_token(url)}?oc=5",
+                            "summary": "", "published_parsed": pub})
+    entries = [_Entry(e) for e in entries]
+    out = {}
+    for name, resolve in (("redirect_links", False), ("resolved", True)):
+        reset_metrics()
+        links = LinkResolver(cfg).resolve(e["link"] for e in entries) if resolve else {}
+        index = npl.EntryIndex(cfg, tz, now - timedelta(hours=24), now, links=links)
+        t0 = time.perf_counter()
+        kept = sum(index.add(e, "m", "n") is not None for e in entries)
+        secs = time.perf_counter() - t0
+        blocked = sum(1 for r in index.records.values() if r == "domain")
+        out[name] = {"entries": len(entries), "unique_keys": index.unique, "blocked_domain": blocked,
+                     "articles_out": kept, "index_ms": round(secs * 1000, 1)}
+    return out
+
+
+class _Entry(dict):
+    """feedparser entry 흉내 (published_parsed 속성 접근)"""
+    __getattr__ = dict.get
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--links", type=int, default=200)
+    ap.add_argument("--latency-ms", type=float, default=40.0, help="스탠드인 HEAD 응답 지연")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--out")
+    args = ap.parse_args(argv)
+    res = {"decode": bench_decode(10000),
+           "head": bench_head(args.links, args.latency_ms / 1000, args.concurrency),
+           "effect": bench_effect(args.links)}
+    text = json.dumps(res, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,142 @@
+# bench/bench_local_model.py
+"""
+로컬 관련성 분류기 벤치 (로컬 OpenAIStub 가 AI 판정 역할, 네트워크 없음, numpy 필요)
+- collect : 기사 --train 건을 RelevanceEngine(API 만)으로 판정 → 판정 로그 생성
+- train   : 판정 로그로 학습 (--train-local-model 과 같은 경로) → holdout 일치율
+- serve   : 새 기사 --serve 건을 API 만 vs 로컬 분류기 + 애매한 것만 API 로 판정 → 요청 수·시간·AI 판정과의 일치율
+- select  : 같은 기사를 소분류 bucket 하나로 MinorSelection(scored, AI 예산 --budget)에 흘림
+            → AI / 로컬 / 휴리스틱 으로 관련성이 정해진 기사 수 (로컬이 bucket 전체를 보고 애매한 것만 예산을 쓰는지)
+- predict : 소분류 bucket 크기(--batch) 배치 1회 점수 계산 시간
+- 기사는 설정 용어 + 일반 어휘를 섞어 만든 합성 제목·요약 (stub 판정 규칙은 bench.stubs.RELEVANT_HINTS)
+
+    python -m bench.bench_local_model --train 1500 --serve 500 --latency-ms 300 [--budget 40]
+"""
+import os, sys, json, time, random, argparse, tempfile
+from unittest import mock
+
+import news_pipeline as npl
+from bench.stubs import OpenAIStub, _judge
+from utils.article import Article
+from utils.config import load_config, get_runtime
+from utils.local_model import _np, train_from_log, load_local_model, read_log, log_file
+from utils.metrics import reset_metrics
+from utils.relevance import RelevanceEngine
+
+SUBJECTS = ["정부", "한국석유공사", "정유4사", "항공업계", "해운업계", "지자체", "조달청", "산업부", "서울시", "수협",
+            "여당", "야당", "연예기획사", "프로야구 구단", "경찰", "대학", "반도체 업계", "완성차 업계", "OPEC+", "한전"]
+OBJECTS = ["국제유가", "정제마진", "경유 가격", "휘발유 판매", "항공유 수요", "등유 재고", "아스팔트 발주", "입찰 공고",
+           "물동량", "여객 수송", "어획량", "난방 수요", "선거 공약", "드라마 촬영", "교통사고", "신작 게임", "주가",
+           "채용 박람회", "축제", "전기요금"]
+VERBS = ["상승", "하락", "확대", "감소", "발표", "검토", "연장", "급등", "회복", "논란"]
+TAILS = ["전망", "업계 촉각", "다음 달 시행", "3주 연속", "하반기 변수", "현장 점검", "관계자 설명", "시장 반응"]
+
+
+def corpus(n, seed):
+    rnd = random.Random(seed)
+    out = []
+    for i in range(n):
+        title = f"{rnd.choice(SUBJECTS)}, {rnd.choice(OBJECTS)} {rnd.choice(VERBS)} {rnd.choice(TAILS)}"
+        summary = f"{rnd.choice(SUBJECTS)} {rnd.choice(OBJECTS)} {rnd.choice(VERBS)} #{i}"
+        out.append(f"{title}. {summary}")
+    return out
+
+
+def _cfg(stub, cache_dir, **openai):
+    cfg = load_config()
+    cfg["cache"] = {"enabled": True, "dir": cache_dir}
+    cfg["openai"] = dict(cfg["openai"], api_key_env="BENCH_OPENAI_KEY", base_url=stub.base_url,
+                         relevance_rpm=6000, relevance_concurrency=8, **openai)
+    return cfg
+
+
+def _run(stub, cfg, texts):
+    reset_metrics()
+    engine = RelevanceEngine(cfg)
+    before = stub.requests
+    t0 = time.perf_counter()
+    scores = engine.classify(texts)
+    secs = time.perf_counter() - t0
+    engine.flush()
+    thr = get_runtime(cfg).relevance_threshold
+    agree = sum((s >= thr) == _judge(t)["relevant"] for s, t in zip(scores, texts))
+    res = {"secs": round(secs, 3), "requests": stub.requests - before, "local_decided": engine.local_decided,
+           "agreement_with_ai": round(agree / len(texts), 4)}
+    engine.close()
+    return res
+
+
+def _select(stub, cfg, texts, budget):
+    """texts 를 소분류 bucket 하나(scored 모드, AI 예산 budget)로 선발 → 관련성 판정 출처별 기사 수"""
+    reset_metrics()
+    engine = RelevanceEngine(cfg)
+    matcher = get_runtime(cfg).matcher
+    tax = cfg["taxonomy"][0]
+    items = []
+    for i, t in enumerate(texts):
+        title, summary = t.split(". ", 1)
+        it = Article(title, f"https://example.com/a/{i}", summary, key=f"a{i}", hits=matcher.scan(t))
+        it.pre_score = float(len(texts) - i)
+        items.append(it)
+    before = stub.requests
+    sel = npl.MinorSelection(tax, cfg, "scored", cap=len(texts), engine=engine, ai_cap=budget)
+    sel.feed(iter(items))
+    ai = sel.classify_pending()
+    engine.flush()
+    engine.close()
+    return {"bucket": sel.deduped, "ai": ai, "local": sel.local_decided, "cached": sel.ai_cached,
+            "heuristic": sel.deduped - ai - sel.local_decided - sel.ai_cached, "requests": stub.requests - before}
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--train", type=int, default=1500)
+    ap.add_argument("--serve", type=int, default=500)
+    ap.add_argument("--batch", type=int, default=60, help="predict 배치 크기 (소분류 bucket)")
+    ap.add_argument("--latency-ms", type=float, default=300.0, help="stub 요청당 지연")
+    ap.add_argument("--budget", type=int, default=40, help="select: 소분류 AI 판정 예산 (relevance_max_checks)")
+    ap.add_argument("--out")
+    args = ap.parse_args(argv)
+    if _np() is None:
+        print("[SKIP] numpy is not installed")
+        return
+
+    res = {}
+    with OpenAIStub(latency=args.latency_ms / 1000) as stub, tempfile.TemporaryDirectory() as d, \
+            mock.patch.dict(os.environ, {"BENCH_OPENAI_KEY": "x"}):
+        collect = _cfg(stub, d)
+        res["collect"] = _run(stub, collect, corpus(args.train, 1))
+        res["collect"]["logged"] = len(read_log(log_file(collect)))
+        t0 = time.perf_counter()
+        train_from_log(collect)
+        res["train_secs"] = round(time.perf_counter() - t0, 2)
+
+        serve = corpus(args.serve, 2)
+        for name, local in (("api_only", False), ("local_model", True)):
+            with tempfile.TemporaryDirectory() as fresh:        # 판정 캐시는 비우고 모델만 공유
+                cfg = _cfg(stub, fresh, local_model=local, local_model_path=os.path.join(d, "relevance_model.npz"))
+                res[name] = _run(stub, cfg, serve)
+        res["requests_saved"] = round(1 - res["local_model"]["requests"] / max(res["api_only"]["requests"], 1), 3)
+        for name, local in (("select_api_only", False), ("select_local_model", True)):
+            with tempfile.TemporaryDirectory() as fresh:
+                cfg = _cfg(stub, fresh, local_model=local, local_model_path=os.path.join(d, "relevance_model.npz"))
+                res[name] = _select(stub, cfg, serve, args.budget)
+
+        model = load_local_model(dict(collect, openai=dict(collect["openai"], local_model=True)))
+        batch = serve[:args.batch]
+        matcher = get_runtime(collect).matcher
+        model.predict(batch, matcher)
+        t0 = time.perf_counter()
+        for _ in range(20):
+            model.predict(batch, matcher)
+        res["predict_ms_per_batch"] = round((time.perf_counter() - t0) / 20 * 1000, 2)
+        res["holdout"] = model.meta.get("holdout")
+
+    text = json.dumps(res, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,86 @@
+# bench/bench_mail.py
+"""
+메일 발송 벤치 (로컬 SMTPStub, 네트워크 없음)
+- fan-out: 수신자 N 명에게 수신자별 다이제스트 발송
+    reuse  : 인증된 연결 1개 재사용 (email.max_per_connection 기본값)
+    naive  : 메시지마다 연결·인증 (max_per_connection=1, 기존 send_email 과 같은 왕복 수)
+- faults: 연결 중간 끊김(drop_after) + 수신자 거부(refuse) 상황에서 재연결/수신자별 결과 확인
+    python -m bench.bench_mail --recipients 40 --handshake-ms 80
+"""
+import sys, json, time, argparse, statistics
+
+from bench.stubs import SMTPStub
+from utils.mailer import mail_settings, plan_digests, send_digests
+from utils.metrics import reset_metrics
+
+HTML = "<html><body>" + "<div>뉴스 카드</div>" * 200 + "</body></html>"
+
+
+def _cfg(stub, rcpts, **email):
+    return {"email": {
+        "smtp_host": "127.0.0.1", "smtp_port": stub.port, "use_tls": False,
+        "username": "bench@example.com", "password_env": "BENCH_SMTP_PASS",
+        "from_name": "bench", "to_addrs": rcpts, "delivery": "per_recipient",
+        "retries": 2, "retry_backoff_secs": 0.01, "timeout_secs": 5, **email,
+    }}
+
+
+def _run(stub, cfg):
+    m = reset_metrics()
+    st = mail_settings(cfg)
+    st["password"] = "x"        # 로컬 stub 인증용 (환경변수 무관)
+    t0 = time.perf_counter()
+    report = send_digests(st, plan_digests(st, HTML))
+    secs = time.perf_counter() - t0
+    lat = m.samples.get("mail.latency", [])
+    return {
+        "secs": round(secs, 4),
+        "msgs_per_sec": round(len(report.messages) / secs, 1) if secs else None,
+        "connects": report.connects,
+        "server_connections": stub.connections,
+        "delivered": report.delivered,
+        "failures": {r: s for r, (s, _) in report.failures().items()},
+        "latency_p50_ms": round(statistics.median(lat) * 1000, 2) if lat else None,
+        "retries": m.counters.get("mail.retries", 0),
+    }
+
+
+def bench_fanout(n, handshake, latency):
+    rcpts = [f"user{i:03d}@example.com" for i in range(n)]
+    out = {}
+    for name, extra in (("naive", {"max_per_connection": 1}), ("reuse", {})):
+        with SMTPStub(latency=latency, handshake_latency=handshake) as stub:
+            out[name] = _run(stub, _cfg(stub, rcpts, **extra))
+    out["speedup"] = round(out["naive"]["secs"] / out["reuse"]["secs"], 2) if out["reuse"]["secs"] else None
+    return out
+
+
+def bench_faults(n, handshake):
+    rcpts = [f"user{i:03d}@example.com" for i in range(n)]
+    refuse = rcpts[3:5]
+    with SMTPStub(handshake_latency=handshake, refuse=refuse, drop_after=7) as stub:
+        res = _run(stub, _cfg(stub, rcpts))
+    res["expected_refused"] = refuse
+    return res
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--recipients", type=int, default=40)
+    ap.add_argument("--handshake-ms", type=float, default=50.0, help="연결+인증 왕복 지연 흉내")
+    ap.add_argument("--latency-ms", type=float, default=2.0, help="메시지당 DATA 처리 지연")
+    ap.add_argument("--out")
+    args = ap.parse_args(argv)
+    res = {
+        "fanout": bench_fanout(args.recipients, args.handshake_ms / 1000, args.latency_ms / 1000),
+        "faults": bench_faults(min(args.recipients, 20), args.handshake_ms / 1000),
+    }
+    text = json.dumps(res, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
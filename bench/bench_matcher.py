@@ -0,0 +1,80 @@
+# bench/bench_matcher.py
+"""
+용어 매칭 마이크로 벤치마크: 용어별 `in` 반복 스캔 vs Aho–Corasick 1회 스캔
+- 용어 수를 config 기준 x1 ~ x32 로 늘려 가며 기사 1건당 처리 시간 비교
+- 점수 동일성(기존 compute_score 방식)도 함께 확인
+
+  python -m bench.bench_matcher
+"""
+import random, time
+
+import yaml
+
+from utils.matcher import compile_matcher, SCORING_GROUPS
+from utils.scoring import compute_score
+
+
+def _naive_score(text, cfg):
+    """기존 compute_score 구현 (용어마다 lower() + 부분문자열 검사)"""
+    tl = (text or "").lower()
+    S = 0.0
+    S += cfg["scoring"].get("base", 0.0)
+    for g in SCORING_GROUPS:
+        S += cfg["scoring"][g]["weight"] * sum(1 for t in cfg["scoring"][g]["terms"] if t.lower() in tl)
+    return S
+
+
+def _naive_scan(text, cfg):
+    low = text.lower()
+    score = _naive_score(text, cfg)
+    blocked = any(w.lower() in low for w in cfg["filters"].get("block_keywords", []))
+    sig = cfg["scoring"]
+    rel = any(t.lower() in low for g in ("price_signals", "demand_signals", "ops_supply_signals")
+              for t in sig[g]["terms"])
+    return score, blocked, rel
+
+
+def _ac_scan(text, cfg, m):
+    hits = m.scan(text)
+    return compute_score(text, cfg, hits=hits), hits.any("block_keywords"), (
+        hits.any("price_signals") or hits.any("demand_signals") or hits.any("ops_supply_signals"))
+
+
+def _grow(cfg, factor, rnd):
+    """용어 목록을 factor 배로 늘린 설정 (원 용어 + 무작위 합성 용어)"""
+    syll = "가나다라마바사아자차카타파하유가경휘발등중항공정제"
+    out = {**cfg, "scoring": {k: (dict(v) if isinstance(v, dict) else v) for k, v in cfg["scoring"].items()},
+           "filters": dict(cfg["filters"])}
+    for g in SCORING_GROUPS:
+        terms = list(cfg["scoring"][g]["terms"])
+        extra = ["".join(rnd.choice(syll) for _ in range(rnd.randint(3, 6))) for _ in range(len(terms) * (factor - 1))]
+        out["scoring"][g]["terms"] = terms + extra
+    bk = list(cfg["filters"].get("block_keywords", []))
+    out["filters"]["block_keywords"] = bk + ["".join(rnd.choice(syll) for _ in range(4)) for _ in range(len(bk) * (factor - 1))]
+    return out
+
+
+def main():
+    with open("config.yaml", "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+    rnd = random.Random(0)
+    words = [t for g in SCORING_GROUPS for t in cfg["scoring"][g]["terms"]] + \
+            "국내 업계 발표 전망 기자 오늘 시장 확대 감소 증가 정부 지원 대책".split()
+    texts = [" ".join(rnd.choice(words) for _ in range(rnd.randint(8, 30))) for _ in range(2000)]
+
+    print(f"{'factor':>6} {'terms':>6} {'naive us/doc':>13} {'ac us/doc':>10} {'speedup':>8}")
+    for factor in (1, 2, 4, 8, 16, 32):
+        c = _grow(cfg, factor, rnd)
+        m = compile_matcher(c)
+        t0 = time.perf_counter()
+        ref = [_naive_scan(t, c) for t in texts]
+        t1 = time.perf_counter()
+        got = [_ac_scan(t, c, m) for t in texts]
+        t2 = time.perf_counter()
+        assert ref == got, "AC 결과가 기존 스캔과 다름"
+        n = len(texts)
+        print(f"{factor:>6} {len(m.pattern_ids):>6} {(t1 - t0) / n * 1e6:>13.1f} {(t2 - t1) / n * 1e6:>10.1f} {(t1 - t0) / (t2 - t1):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# bench/bench_render.py
+"""
+다이제스트 렌더링 벤치마크 (10 ~ 5,000 기사)
+- 기존 f-string 이어붙이기 구현 vs Jinja2 템플릿(render_digest, 예산 없음 / 기본 예산)
+- 예산 적용 시 HTML 크기가 max_html_bytes 이하인지, 노출/생략 건수 확인
+
+  python -m bench.bench_render [--repeat 5]
+"""
+import sys, time, random
+from datetime import datetime, timedelta
+
+import pytz
+import yaml
+
+from utils.article import Article
+from utils.render import render_digest, DEFAULT_MAX_BYTES
+
+SIZES = (10, 100, 500, 1000, 2000, 5000)
+
+
+def _ref_html(grouped, start_dt, end_dt):
+    """기존 make_html_email (escape 없음, text/plain 없음)"""
+    head = f"""
+    <html><body style="font-family:Arial,Helvetica,sans-serif;">
+      <h2> [이원호 사원의 특수영업팀 일일 정유 뉴스] ({start_dt.strftime('%Y-%m-%d %H:%M')} ~ {end_dt.strftime('%Y-%m-%d %H:%M')} KST)</h2>
+      <p style="color:#666;">수요/가격 변동에 직결된 기사 위주로 선별했습니다. (게시 시각 표기)</p>
+    """
+    cards = []
+    for major, minors in grouped.items():
+        cards.append(f'<h3 style="border-bottom:2px solid #eee;padding-bottom:4px;">{major}</h3>')
+        for minor, items in minors.items():
+            if not items:
+                continue
+            cards.append(f'<h4 style="margin:10px 0 6px 0;color:#0a4;">{minor}</h4>')
+            for it in items:
+                posted = it.get("published_local", "시간 정보 없음")
+                cards.append(f"""
+                <div style="border:1px solid #eee;border-radius:10px;padding:12px;margin:8px 0;">
+                  <div style="color:#888;font-size:0.9em;margin-bottom:4px;">📅 {posted}</div>
+                  <div style="font-weight:600;margin-bottom:10px;">{it['title']}</div>
+                  <a style="display:inline-block;background:#1565C0;color:#fff;padding:8px 12px;border-radius:6px;text-decoration:none;"
+                     href="{it['link']}" target="_blank" rel="noopener">원문 보기</a>
+                </div>
+                """)
+    return head + "\n".join(cards) + "</body></html>"
+
+
+def synth_grouped(cfg, n, tz, seed=0):
+    """taxonomy 소분류에 n 건을 고르게 배분 (제목에 &, < 포함 일부)"""
+    rnd = random.Random(seed)
+    vocab = "유가 정제마진 경유 휘발유 항공유 등유 중유 아스팔트 입찰 조달 수요 가격 인상 인하 재고 S&P <속보> OPEC+".split()
+    now = datetime.now(tz).timestamp()
+    grouped = {}
+    taxonomy = cfg["taxonomy"]
+    for i in range(n):
+        tax = taxonomy[i % len(taxonomy)]
+        it = Article(title=" ".join(rnd.sample(vocab, 6)) + f" {i}",
+                     link=f"https://news.google.com/rss/articles/R{i:06d}?oc=5&hl=ko",
+                     ts=now - rnd.uniform(0, 86400), tz=tz, major=tax["major"], minor=tax["minor"])
+        grouped.setdefault(it.major, {}).setdefault(it.minor, []).append(it)
+    return grouped
+
+
+def _time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, out
+
+
+def main():
+    repeat = 5
+    if "--repeat" in sys.argv:
+        repeat = int(sys.argv[sys.argv.index("--repeat") + 1])
+    with open("config.yaml", "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+    tz = pytz.timezone(cfg["app"]["timezone"])
+    end_dt = datetime.now(tz)
+    start_dt = end_dt - timedelta(hours=24)
+    unlimited = {**cfg, "email": {**cfg.get("email", {}), "max_html_bytes": 0}}
+    budget = {**cfg, "email": {**cfg.get("email", {}), "max_html_bytes": DEFAULT_MAX_BYTES}}
+
+    print(f"{'n':>5} {'ref s':>8} {'tmpl s':>8} {'budget s':>9} {'full KB':>8} {'sent KB':>8} {'shown':>6} {'text KB':>8}")
+    for n in SIZES:
+        grouped = synth_grouped(cfg, n, tz)
+        ref_s, ref = _time(lambda: _ref_html(grouped, start_dt, end_dt), repeat)
+        full_s, full = _time(lambda: render_digest(grouped, unlimited, start_dt, end_dt), repeat)
+        bud_s, d = _time(lambda: render_digest(grouped, budget, start_dt, end_dt), repeat)
+        assert d.bytes <= DEFAULT_MAX_BYTES, f"예산 초과 (n={n}, {d.bytes}B)"
+        assert full.shown == full.total == n
+        print(f"{n:>5} {ref_s:>8.4f} {full_s:>8.4f} {bud_s:>9.4f} {full.bytes / 1024:>8.1f} {d.bytes / 1024:>8.1f} "
+              f"{d.shown:>6} {len(d.text.encode()) / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# bench/bench_startup.py
+"""
+시작 시간 벤치 (새 인터프리터에서 측정, 네트워크 없음)
+- import news_pipeline 소요 시간: 빈 인터프리터(python -c pass) 대비 순수 추가분, 반복 중앙값
+- -X importtime 분해: news_pipeline 이 직접 불러오는 모듈별 누적 시간 상위 N
+- 지연 로드 확인: import 만으로 무거운 의존성(openai, feedparser, requests, jinja2, smtplib, apscheduler, numpy)이
+  올라오지 않는지 (환경변수 없이 import 가능한지도 함께 확인)
+
+    python -m bench.bench_startup [--repeat 7] [--top 15] [--module news_pipeline]
+"""
+import os, sys, json, argparse, statistics, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY = ("openai", "feedparser", "requests", "jinja2", "smtplib", "apscheduler", "asyncio", "numpy")
+_ENV_KEYS = ("OPENAI_API_KEY", "GMAIL_USER", "GMAIL_PASS", "TO_LIST")
+
+
+def _run(code, *flags):
+    """새 인터프리터에서 실행 (실행용 환경변수 없이 → import 시 검사/종료가 없어야 함)"""
+    env = {k: v for k, v in os.environ.items() if k not in _ENV_KEYS}
+    r = subprocess.run([sys.executable, *flags, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    if r.returncode != 0:
+        raise SystemExit(f"[ERROR] `{code}` failed (rc={r.returncode}):\n{r.stdout}{r.stderr}")
+    return r
+
+
+def wall_ms(code, repeat):
+    """인터프리터 안에서 code 실행 시간 (ms) 중앙값"""
+    samples = []
+    for _ in range(repeat):
+        r = _run(f"import time; t0 = time.perf_counter(); {code}; print(time.perf_counter() - t0)")
+        samples.append(float(r.stdout.split()[-1]) * 1000)
+    return statistics.median(samples)
+
+
+def importtime(module):
+    """
+    -X importtime → module 이 직접 불러온 모듈별 [(이름, 누적 ms)] + module 전체 누적 ms
+    (출력 형식: 'import time: self | cumulative | <들여쓰기>이름', 들여쓰기 2칸 = 한 단계)
+    """
+    r = _run(f"import {module}", "-X", "importtime")
+    rows = []
+    for line in r.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(cum_us) / 1000, depth))
+    total = next(cum for name, cum, depth in rows if name == module and depth == 0)
+    # 후위 순서 출력 → module 줄 직전의 깊이 1 줄들이 직접 import 한 모듈
+    end = next(i for i, (name, _, depth) in enumerate(rows) if name == module and depth == 0)
+    start = end
+    while start > 0 and rows[start - 1][2] > 0:
+        start -= 1
+    direct = [(name, cum) for name, cum, depth in rows[start:end] if depth == 1]
+    return total, sorted(direct, key=lambda x: -x[1])
+
+
+def loaded(module):
+    """import module 후 이미 올라와 있는 LAZY 모듈"""
+    r = _run(f"import sys, {module}; print(' '.join(m for m in {LAZY!r} if m in sys.modules))")
+    return r.stdout.split()
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--module", default="news_pipeline")
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = ap.parse_args(argv)
+
+    empty = wall_ms("pass", args.repeat)
+    imp = wall_ms(f"import {args.module}", args.repeat)
+    total, direct = importtime(args.module)
+    eager = loaded(args.module)
+    res = {
+        "module": args.module,
+        "import_ms_median": round(imp - empty, 1),
+        "importtime_cumulative_ms": round(total, 1),
+        "top": [(name, round(ms, 1)) for name, ms in direct[:args.top]],
+        "eager_heavy_modules": eager,
+    }
+    if args.json:
+        print(json.dumps(res, ensure_ascii=False, indent=2))
+    else:
+        print(f"import {args.module}: {res['import_ms_median']:.1f} ms (median of {args.repeat}, "
+              f"-X importtime cumulative {total:.1f} ms)")
+        for name, ms in res["top"]:
+            print(f"  {ms:>8.1f} ms  {name}")
+        print(f"heavy modules loaded at import: {', '.join(eager) or 'none'}")
+    if eager:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,91 @@
+# bench/bench_summarize.py
+"""
+요약 단계 벤치 (로컬 OpenAIStub, 네트워크 없음)
+- serial : 기존 summarize_openai (기사당 1요청, 성공마다 summarize_delay_secs 대기, 429 는 고정 backoff 대기)
+- engine : SummaryEngine (배치 + 동시 + 적응형 토큰 버킷 + Retry-After)
+- cached : 같은 기사로 engine 재실행 (요약 캐시 적중 → 요청 0)
+- 429 주입: 앞 N개 요청에 429 + Retry-After. 대기 시간(delay/backoff/Retry-After)은 --scale 로 함께 축소
+
+    python -m bench.bench_summarize --items 30 --latency-ms 300 --fail-429 2
+"""
+import os, sys, json, time, argparse, tempfile
+from unittest import mock
+
+from bench.stubs import OpenAIStub
+from utils.summarize import SummaryEngine, summarize_openai, _heuristic
+from utils.metrics import reset_metrics
+
+SAMPLE = ("국제유가 상승에 정유사 정제마진 개선. 항공유·경유 수요가 늘며 하반기 가격 강세가 이어질 전망이다. "
+          "업계는 입찰 물량 확대를 검토 중이다.")
+
+
+def _texts(n):
+    return [f"[{i}] {SAMPLE}" for i in range(n)]
+
+
+def _cfg(stub, cache_dir, **openai):
+    return {"cache": {"enabled": bool(cache_dir), "dir": cache_dir},
+            "openai": {"enable_summarize": True, "api_key_env": "BENCH_OPENAI_KEY", "base_url": stub.base_url,
+                       "summarize_rpm": 600, **openai}}
+
+
+def bench_serial(texts, latency, fail_429, delay, backoff):
+    with OpenAIStub(latency=latency, fail_429=fail_429) as stub, \
+            mock.patch.dict(os.environ, {"BENCH_OPENAI_KEY": "x", "OPENAI_API_KEY": "x", "OPENAI_BASE_URL": stub.base_url}):
+        cfg = _cfg(stub, "")
+        t0 = time.perf_counter()
+        out = [summarize_openai(t, cfg, delay, backoff) for t in texts]
+        secs = time.perf_counter() - t0
+        return {"secs": round(secs, 3), "requests": stub.requests,
+                "heuristic": sum(o == _heuristic(t) for o, t in zip(out, texts))}
+
+
+def bench_engine(texts, latency, fail_429, retry_after, cache_dir, **openai):
+    with OpenAIStub(latency=latency, fail_429=fail_429, retry_after=retry_after) as stub, \
+            mock.patch.dict(os.environ, {"BENCH_OPENAI_KEY": "x"}):
+        res = {}
+        for name in ("engine", "cached"):
+            reset_metrics()
+            engine = SummaryEngine(_cfg(stub, cache_dir, **openai))
+            before = stub.requests
+            t0 = time.perf_counter()
+            engine.summarize(texts)
+            secs = time.perf_counter() - t0
+            engine.close()
+            res[name] = {"secs": round(secs, 3), "requests": stub.requests - before, "rate_limited": engine.rate_limited,
+                         "cache_hits": engine.cache.hits, "heuristic": engine.fallbacks,
+                         "final_rate_per_min": round(engine._bucket.rate * 60, 1)}
+        return res
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--items", type=int, default=30)
+    ap.add_argument("--latency-ms", type=float, default=300.0, help="요청당 응답 지연")
+    ap.add_argument("--fail-429", type=int, default=2)
+    ap.add_argument("--delay", type=float, default=1.5, help="기존 summarize_delay_secs")
+    ap.add_argument("--backoff", type=float, default=20.0, help="기존 summarize_backoff_secs")
+    ap.add_argument("--retry-after", type=float, default=2.0, help="stub 429 의 Retry-After")
+    ap.add_argument("--scale", type=float, default=0.1, help="대기 시간 축소 배율 (1 = 실제 값)")
+    ap.add_argument("--batch-size", type=int, default=8)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--out")
+    args = ap.parse_args(argv)
+
+    texts = _texts(args.items)
+    latency = args.latency_ms / 1000
+    res = {"items": args.items, "scale": args.scale,
+           "serial": bench_serial(texts, latency, args.fail_429, args.delay * args.scale, args.backoff * args.scale)}
+    with tempfile.TemporaryDirectory() as d:
+        res.update(bench_engine(texts, latency, args.fail_429, args.retry_after * args.scale, d,
+                                summarize_batch_size=args.batch_size, summarize_concurrency=args.concurrency))
+    res["speedup"] = round(res["serial"]["secs"] / res["engine"]["secs"], 1) if res["engine"]["secs"] else None
+    text = json.dumps(res, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
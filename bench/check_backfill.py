@@ -0,0 +1,90 @@
+# bench/check_backfill.py
+"""
+backfill 결과 확인 (합성 날짜별 스냅샷, 네트워크 없음)
+- 기준: 스냅샷마다 기존 run_once(AI 끔, 재생 시 pubDate 를 현재로 평행 이동, 발송은 가로채기)
+- 비교: backfill 순차(workers=1, split=day) / 프로세스 풀(split=minor, --workers) 의 날짜별 선발 기사
+  (대분류, 소분류, 제목, 링크) 목록이 기준과 순서까지 같은지 + 실행 시간
+
+    python -m bench.check_backfill [--days 3] [--scale 1] [--workers 4]
+"""
+import os, sys, json, argparse, tempfile
+from unittest import mock
+
+import yaml
+
+import backfill as bf
+import news_pipeline as npl
+from bench.record_fixtures import synthesize_days
+from utils.metrics import reset_metrics
+
+
+def _rows(items):
+    return [(it["major"], it["minor"], it["title"], it["link"]) for it in items]
+
+
+def reference(snap, cfg_path, workdir):
+    """run_once 와 같은 경로로 스냅샷 1개 실행 → 선발 기사 목록"""
+    cfg = bf.backfill_config(cfg_path)
+    cfg["fetch"].update(replay_dir=snap.path, replay_rebase=True)
+    cfg["openai"] = dict(cfg.get("openai") or {}, enable_ai_filter=False, enable_summarize=False)
+    cfg["state"] = dict(cfg.get("state") or {}, enabled=False)
+    sent = []
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with mock.patch.object(npl, "load_config", lambda *a, **k: cfg), \
+                mock.patch.object(npl, "send_email", lambda html, c, grouped=None, **k: sent.append(grouped)), \
+                open(os.devnull, "w") as null, mock.patch("sys.stdout", null):
+            npl._run_once(reset_metrics())
+    finally:
+        os.chdir(cwd)
+    return _rows(it for minors in sent[0].values() for its in minors.values() for it in its)
+
+
+def check(days, scale, workers) -> int:
+    bad = []
+
+    def expect(ok, what):
+        print(f"[{'OK' if ok else 'FAIL'}] {what}")
+        if not ok:
+            bad.append(what)
+
+    with tempfile.TemporaryDirectory() as d:
+        cfg_path = os.path.abspath("config.yaml")
+        with open(cfg_path, encoding="utf-8") as f:
+            raw = yaml.safe_load(f)
+        root = os.path.join(d, "archive")
+        synthesize_days(root, raw, days, scale=scale)
+        snaps = bf.find_snapshots(root)
+        ref = {s.name: reference(s, cfg_path, d) for s in snaps}
+
+        runs = {}
+        for name, w, split in (("serial", 1, "day"), ("pool", workers, "minor")):
+            out = os.path.join(d, name)
+            with open(os.devnull, "w") as null, mock.patch("sys.stdout", null):
+                rep = bf.backfill(root, out, bf.backfill_config(cfg_path), workers=w, split=split)
+            got = {}
+            for s in snaps:
+                with open(os.path.join(out, s.name, "items.json"), encoding="utf-8") as f:
+                    got[s.name] = [tuple(r) for r in _rows(json.load(f))]
+            runs[name] = rep
+            for day, rows in ref.items():
+                expect(got[day] == [tuple(r) for r in rows], f"{name}: {day} matches run_once ({len(rows)} items)")
+        print(json.dumps({n: {k: r[k] for k in ("workers", "split", "tasks", "wall_secs", "cpu_secs", "parallelism")}
+                          for n, r in runs.items()}, ensure_ascii=False))
+        expect(runs["serial"]["minors"] == runs["pool"]["minors"], "aggregate per-minor metrics equal")
+    print(f"[CHECK] {len(bad)} failed")
+    return 1 if bad else 0
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--days", type=int, default=3)
+    ap.add_argument("--scale", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args(argv)
+    return check(args.days, args.scale, args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,106 @@
+# bench/check_extract.py
+"""
+summary 텍스트 추출기 골든 비교
+- bench/fixtures/summary_golden.json: 입력 HTML + 기존 추출기(html5lib get_text) 출력
+- 새 추출기(utils.html_text.html_to_text) 결과가 골든과 모두 같은지 확인하고 속도를 비교
+
+  python -m bench.check_extract            # 검증 + 속도 비교
+  python -m bench.check_extract --regen    # 골든 재생성 (html5lib 기준)
+"""
+import os, sys, json, time
+
+from utils.html_text import html_to_text, fast_text
+
+GOLDEN = os.path.join(os.path.dirname(__file__), "fixtures", "summary_golden.json")
+
+# Google News summary 형태 + 경계 사례
+CASES = [
+    "",
+    "   ",
+    "plain text only",
+    "  앞뒤 공백  과   내부 공백  ",
+    '<a href="https://news.google.com/rss/articles/CBMi?oc=5" target="_blank">국제유가, 중동 긴장에 2% 상승</a>&nbsp;&nbsp;<font color="#6f6f6f">연합뉴스</font>',
+    '<a href="x">정제마진 &amp; 크랙 스프레드 개선</a>&nbsp;&nbsp;<font color="#6f6f6f">한국경제</font>',
+    '<ol><li><a href="a">경유 가격 인상</a>&nbsp;&nbsp;<font color="#6f6f6f">뉴스1</font></li><li><a href="b">휘발유 가격 하락</a>&nbsp;&nbsp;<font color="#6f6f6f">머니투데이</font></li></ol>',
+    "<p>첫 문단</p><p>둘째 문단<br>줄바꿈</p>",
+    "<b>굵게</b><i>기울임</i>붙은텍스트",
+    "a<b>b</b>c",
+    "&lt;태그 아님&gt; &quot;인용&quot; &#39;작은따옴표&#39; &#x27;hex&#x27;",
+    "&amp &lt &gt &nbsp세미콜론 없음",
+    "&copy; 2026 &reg; &trade; &euro;",
+    "&#128; &#150; 잘못된 참조",
+    "<!-- 주석 --><span>본문</span>",
+    "<script>var x = '<b>';</script>보이는 글",
+    "<style>.a{color:red}</style><div>스타일 뒤</div>",
+    "<div>\n\t탭과\n줄바꿈\n</div>",
+    "<div>　전각 공백　</div>",
+    "<div>\xa0nbsp 원문자\xa0</div>",
+    "<img src='x.png' alt='이미지'/>이미지 뒤",
+    "<a href='x'>닫히지 않은 앵커",
+    "</b>짝 없는 닫는 태그",
+    "미완성 태그 <a href",
+    "a < b 그리고 c > d",
+    "<table><tr><td>셀1</td><td>셀2</td></tr></table>",
+    "앞<table>표 안 텍스트<tr><td>셀</td></tr></table>",
+    "<title>제목</title>본문",
+    "<![CDATA[시디에이터]]>뒤",
+    "줄\r\n바꿈 CRLF",
+    "<ruby>漢<rt>한</rt></ruby>자",
+    "<font color=\"#6f6f6f\">출처만</font>",
+    "<a>빈 href</a>&nbsp;",
+    "&nbsp;&nbsp;",
+    "<div><p>중첩<span> 깊은 <em>텍스트</em></span></p></div>",
+    "앞</font>짝 없는 닫는 태그 사이&copy</a>뒤",
+    "<li>하나<li>둘</li>셋</li>넷",
+    "<b>x<p>y</b>z</p>",
+    "<script>닫히지 않은 스크립트 <b>",
+    "<i/>self-closing 무시",
+]
+
+
+def _reference(html):
+    from bs4 import BeautifulSoup
+    try:
+        return BeautifulSoup(html, "html5lib").get_text(" ", strip=True)
+    except Exception:
+        return BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
+
+
+def regen():
+    data = [{"html": h, "text": _reference(h)} for h in CASES]
+    with open(GOLDEN, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    print(f"[REGEN] {len(data)} cases → {GOLDEN}")
+
+
+def check() -> int:
+    with open(GOLDEN, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    bad = 0
+    fast = 0
+    for case in data:
+        got = html_to_text(case["html"])
+        if fast_text(case["html"]) is not None:
+            fast += 1
+        if got != case["text"]:
+            bad += 1
+            print(f"[DIFF] {case['html']!r}\n  expected={case['text']!r}\n  got     ={got!r}")
+    print(f"[GOLDEN] {len(data) - bad}/{len(data)} match (fast path {fast}, fallback {len(data) - fast})")
+
+    gn = [c["html"] for c in data if "news.google.com" in c["html"] or "6f6f6f" in c["html"]] * 500
+    t0 = time.perf_counter()
+    for h in gn:
+        _reference(h)
+    t1 = time.perf_counter()
+    for h in gn:
+        html_to_text(h)
+    t2 = time.perf_counter()
+    print(f"[BENCH] {len(gn)} summaries: html5lib={t1 - t0:.3f}s, fast={t2 - t1:.3f}s (x{(t1 - t0) / max(t2 - t1, 1e-9):.1f})")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    if "--regen" in sys.argv:
+        regen()
+    else:
+        sys.exit(check())
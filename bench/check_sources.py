@@ -0,0 +1,143 @@
+# bench/check_sources.py
+"""
+소스 어댑터 확인 (로컬 HTTP 스탠드인 + 임시 파일, 네트워크 없음)
+- google_news(로컬 HTTP 검색 RSS, rpm 제한) + rss(HTTP) + rss(로컬 파일) + archive(JSONL) + 느린 rss(타임아웃)
+- 확인: 정규화 entry 필드, 소스별 health(요청/실패/타임아웃), rpm 대기, 소분류 키워드 배정,
+  소스 간 같은 기사(정규화 URL / 매체명 뺀 제목)가 파싱 전에 합쳐지는지
+
+    python -m bench.check_sources
+"""
+import os, sys, json, time, tempfile, threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from xml.sax.saxutils import escape
+
+import news_pipeline as npl
+from utils.config import compile_config
+from utils.feed_cache import ENTRY_FIELDS
+from utils.matcher import SCORING_GROUPS
+from utils.metrics import reset_metrics
+from utils.sources import sources_from_config, minor_feeds
+
+NOW = datetime.now(timezone.utc)
+TAXONOMY = [{"major": "유종별", "minor": "경유", "keywords": ["경유", "디젤"]},
+            {"major": "가격", "minor": "국제 유가", "keywords": ["국제유가", "OPEC"]}]
+
+
+def _rss(items):
+    body = "".join(
+        f"<item><title>{escape(t)}</title><link>{escape(link)}</link><guid>{escape(link)}</guid>"
+        f"<pubDate>{format_datetime(NOW - timedelta(minutes=m))}</pubDate><description>{escape(t)}</description></item>"
+        for t, link, m in items)
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>t</title>{body}</channel></rss>'
+
+
+GOOGLE = {  # 검색어 → [(제목, 링크, 몇 분 전)]
+    "경유": [("경유 가격 3주 연속 상승 - 연합뉴스", "https://news.google.com/rss/articles/A1", 10),
+             ("디젤차 판매 감소 - 뉴스1", "https://news.google.com/rss/articles/A2", 20)],
+    "디젤": [("디젤차 판매 감소 - 뉴스1", "https://news.google.com/rss/articles/A2", 20)],
+    "국제유가": [("국제유가 OPEC 감산에 급등 - 한국경제", "https://news.google.com/rss/articles/B1", 30)],
+    "OPEC": [],
+}
+PUBLISHER = [("경유 가격 3주 연속 상승", "https://www.yna.co.kr/view/1?utm_source=rss", 12),   # Google A1 과 같은 기사
+             ("국제유가 OPEC 감산에 급등", "https://www.hankyung.com/article/9", 31),          # Google B1 과 같은 기사
+             ("반도체 수출 호조", "https://www.yna.co.kr/view/2", 5)]                           # 어느 소분류 키워드도 없음
+LOCAL = [("정부, 경유 유가연동보조금 연장", "https://www.korea.kr/news/1", 40)]
+ARCHIVE = [{"title": "디젤 발전기 입찰 공고", "link": "https://archive.example/1", "summary": "조달청",
+            "published": (NOW - timedelta(minutes=50)).isoformat()},
+           {"title": "경유 가격 3주 연속 상승", "link": "https://www.yna.co.kr/view/1", "published": NOW.timestamp()}]
+
+
+class _H(BaseHTTPRequestHandler):
+    def log_message(self, *a):
+        pass
+
+    def do_GET(self):
+        p = urlparse(self.path)
+        if p.path == "/slow":
+            time.sleep(1.5)
+        if p.path == "/search":
+            q = parse_qs(p.query)["q"][0].replace(" when:1d", "")
+            body = _rss(GOOGLE.get(q, []))
+        else:
+            body = _rss(PUBLISHER)
+        raw = body.encode("utf-8")
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+        except OSError:
+            pass
+
+
+def check() -> int:
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _H)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    host = f"http://127.0.0.1:{srv.server_port}"
+    bad = []
+
+    def expect(ok, what):
+        print(f"[{'OK' if ok else 'FAIL'}] {what}")
+        if not ok:
+            bad.append(what)
+
+    with tempfile.TemporaryDirectory() as d:
+        local, archive = os.path.join(d, "notice.xml"), os.path.join(d, "archive.jsonl")
+        with open(local, "w", encoding="utf-8") as f:
+            f.write(_rss(LOCAL))
+        with open(archive, "w", encoding="utf-8") as f:
+            f.write("\n".join(json.dumps(r, ensure_ascii=False) for r in ARCHIVE))
+        cfg = {
+            "app": {"timezone": "Asia/Seoul", "lookback_hours": 24, "max_items_per_subcategory": 5},
+            "sources": {
+                "google_news": {"base": f"{host}/search", "hl": "ko", "gl": "KR", "ceid": "KR:ko", "rpm": 120},
+                "publisher": {"kind": "rss", "url": f"{host}/publisher.xml"},
+                "gov_notice": {"kind": "rss", "path": local},
+                "archive": {"kind": "archive", "path": archive},
+                "slow": {"kind": "rss", "url": f"{host}/slow", "timeout_secs": 0.3},
+            },
+            "fetch": {"max_workers": 8, "per_host": 8, "timeout_secs": 5, "deadline_secs": 10},
+            "scoring": {g: {"terms": [], "weight": 1} for g in SCORING_GROUPS},
+            "taxonomy": TAXONOMY,
+        }
+        compile_config(cfg)
+        reset_metrics()
+        sources = sources_from_config(cfg)
+        t0 = time.perf_counter()
+        feeds = npl.fetch_feeds(TAXONOMY, cfg, sources=sources)
+        secs = time.perf_counter() - t0
+        health = {s.name: s.health for s in sources}
+
+        expect(len(feeds) == 4 + 4, f"one request per google keyword + one per fixed feed ({len(feeds)})")
+        entries = [e for v in feeds.values() if not isinstance(v, Exception) for e in v.entries]
+        expect(all(set(e) <= set(ENTRY_FIELDS) for e in entries), "entries normalized to ENTRY_FIELDS")
+        expect(all(getattr(e, "published_parsed", None) for e in entries), "published_parsed on every entry")
+        expect(health["slow"].failed == 1 and health["slow"].requests == 1, f"slow source timed out: {health['slow'].line()}")
+        expect(all(h.failed == 0 for n, h in health.items() if n != "slow"), "other sources unaffected")
+        g = next(s for s in sources if s.name == "google_news")
+        expect(g.limiter.waited > 0, f"google_news rpm limit applied (waited {g.limiter.waited:.2f}s, fetch {secs:.2f}s)")
+
+        tz = compile_config(cfg).app.tz
+        index = npl.EntryIndex(cfg, tz, datetime.now(tz) - timedelta(hours=24), datetime.now(tz), cross_source=True)
+        got = {t["minor"]: [it for it in npl.iter_minor_items(t, feeds, index, sources)] for t in TAXONOMY}
+        titles = {m: sorted({it.title for it in its}) for m, its in got.items()}
+        print(f"  minors: {json.dumps(titles, ensure_ascii=False)}")
+        expect("반도체 수출 호조" not in sum(titles.values(), []), "fixed feed entries without minor keywords skipped")
+        expect("정부, 경유 유가연동보조금 연장" in titles["경유"], "local file rss assigned by keyword")
+        expect("디젤 발전기 입찰 공고" in titles["경유"], "archive entry assigned by keyword")
+        expect(titles["경유"].count("경유 가격 3주 연속 상승 - 연합뉴스") == 1 and
+               "경유 가격 3주 연속 상승" not in titles["경유"], "publisher copy merged into Google article (경유)")
+        expect("국제유가 OPEC 감산에 급등" not in titles["국제 유가"], "publisher copy merged into Google article (국제 유가)")
+        expect(index.cross_dups >= 2, f"cross-source duplicates collapsed before parsing ({index.cross_dups})")
+        expect(sum(1 for k in minor_feeds(sources, TAXONOMY[1])) == 2 + 4, "minor feed plan: 2 keywords + 4 fixed feeds")
+    srv.shutdown()
+    print(f"[CHECK] {len(bad)} failed")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(check())
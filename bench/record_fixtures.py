@@ -0,0 +1,151 @@
+# bench/record_fixtures.py
+"""
+RSS 픽스처 생성 (utils/replay.py 형식: manifest.json + 키워드별 XML)
+- 녹화: config.yaml taxonomy 키워드 전부를 Google News 에서 받아 그대로 저장
+    python -m bench.record_fixtures record bench/fixtures/rss
+- 합성: 네트워크 없이 결정적(seed 고정) 가짜 피드 생성. scale 배수만큼 서로 다른 기사를 만든다
+    python -m bench.record_fixtures synth /tmp/rss --scale 10
+- 날짜별 스냅샷(backfill 입력): --days N 이면 out/<YYYY-MM-DD>/ 에 하루씩 (녹화 시각 = 그날 같은 시각, seed + 날짜 순번)
+    python -m bench.record_fixtures synth /tmp/archive --days 14
+"""
+import os, sys, random, argparse
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+import yaml
+
+from utils.replay import save_fixture
+
+SOURCES = ("연합뉴스", "한국경제", "뉴스1", "매일경제", "이데일리", "해사신문")
+ITEMS_PER_FEED = 40      # Google News 키워드당 평균 응답 건수(근사)
+SHARED_RATIO = 0.4       # 여러 키워드에 동시에 걸리는 기사 비율
+_SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호구누두루무부수우주추"
+
+
+def _keywords(cfg):
+    return list(dict.fromkeys(kw for tax in cfg["taxonomy"] for kw in tax["keywords"]))
+
+
+def record(fixture_dir, cfg, timeout=15):
+    """실제 응답 녹화 (파이프라인과 같은 URL)"""
+    import requests
+    from news_pipeline import google_news_url
+    from utils.fetch import make_session
+
+    session = make_session()
+    ok = 0
+    for kw in _keywords(cfg):
+        url = google_news_url(kw, cfg)
+        try:
+            r = session.get(url, timeout=timeout)
+        except requests.RequestException as ex:
+            print(f"[WARN] record failed: {kw}: {ex}")
+            continue
+        headers = {k: v for k, v in r.headers.items() if k.lower() in ("content-type", "etag", "last-modified")}
+        save_fixture(fixture_dir, kw, r.content, r.status_code, headers)
+        ok += 1
+    print(f"[INFO] recorded {ok} feeds → {fixture_dir}")
+
+
+def _pseudo_word(rnd):
+    return "".join(rnd.choice(_SYLLABLES) for _ in range(rnd.randint(2, 3)))
+
+
+def synthesize(fixture_dir, cfg, scale=1, seed=7, now=None):
+    """
+    키워드마다 ITEMS_PER_FEED × scale 건. 제목 = 용어 1~2개 + 의사 단어(서로 잘 겹치지 않음).
+    일부는 다른 키워드와 공유, 7건 중 1건은 기존 제목의 변형(중복 제거 대상)
+    """
+    rnd = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    hours = float(cfg.get("app", {}).get("lookback_hours", 24))
+    sc = cfg.get("scoring", {})
+    terms = [t for g in ("fuel_core_terms", "demand_signals", "price_signals", "ops_supply_signals")
+             for t in sc.get(g, {}).get("terms", [])]
+    noise = list(sc.get("noise_tokens", {}).get("terms", [])) + list(cfg.get("filters", {}).get("block_keywords", []))
+    keywords = _keywords(cfg)
+    per_feed = ITEMS_PER_FEED * max(1, int(scale))
+    shared = []
+    seq = 0
+
+    def _article(kw):
+        nonlocal seq
+        seq += 1
+        if seq % 7 == 0 and shared:
+            base = rnd.choice(shared)
+            title = base["title"] + " 종합"
+        else:
+            words = [kw] + rnd.sample(terms, min(len(terms), rnd.randint(0, 2)))
+            if noise and rnd.random() < 0.1:
+                words.append(rnd.choice(noise))
+            words += [_pseudo_word(rnd) for _ in range(rnd.randint(3, 6))]
+            rnd.shuffle(words)
+            title = " ".join(words)
+        return {
+            "title": title,
+            "link": f"https://news.google.com/rss/articles/SYN{seq:08d}?oc=5",
+            "guid": f"SYN{seq:08d}",
+            "pub": now - timedelta(minutes=rnd.uniform(1, hours * 60 * 1.1)),   # 일부는 시간창 밖
+            "src": rnd.choice(SOURCES),
+        }
+
+    for kw in keywords:
+        items = []
+        for _ in range(per_feed):
+            if shared and rnd.random() < SHARED_RATIO:
+                items.append(rnd.choice(shared))
+            else:
+                it = _article(kw)
+                items.append(it)
+                if rnd.random() < 0.3:
+                    shared.append(it)
+        parts = []
+        for it in items:
+            desc = (f'<a href="{it["link"]}" target="_blank">{escape(it["title"])}</a>'
+                    f'&nbsp;&nbsp;<font color="#6f6f6f">{it["src"]}</font>')
+            parts.append(
+                f"<item><title>{escape(it['title'])} - {it['src']}</title><link>{it['link']}</link>"
+                f"<guid isPermaLink=\"false\">{it['guid']}</guid><pubDate>{format_datetime(it['pub'])}</pubDate>"
+                f"<description>{escape(desc)}</description><source>{it['src']}</source></item>")
+        xml = (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+               f'<title>"{escape(kw)}" - Google 뉴스</title>{"".join(parts)}</channel></rss>')
+        save_fixture(fixture_dir, kw, xml.encode("utf-8"), 200, {"Content-Type": "application/rss+xml; charset=utf-8"},
+                     created_at=now.timestamp())
+    return fixture_dir
+
+
+def synthesize_days(root, cfg, days, scale=1, seed=7, now=None):
+    """out/<YYYY-MM-DD>/ 날짜별 스냅샷 (오래된 날부터, 녹화 시각은 now 에서 하루씩 뒤로)"""
+    now = now or datetime.now(timezone.utc)
+    out = []
+    for i in range(days):
+        at = now - timedelta(days=days - 1 - i)
+        out.append(synthesize(os.path.join(root, at.strftime("%Y-%m-%d")), cfg, scale=scale, seed=seed + i, now=at))
+    return out
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("mode", choices=("record", "synth"))
+    ap.add_argument("out")
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--scale", type=int, default=1)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--days", type=int, default=0, help="synth: 오늘까지 N 일치 날짜별 스냅샷")
+    args = ap.parse_args(argv)
+    with open(args.config, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+    if args.mode == "record":
+        record(args.out, cfg)
+    else:
+        if args.days > 0:
+            synthesize_days(args.out, cfg, args.days, scale=args.scale, seed=args.seed)
+            print(f"[INFO] synthesized {args.days} daily snapshots → {args.out}")
+            return
+        synthesize(args.out, cfg, scale=args.scale, seed=args.seed)
+        print(f"[INFO] synthesized {len(_keywords(cfg))} feeds (x{args.scale}) → {args.out}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
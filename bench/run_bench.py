@@ -0,0 +1,321 @@
+# bench/run_bench.py
+"""
+오프라인 성능 벤치마크 (Google News / OpenAI / Gmail 없이)
+- 단계별: extract_text, compute_score, dedupe_items, dedupe_by_title_similarity, make_html_email
+- 전체: run_once (RSS 는 replay 전송, OpenAI 는 OpenAIStub, SMTP 는 FakeSMTP)
+- 규모: 오늘 수집량(taxonomy 키워드 × ITEMS_PER_FEED) 의 1x ~ 100x
+- 기사 레코드: 기존 dict vs Article(slots) 의 기사당 메모리, dedupe 처리량(속도 향상 배수)
+- 결과: 처리량(items/s), p50/p95 지연(ms), 최대 메모리(KB) → baseline 과 비교해 회귀 표시
+
+  python -m bench.run_bench                          # 합성 픽스처, 1x/10x
+  python -m bench.run_bench --scales 1,10,100        # 100x 는 수 분 소요
+  python -m bench.run_bench --fixtures bench/fixtures/rss   # 녹화 픽스처 (replay_scale 로 확대)
+  python -m bench.run_bench --save-baseline          # bench/baseline.json 갱신
+"""
+import os, io, sys, json, time, shutil, argparse, tempfile, tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+import yaml, pytz, feedparser
+
+from bench.stubs import OpenAIStub, FakeSMTP
+from bench.record_fixtures import synthesize
+from utils.replay import load_manifest, scale_feed
+from utils.article import Article
+from utils.dedupe import dedupe_items
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "bench", "baseline.json")
+STAGES = ("extract_text", "compute_score", "dedupe_items", "dedupe_by_title_similarity", "make_html_email")
+# AI 판정기/메일러가 환경변수에서 키·계정을 읽으므로 더미 값을 채운다 (스텁으로만 전송)
+DUMMY_ENV = {"OPENAI_API_KEY": "bench", "GMAIL_USER": "bench@example.com", "GMAIL_PASS": "bench",
+             "TO_LIST": "team@example.com"}
+
+
+def _pipeline():
+    for k, v in DUMMY_ENV.items():
+        os.environ.setdefault(k, v)
+    import news_pipeline
+    return news_pipeline
+
+
+def _pct(vals, q):
+    v = sorted(vals)
+    return v[min(len(v) - 1, int(q * len(v)))] if v else 0.0
+
+
+def _result(samples, items, peak):
+    total = sum(samples)
+    return {
+        "items": items,
+        "secs": round(total, 4),
+        "throughput": round(items / total, 1) if total else 0.0,
+        "p50_ms": round(_pct(samples, 0.5) * 1000, 3),
+        "p95_ms": round(_pct(samples, 0.95) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def measure(fn, calls, items):
+    """calls 를 순서대로 실행: 1회차 시간 측정, 2회차 tracemalloc 으로 최대 메모리 측정"""
+    samples = []
+    for args in calls:
+        t0 = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    for args in calls:
+        fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return _result(samples, items, peak)
+
+
+def load_entries(fixture_dir, replay_scale=1):
+    """픽스처 → {keyword: [entry, ...]}"""
+    feeds = {}
+    for kw, meta in load_manifest(fixture_dir)["feeds"].items():
+        with open(os.path.join(fixture_dir, meta["file"]), "r", encoding="utf-8") as f:
+            feeds[kw] = feedparser.parse(scale_feed(f.read(), replay_scale)).entries
+    return feeds
+
+
+def bench_stages(npl, cfg, feeds, repeat=3):
+    tz = pytz.timezone(cfg["app"]["timezone"])
+    entries = [e for es in feeds.values() for e in es]
+    out = {}
+
+    out["extract_text"] = measure(npl.extract_text, [(e,) for e in entries], len(entries))
+    texts = [" ".join(npl.extract_text(e)) for e in entries]
+    out["compute_score"] = measure(npl.compute_score, [(t, cfg) for t in texts], len(texts))
+
+    # 소분류 bucket (파이프라인과 같은 dict 형태, URL 중복 포함)
+    buckets = []
+    for tax in cfg["taxonomy"]:
+        bucket = []
+        for kw in tax["keywords"]:
+            for e in feeds.get(kw, []):
+                pub_p = getattr(e, "published_parsed", None)
+                bucket.append({
+                    "title": e.get("title", ""), "link": e.get("link", ""),
+                    "published_local": npl.to_local_str(pub_p, tz), "published_dt": npl.published_dt_kst(pub_p, tz),
+                    "major": tax["major"], "minor": tax["minor"],
+                })
+        buckets.append(bucket)
+    n_bucketed = sum(len(b) for b in buckets)
+    out["dedupe_items"] = measure(dedupe_items, [(b,) for b in buckets], n_bucketed)
+
+    deduped = [dedupe_items(b) for b in buckets]
+    flat = [it for b in deduped for it in b]
+    out["dedupe_by_title_similarity"] = measure(
+        lambda items: npl.dedupe_by_title_similarity(items, threshold=0.88, min_overlap=2),
+        [(flat,)] * repeat, len(flat) * repeat)
+
+    grouped = {}
+    for b in deduped:
+        for it in b:
+            grouped.setdefault(it["major"], {}).setdefault(it["minor"], []).append(it)
+    end_dt = datetime.now(tz)
+    start_dt = end_dt - timedelta(hours=cfg["app"]["lookback_hours"])
+    out["make_html_email"] = measure(npl.make_html_email, [(grouped, cfg, start_dt, end_dt)] * repeat,
+                                     len(flat) * repeat)
+    return out
+
+
+def _retained(build):
+    """build() 결과가 붙잡고 있는 메모리 (결과, 바이트)"""
+    tracemalloc.start()
+    objs = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objs, size
+
+
+def bench_articles(npl, cfg, feeds, repeat=3):
+    """
+    같은 소분류 bucket 을 기존 dict 와 Article 로 각각 만들어 비교
+    - 기사당 메모리: 파싱된 제목/요약 문자열은 공유하므로 레코드 자체 + 시각/캐시 값만 집계
+    - dedupe_items / dedupe_by_title_similarity 처리량 (Article 은 정규화 URL·제목 토큰 캐시 사용)
+    """
+    tz = pytz.timezone(cfg["app"]["timezone"])
+    rows = []    # (tax, title, summary, link, key, published_parsed)
+    for tax in cfg["taxonomy"]:
+        for kw in tax["keywords"]:
+            for e in feeds.get(kw, []):
+                title, summary = npl.extract_text(e)
+                link = e.get("link", "")
+                rows.append((tax, title, summary, link, npl.normalize_url(link), getattr(e, "published_parsed", None)))
+
+    def _dicts():
+        buckets = {}
+        for tax, title, summary, link, key, pub_p in rows:
+            buckets.setdefault(tax["minor"], []).append({
+                "_key": key, "title": title, "summary": summary, "link": link,
+                "published": "", "published_local": npl.to_local_str(pub_p, tz),
+                "published_dt": npl.published_dt_kst(pub_p, tz), "major": tax["major"], "minor": tax["minor"],
+            })
+        return list(buckets.values())
+
+    def _articles(warm):
+        base, buckets = {}, {}
+        for tax, title, summary, link, key, pub_p in rows:
+            a = base.get(key)
+            if a is None:
+                a = base[key] = Article(title, link, summary, ts=npl.published_ts(pub_p), tz=tz, key=key)
+                if warm:
+                    a.warm()
+            buckets.setdefault(tax["minor"], []).append(a.for_minor(tax["major"], tax["minor"]))
+        return list(buckets.values())
+
+    n = len(rows)
+    dict_buckets, dict_bytes = _retained(_dicts)
+    _, cold_bytes = _retained(lambda: _articles(False))
+    art_buckets, warm_bytes = _retained(lambda: _articles(True))
+    out = {"article_memory": {
+        "items": n,
+        "dict_bytes_per_item": round(dict_bytes / max(n, 1), 1),
+        "article_bytes_per_item": round(cold_bytes / max(n, 1), 1),
+        "article_warm_bytes_per_item": round(warm_bytes / max(n, 1), 1),
+    }}
+
+    for name, fn in (("dedupe_items", lambda bs: [dedupe_items(b) for b in bs]),
+                     ("dedupe_by_title_similarity",
+                      lambda bs: npl.dedupe_by_title_similarity([it for b in bs for it in b], 0.88, 2))):
+        d = measure(fn, [(dict_buckets,)] * repeat, n * repeat)
+        a = measure(fn, [(art_buckets,)] * repeat, n * repeat)
+        a["speedup_vs_dict"] = round(a["throughput"] / d["throughput"], 2) if d["throughput"] else 0.0
+        out[f"{name}[dict]"] = d
+        out[f"{name}[article]"] = a
+    return out
+
+
+def bench_e2e(npl, cfg, fixture_dir, replay_scale, workdir, repeat=2, ai_latency=0.0, verbose=False):
+    """임시 작업 디렉터리에서 run_once 반복 실행 (캐시/상태 저장소는 끔 → 매 회 동일 조건)"""
+    # 깊은 복사 (yaml 로드 결과는 JSON 호환, 컴파일 캐시 "_..." 키는 제외)
+    cfg = json.loads(json.dumps({k: v for k, v in cfg.items() if not k.startswith("_")}))
+    cfg.setdefault("fetch", {}).update(replay_dir=os.path.abspath(fixture_dir), replay_scale=replay_scale)
+    cfg.setdefault("cache", {})["enabled"] = False
+    cfg.setdefault("state", {})["enabled"] = False
+    os.makedirs(workdir, exist_ok=True)
+
+    cwd = os.getcwd()
+    samples, reports = [], []
+    with OpenAIStub(latency=ai_latency) as stub, FakeSMTP.patch():
+        cfg.setdefault("openai", {})["base_url"] = stub.base_url
+        with open(os.path.join(workdir, "config.yaml"), "w", encoding="utf-8") as f:
+            yaml.safe_dump(cfg, f, allow_unicode=True)
+        os.chdir(workdir)
+        try:
+            for i in range(repeat + 1):
+                # 마지막 1회는 tracemalloc 으로 최대 메모리만 측정 (느려지므로 지연 측정에서 제외)
+                if i == repeat:
+                    tracemalloc.start()
+                t0 = time.perf_counter()
+                with redirect_stdout(sys.stdout if verbose else io.StringIO()):
+                    npl.run_once()
+                if i < repeat:
+                    samples.append(time.perf_counter() - t0)
+                with open("run_report.json", "r", encoding="utf-8") as f:
+                    reports.append(json.load(f))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            os.chdir(cwd)
+        sent = len(FakeSMTP.sent)
+
+    counters = reports[0]["counters"]
+    entries = counters.get("entries.raw", 0)
+    res = _result(samples, entries * repeat, peak)
+    res.update(unique=counters.get("entries.unique", 0), digest=counters.get("digest.items", 0),
+               ai_calls=stub.requests, mails=sent)
+    return res
+
+
+def compare(results, baseline, tolerance):
+    """baseline 대비 처리량 하락 / p95 · 메모리 증가가 tolerance 를 넘으면 회귀"""
+    regressions = []
+    for key, cur in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        checks = (("throughput", -1), ("p95_ms", 1), ("peak_kb", 1))
+        for metric, sign in checks:
+            b, c = base.get(metric), cur.get(metric)
+            if not b or c is None:
+                continue
+            change = (c - b) / b
+            cur[f"{metric}_vs_base"] = round(change * 100, 1)
+            if change * sign > tolerance:
+                regressions.append(f"{key} {metric}: {b} → {c} ({change * 100:+.1f}%)")
+    return regressions
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scales", default="1,10")
+    ap.add_argument("--fixtures", help="녹화 픽스처 디렉터리 (없으면 규모별 합성)")
+    ap.add_argument("--config", default=os.path.join(ROOT, "config.yaml"))
+    ap.add_argument("--only", choices=("stages", "e2e"))
+    ap.add_argument("--repeat", type=int, default=2)
+    ap.add_argument("--ai-latency", type=float, default=0.0, help="OpenAIStub 요청당 지연(초)")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.3)
+    ap.add_argument("--out", help="결과 JSON 저장 경로")
+    ap.add_argument("-v", "--verbose", action="store_true")
+    args = ap.parse_args(argv)
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+    npl = _pipeline()
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+
+    tmp = tempfile.mkdtemp(prefix="newsbot-bench-")
+    results = {}
+    try:
+        for scale in scales:
+            if args.fixtures:
+                fixture_dir, replay_scale = args.fixtures, scale
+            else:
+                fixture_dir, replay_scale = synthesize(os.path.join(tmp, f"rss-x{scale}"), cfg, scale=scale), 1
+            if args.only != "e2e":
+                feeds = load_entries(fixture_dir, replay_scale)
+                stages = bench_stages(npl, cfg, feeds, repeat=max(5, args.repeat))
+                stages.update(bench_articles(npl, cfg, feeds, repeat=max(3, args.repeat)))
+                for stage, res in stages.items():
+                    results[f"{stage}@x{scale}"] = res
+                    print(f"[BENCH] {stage:<34} x{scale:<4} {res}")
+            if args.only != "stages":
+                res = bench_e2e(npl, cfg, fixture_dir, replay_scale, os.path.join(tmp, f"run-x{scale}"),
+                                repeat=args.repeat, ai_latency=args.ai_latency, verbose=args.verbose)
+                results[f"run_once@x{scale}"] = res
+                print(f"[BENCH] {'run_once':<34} x{scale:<4} {res}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=1, sort_keys=True)
+        print(f"[INFO] Saved baseline {args.baseline}")
+        regressions = []
+    else:
+        try:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError):
+            baseline = {}
+            print(f"[WARN] baseline not found: {args.baseline}")
+        regressions = compare(results, baseline, args.tolerance)
+        for r in regressions:
+            print(f"[REGRESSION] {r}")
+        if baseline and not regressions:
+            print(f"[OK] no regression beyond {args.tolerance:.0%}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=1, sort_keys=True)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,289 @@
+# bench/stubs.py
+"""
+로컬 스탠드인 서버 (네트워크/유료 API 없이 파이프라인 실행·측정용)
+- OpenAIStub: /v1/chat/completions 흉내. 배치(JSON 배열: 판정/요약) / 단건 요청 모두 응답, 429 주입 가능
+  → cfg["openai"]["base_url"] = stub.base_url 로 연결
+- FakeSMTP: smtplib.SMTP 대체 (with FakeSMTP.patch(): ... → 발송 메일을 메모리에 기록)
+- SMTPStub: 실제 소켓으로 SMTP 대화를 받는 최소 서버 (연결 재사용/재연결/수신자 거부 측정용)
+  → cfg["email"] = {"smtp_host": "127.0.0.1", "smtp_port": stub.port, "use_tls": False, ...}
+"""
+import json, time, smtplib, threading, socketserver
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RELEVANT_HINTS = ("유가", "정제마진", "경유", "휘발유", "항공유", "등유", "중유", "아스팔트", "가격", "수요", "입찰", "조달")
+
+
+def _judge(text: str) -> dict:
+    ok = any(h in (text or "") for h in RELEVANT_HINTS)
+    return {"relevant": ok, "confidence": 0.9 if ok else 0.1}
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _StubServer:
+    server_class = ThreadingHTTPServer
+
+    def __init__(self):
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        self.httpd = self.server_class(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+
+class OpenAIStub(_StubServer):
+    """
+    - latency: 요청당 지연(초)
+    - fail_429: 앞의 N개 요청에 429 + Retry-After 응답
+    """
+
+    def __init__(self, latency: float = 0.0, fail_429: int = 0, retry_after: float = 0.2):
+        super().__init__()
+        self.latency = latency
+        self.fail_429 = fail_429
+        self.retry_after = retry_after
+        self.requests = 0
+        self.articles = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def answer(self, messages: list) -> str:
+        user = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+        try:
+            items = json.loads(user)
+        except ValueError:
+            items = None
+        if isinstance(items, list):
+            with self._lock:
+                self.articles += len(items)
+            system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+            if "요약" in system:
+                return json.dumps([{"id": it.get("id"), "summary": (it.get("text") or "")[:80]} for it in items],
+                                  ensure_ascii=False)
+            return json.dumps([{"id": it.get("id"), **_judge(it.get("text"))} for it in items], ensure_ascii=False)
+        with self._lock:
+            self.articles += 1
+        if "요약" in user:
+            return (user.split("\n\n", 1)[-1])[:80]
+        return json.dumps(_judge(user), ensure_ascii=False)
+
+    def _handler(self):
+        stub = self
+
+        class H(BaseHTTPRequestHandler):
+            def log_message(self, *a):
+                pass
+
+            def _send(self, code, body, headers=None):
+                raw = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with stub._lock:
+                    stub.requests += 1
+                    throttle = stub.fail_429 > 0
+                    if throttle:
+                        stub.fail_429 -= 1
+                if throttle:
+                    self._send(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                               {"Retry-After": str(stub.retry_after)})
+                    return
+                if stub.latency:
+                    time.sleep(stub.latency)
+                content = stub.answer(body.get("messages", []))
+                self._send(200, {
+                    "id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                })
+
+        return H
+
+
+class FakeSMTP:
+    """smtplib.SMTP 와 같은 호출 순서(starttls → login → sendmail → quit)를 받아 기록만 한다"""
+    sent = []          # (from, to_list, 메시지 크기) — 클래스 공용
+    latency = 0.0
+
+    def __init__(self, host="", port=0, *a, **kw):
+        self.host, self.port = host, port
+
+    def starttls(self, *a, **kw):
+        return (220, b"ready")
+
+    def login(self, user, password):
+        return (235, b"ok")
+
+    def sendmail(self, from_addr, to_addrs, msg, *a, **kw):
+        if self.latency:
+            time.sleep(self.latency)
+        to_addrs = [to_addrs] if isinstance(to_addrs, str) else list(to_addrs)
+        FakeSMTP.sent.append((from_addr, to_addrs, len(msg)))
+        return {}
+
+    def send_message(self, msg, from_addr=None, to_addrs=None, *a, **kw):
+        return self.sendmail(from_addr or msg["From"], to_addrs or msg["To"].split(","), msg.as_string())
+
+    def noop(self):
+        return (250, b"ok")
+
+    def quit(self):
+        return (221, b"bye")
+
+    close = quit
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.quit()
+
+    @classmethod
+    @contextmanager
+    def patch(cls, latency: float = 0.0):
+        orig = smtplib.SMTP
+        cls.sent, cls.latency = [], latency
+        smtplib.SMTP = cls
+        try:
+            yield cls
+        finally:
+            smtplib.SMTP = orig
+
+
+class SMTPStub(_StubServer):
+    """
+    EHLO/HELO, AUTH PLAIN|LOGIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT 만 처리 (STARTTLS 없음 → use_tls: false)
+    - handshake_latency: 연결 인사(220) 전 지연 → TLS + 인증 왕복 비용 흉내
+    - latency: DATA 처리 지연
+    - refuse: 550 으로 거부할 수신자 주소
+    - drop_after: 연결당 N 통 받은 뒤 연결을 끊음 (재연결 시험)
+    """
+    server_class = _TCPServer
+
+    def __init__(self, latency: float = 0.0, handshake_latency: float = 0.0, refuse=(), drop_after: int = 0):
+        super().__init__()
+        self.latency = latency
+        self.handshake_latency = handshake_latency
+        self.refuse = set(refuse)
+        self.drop_after = drop_after
+        self.connections = 0
+        self.auths = 0
+        self.messages = []      # (from, [수신자], 크기)
+        self._lock = threading.Lock()
+
+    def _handler(self):
+        stub = self
+
+        class H(socketserver.StreamRequestHandler):
+            def _w(self, line):
+                self.wfile.write((line + "\r\n").encode("ascii"))
+
+            def handle(self):
+                with stub._lock:
+                    stub.connections += 1
+                if stub.handshake_latency:
+                    time.sleep(stub.handshake_latency)
+                self._w("220 stub ESMTP")
+                sender, rcpts, count = None, [], 0
+                while True:
+                    raw = self.rfile.readline()
+                    if not raw:
+                        return
+                    line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                    verb, _, arg = line.partition(" ")
+                    verb = verb.upper()
+                    if verb == "EHLO":
+                        self._w("250-stub")
+                        self._w("250-AUTH PLAIN LOGIN")
+                        self._w("250 8BITMIME")
+                    elif verb == "HELO":
+                        self._w("250 stub")
+                    elif verb == "AUTH":
+                        parts = arg.split()
+                        if parts and parts[0].upper() == "LOGIN":
+                            prompts = ("UGFzc3dvcmQ6",) if len(parts) > 1 else ("VXNlcm5hbWU6", "UGFzc3dvcmQ6")
+                            for prompt in prompts:
+                                self._w(f"334 {prompt}")
+                                self.rfile.readline()
+                        elif len(parts) < 2:
+                            self._w("334 ")
+                            self.rfile.readline()
+                        with stub._lock:
+                            stub.auths += 1
+                        self._w("235 2.7.0 Authentication successful")
+                    elif verb == "MAIL":
+                        sender, rcpts = arg.split(":", 1)[-1].split()[0].strip("<>"), []
+                        self._w("250 OK")
+                    elif verb == "RCPT":
+                        addr = arg.split(":", 1)[-1].split()[0].strip("<>")
+                        if addr in stub.refuse:
+                            self._w("550 5.1.1 no such user")
+                        else:
+                            rcpts.append(addr)
+                            self._w("250 OK")
+                    elif verb == "DATA":
+                        if not rcpts:
+                            self._w("554 no valid recipients")
+                            continue
+                        self._w("354 End data with <CR><LF>.<CR><LF>")
+                        size = 0
+                        while True:
+                            l = self.rfile.readline()
+                            if not l or l in (b".\r\n", b".\n"):
+                                break
+                            size += len(l)
+                        if stub.latency:
+                            time.sleep(stub.latency)
+                        with stub._lock:
+                            stub.messages.append((sender, rcpts, size))
+                        count += 1
+                        self._w("250 OK queued")
+                        sender, rcpts = None, []
+                        if stub.drop_after and count >= stub.drop_after:
+                            return
+                    elif verb == "RSET":
+                        sender, rcpts = None, []
+                        self._w("250 OK")
+                    elif verb == "NOOP":
+                        self._w("250 OK")
+                    elif verb == "QUIT":
+                        self._w("221 Bye")
+                        return
+                    else:
+                        self._w("502 5.5.2 command not implemented")
+
+        return H
@@ -1,73 +1,98 @@
 # -*- coding: utf-8 -*-
 """
 news_pipeline.py (수요·가격 시그널 중심 / AI 최소 사용 / 전역 제목 유사도 dedupe)
-- Google News(RSS) 수집
+- 소스 어댑터(utils/sources.py) 병렬 수집: Google News(RSS) + 설정된 언론사/기관 RSS·로컬 아카이브
 - 도메인/블랙리스트 차단 → (휴리스틱 스코어) → 상위 N개만 AI 관련성 → 최종 정렬/선발
-- 메일 카드: 제목, 게시 시각(KST), 원문 링크
+- 메일 카드: 제목, 게시 시각(KST), 원문 링크 (+ openai.enable_summarize 면 1~2문장 요약)
 - 최종 단계: 제목 유사도 전역 dedupe
 """
 
-import os, sys, smtplib, pytz, yaml, feedparser, requests
-from bs4 import BeautifulSoup
+import os, sys, pytz
 from datetime import datetime, timedelta
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from urllib.parse import quote_plus
 
 from utils.scoring import compute_score, apply_unrelated_penalty
-from utils.relevance import is_relevant
-from utils.dedupe import dedupe_items, normalize_url, dedupe_by_title_similarity
-
-try:
-    from apscheduler.schedulers.blocking import BlockingScheduler
-except Exception:
-    BlockingScheduler = None
+from utils.relevance import is_relevant, RelevanceEngine
+from utils.summarize import SummaryEngine
+from utils.dedupe import dedupe_stream, normalize_url, dedupe_by_title_similarity
+from utils.feed_cache import FeedCache
+from utils.sources import (google_news_url, google_news_rss,   # noqa: F401 (기존 import 경로 유지)
+                           sources_from_config, minor_feeds, fetch_sources, bare_title)
+from utils.html_text import html_to_text
+from utils.links import LinkResolver
+from utils.matcher import BLOCK_GROUP
+from utils.config import load_config, get_runtime, ConfigError
+from utils.state import StateStore, title_fingerprint
+from utils.render import render_digest
+from utils.select import TopK, BorderlinePool
+from utils.article import Article
+from utils.metrics import get_metrics, reset_metrics, profiled, profile_mode
+from utils.daemon import WarmContext, schedules_from_config
+
+# 실행(main)에 필요한 환경변수. 모듈 import 만으로는 검사하지 않음 (도구/벤치에서 함수 재사용)
+# feedparser·requests·openai·jinja2·smtplib·apscheduler 는 실제로 쓰는 경로에서 처음 로드
+REQUIRED_ENV = ("OPENAI_API_KEY", "GMAIL_USER", "GMAIL_PASS")
+
+
+def required_env(cfg: dict) -> tuple:
+    """
+    REQUIRED_ENV 중 이 설정에 필요한 것 (계정 출처 규칙은 utils/mailer.mail_settings 와 같음)
+    GMAIL_USER 가 없고 email 블록에 username 과 비밀번호 변수(password_env, 없으면 GMAIL_PASS)가 있으면
+    SMTP secrets(GMAIL_USER/GMAIL_PASS)는 요구하지 않음
+    """
+    e, env = cfg.get("email", {}) or {}, os.environ
+    if not env.get("GMAIL_USER") and e.get("username") and (
+            env.get(e.get("password_env") or "SMTP_PASSWORD") or env.get("GMAIL_PASS")):
+        return ("OPENAI_API_KEY",)
+    return REQUIRED_ENV
 
-OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
-GMAIL_USER = os.environ.get("GMAIL_USER")
-GMAIL_PASS = os.environ.get("GMAIL_PASS")
-TO_LIST = os.environ.get("TO_LIST", "").split(",")
 
-if not OPENAI_API_KEY or not GMAIL_USER or not GMAIL_PASS:
-    print("❌ 환경변수가 올바르게 설정되지 않았습니다.")
-    exit(1)
+def check_env(names=REQUIRED_ENV) -> list:
+    """비어 있는 환경변수 이름 목록"""
+    return [n for n in names if not os.environ.get(n)]
 
 
 # ----------------- helpers -----------------
 
-def load_config(path="config.yaml"):
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
-
-def google_news_rss(query, cfg):
-    base = cfg["sources"]["google_news"]["base"]
-    params = {
-        "q": f'{query} when:1d',
-        "hl": cfg["sources"]["google_news"]["hl"],
-        "gl": cfg["sources"]["google_news"]["gl"],
-        "ceid": cfg["sources"]["google_news"]["ceid"],
-    }
-    q = "&".join([f"{k}={quote_plus(v)}" for k, v in params.items()])
-    url = f"{base}?{q}"
-    headers = {"User-Agent": "Mozilla/5.0 (refinery-news-bot; +github)"}
-    r = requests.get(url, headers=headers, timeout=15)
-    r.raise_for_status()
-    return feedparser.parse(r.text)
+def fetch_feeds(taxonomy, cfg, ctx=None, sources=None):
+    """
+    전 소스(utils/sources.py) × taxonomy 키워드를 동시에 수집 → {(소스 이름, 쿼리): feed 또는 Exception}
+    ctx: 상주 실행의 세션/캐시 재사용
+    """
+    if sources is None:
+        sources = ctx.sources(cfg) if ctx is not None else sources_from_config(cfg)
+    cache = ctx.feed_cache(cfg) if ctx is not None else FeedCache.from_config(cfg)
+    feeds = fetch_sources(sources, taxonomy, cfg, session=ctx.session(cfg) if ctx is not None else None,
+                          cache=cache, parser=ctx.parser if ctx is not None else None)
+    if cache is not None:
+        removed = cache.prune()
+        print(f"[CACHE] feeds: hits(304)={cache.hits}, misses={cache.misses}, evicted={removed}")
+    return feeds
+
+def resolve_links(feeds, cfg, ctx=None) -> dict:
+    """
+    수집한 entry 의 Google News 리다이렉트 링크 → 원문 URL {링크: 원문} (utils/links.py)
+    EntryIndex 가 차단 도메인 판정·URL 키·기사 링크에 원문 URL 을 쓰도록 파싱 전에 한 번에 해석
+    """
+    resolver = ctx.link_resolver(cfg) if ctx is not None else LinkResolver(cfg)
+    if not resolver.enabled:
+        return {}
+    links = (e.get("link", "") for d in feeds.values() if not isinstance(d, Exception) for e in d.entries)
+    try:
+        return resolver.resolve(links)
+    finally:
+        if ctx is not None:
+            resolver.flush()
+        else:
+            resolver.close()
 
 def extract_text(entry):
     title = entry.get("title", "")
-    summary_html = entry.get("summary", "")
-    try:
-        summary = BeautifulSoup(summary_html, "html5lib").get_text(" ", strip=True)
-    except Exception:
-        summary = BeautifulSoup(summary_html, "html.parser").get_text(" ", strip=True)
+    summary = html_to_text(entry.get("summary", ""))   # 비정상 HTML 만 BeautifulSoup 폴백
     return title, summary
 
 def is_block_domain(link, cfg):
-    for d in cfg["filters"]["block_domains"]:
-        if d in link:
-            return True
-    return False
+    """링크 호스트명이 filters.block_domains 의 도메인(또는 하위 도메인)인지"""
+    return get_runtime(cfg).is_block_host(link)
 
 def within_window(published, tz, start_dt, end_dt):
     if not published:
@@ -93,79 +118,491 @@ def published_dt_kst(published_parsed, tz):
         pass
     return datetime(1970,1,1, tzinfo=tz)
 
-def make_html_email(grouped, cfg, start_dt, end_dt):
-    head = f"""
-    <html><body style="font-family:Arial,Helvetica,sans-serif;">
-      <h2> [이원호 사원의 특수영업팀 일일 정유 뉴스] ({start_dt.strftime('%Y-%m-%d %H:%M')} ~ {end_dt.strftime('%Y-%m-%d %H:%M')} KST)</h2>
-      <p style="color:#666;">수요/가격 변동에 직결된 기사 위주로 선별했습니다. (게시 시각 표기)</p>
-    """
-    cards = []
-    for major, minors in grouped.items():
-        cards.append(f'<h3 style="border-bottom:2px solid #eee;padding-bottom:4px;">{major}</h3>')
-        for minor, items in minors.items():
-            if not items:
-                continue
-            cards.append(f'<h4 style="margin:10px 0 6px 0;color:#0a4;">{minor}</h4>')
-            for it in items:
-                posted = it.get("published_local", "시간 정보 없음")
-                cards.append(f"""
-                <div style="border:1px solid #eee;border-radius:10px;padding:12px;margin:8px 0;">
-                  <div style="color:#888;font-size:0.9em;margin-bottom:4px;">📅 {posted}</div>
-                  <div style="font-weight:600;margin-bottom:10px;">{it['title']}</div>
-                  <a style="display:inline-block;background:#1565C0;color:#fff;padding:8px 12px;border-radius:6px;text-decoration:none;"
-                     href="{it['link']}" target="_blank" rel="noopener">원문 보기</a>
-                </div>
-                """)
-    tail = "</body></html>"
-    return head + "\n".join(cards) + tail
-
-def send_email(html, cfg):
-    from email.mime.multipart import MIMEMultipart
-    from email.mime.text import MIMEText
-    import smtplib
-    from datetime import datetime
-    import os
-
-    GMAIL_USER = os.environ.get("GMAIL_USER")
-    GMAIL_PASS = os.environ.get("GMAIL_PASS")
-    TO_LIST = os.environ.get("TO_LIST", "").split(",")
-
-    subject = f"[특수영업팀 Daily 뉴스클리핑] {datetime.now().strftime('%Y-%m-%d')}"
+def published_ts(published_parsed):
+    """published_parsed(UTC) → epoch. 없거나 해석 불가면 None (표시: 시간 정보 없음)"""
+    try:
+        if published_parsed:
+            return datetime(*published_parsed[:6], tzinfo=pytz.utc).timestamp()
+    except Exception:
+        pass
+    return None
 
-    msg = MIMEMultipart("alternative")
-    msg["Subject"] = subject
-    msg["From"] = GMAIL_USER
-    msg["To"] = ", ".join(TO_LIST)
+class EntryIndex:
+    """
+    실행 단위 entry 인덱스 (정규화 link / GUID 기준)
+    - 여러 키워드·소분류에 중복으로 걸린 기사도 파싱/시각 변환/차단 판정/용어 스캔/기본 점수는 1회만
+    - records: 키 → Article (통과) 또는 제외 사유 문자열
+    - state 가 있으면 이전 실행에서 이미 발송된 기사는 파싱 전에 제외
+    - memo: 시간창과 무관한 파싱 결과(Article / "keyword") 보관소. 상주 실행에서 실행 간 공유
+    - links: resolve_links 결과. 리다이렉트 링크 대신 원문 URL 로 키/차단 판정/기사 링크를 만든다
+    - cross_source: 소스가 여럿이면 다른 소스에서 이미 통과한 기사와 제목 지문(매체명 꼬리 제외)이 같은
+      entry 는 파싱하지 않고 그 기사로 합침 (같은 소스 안의 비슷한 제목은 기존 dedupe 단계가 처리)
+    - plan_release/release: 키(와 제목 지문)를 마지막으로 읽는 소분류가 끝나면 records 에서 해제
+      → 보관하는 Article 이 전체 수집 entry 가 아니라 아직 남은 소분류가 읽을 기사로 한정
+    """
 
-    msg.attach(MIMEText("[이원호 사원의 특수영업팀 일일 정유 뉴스] (HTML 버전 참조)", "plain", "utf-8"))
-    msg.attach(MIMEText(html, "html", "utf-8"))
+    def __init__(self, cfg, tz, start_dt, end_dt, state=None, memo=None, cross_source=False, links=None):
+        self.cfg = cfg
+        self.rt = get_runtime(cfg)
+        self.state = state
+        self.memo = memo
+        self.tz = tz
+        self.start_dt = start_dt
+        self.end_dt = end_dt
+        self.records = {}
+        self.raw = 0
+        self.released = 0
+        self.release_at = {}        # 소분류 번호 → 그 소분류 후 해제할 키 / ("fp", 제목 지문)
+        self.links = links or {}
+        self.fps = {} if cross_source else None     # 제목 지문 → (소스, Article)
+        self.cross_dups = 0
+
+    def link_of(self, entry):
+        link = entry.get("link", "")
+        return self.links.get(link, link)
+
+    def key_of(self, entry):
+        link = self.link_of(entry)
+        return normalize_url(link) if link else (entry.get("id") or "")
+
+    def _parse(self, entry, key):
+        """통과하면 Article, 아니면 제외 사유"""
+        link = self.link_of(entry)
+        # 판정 순서는 기존 run_once 와 동일 (도메인 → 제목 → 시간창 → 차단 키워드)
+        if not link or self.rt.is_block_host(link):
+            return "domain"
+        if self.state is not None and self.state.is_delivered(key, entry.get("title", "")):
+            self.state.skipped += 1
+            return "delivered"
+        if not entry.get("title", ""):
+            return "no_title"
+        pub_p = getattr(entry, "published_parsed", None)
+        if not within_window(pub_p, self.tz, self.start_dt, self.end_dt):
+            return "window"
+        if self.memo is None or not key:
+            return self._analyze(entry, key, pub_p)
+        rec = self.memo.get(key)
+        if rec is None:
+            rec = self.memo[key] = self._analyze(entry, key, pub_p)
+        else:
+            get_metrics().incr("parse.memo_hits")
+        return rec
+
+    def _analyze(self, entry, key, pub_p):
+        """본문 추출 + 용어 스캔 + 기본 점수 (시간창/발송 이력과 무관 → 메모 가능)"""
+        link = self.link_of(entry)
+        title, summary = extract_text(entry)
+        art = Article(title, link, summary, ts=published_ts(pub_p), tz=self.tz, key=key)
+        art._norm_url = key
+        # 용어 스캔 1회 → 차단 키워드/점수/휴리스틱 관련성 판정에 공용
+        art.hits = self.rt.matcher.scan(art.text)
+        if art.hits.any(BLOCK_GROUP):
+            return "keyword"
+        art.base_score = compute_score(art.text, self.cfg, hits=art.hits)   # 소분류와 무관
+        return art.warm()
+
+    def add(self, entry, major, minor, source=""):
+        """entry 를 등록하고 (처음 보는 기사면 파싱) 소분류용 Article 반환. 제외된 기사면 None"""
+        self.raw += 1
+        key = self.key_of(entry)
+        rec = self.records.get(key) if key else None
+        if rec is None:
+            fp = title_fingerprint(bare_title(entry.get("title", ""))) if self.fps is not None else ""
+            hit = self.fps.get(fp) if fp else None
+            if hit is not None and hit[0] != source:
+                rec = hit[1]
+                self.cross_dups += 1
+                get_metrics().incr("entries.cross_source_dup")
+            else:
+                with get_metrics().timer("parse.entry"):
+                    rec = self._parse(entry, key)
+                get_metrics().incr(f"entries.{rec if isinstance(rec, str) else 'accepted'}")
+                if fp and not isinstance(rec, str):
+                    self.fps.setdefault(fp, (source, rec))
+            if key:
+                self.records[key] = rec
+        if isinstance(rec, str):
+            return None
+        return rec.for_minor(major, minor)
+
+    def plan_release(self, taxonomy, feeds, sources):
+        """
+        소분류 순서대로 읽힐 entry 의 키·제목 지문마다 마지막 소분류 번호를 계산 (파싱 없이 키만)
+        memo 가 있으면(상주 실행) 메모가 Article 을 어차피 보관하고 remember 가 records 를 쓰므로 하지 않음
+        """
+        if self.memo is not None:
+            return
+        last = {}
+        for mi, tax in enumerate(taxonomy):
+            for _, e in minor_entries(tax, feeds, sources):
+                key = self.key_of(e)
+                if key:
+                    last[key] = mi
+                if self.fps is not None:
+                    fp = title_fingerprint(bare_title(e.get("title", "")))
+                    if fp:
+                        last[("fp", fp)] = mi
+        self.release_at = {}
+        for k, mi in last.items():
+            self.release_at.setdefault(mi, []).append(k)
+
+    def release(self, mi):
+        """소분류 mi 가 마지막으로 읽은 기사 해제 (선발 heap 의 소분류용 복사본은 그대로)"""
+        for k in self.release_at.pop(mi, ()):
+            if isinstance(k, tuple):
+                self.fps.pop(k[1], None)
+            elif self.records.pop(k, None) is not None:
+                self.released += 1
+
+    @property
+    def unique(self):
+        return len(self.records) + self.released
 
-    server = smtplib.SMTP("smtp.gmail.com", 587)
-    server.starttls()
-    server.login(GMAIL_USER, GMAIL_PASS)
-    refused = server.sendmail(GMAIL_USER, TO_LIST, msg.as_string())
-    server.quit()
+def make_html_email(grouped, cfg, start_dt, end_dt):
+    """HTML 본문만 필요할 때 (templates/digest.html, 바이트 예산 적용)"""
+    return render_digest(grouped, cfg, start_dt, end_dt).html
 
-    if refused:
-        print("❌ 일부 수신자가 거부됨:", refused)
-    else:
-        print(f"[OK] 메일 발송 완료 ({len(TO_LIST)}명)")
+def send_email(html, cfg, grouped=None, render=None, text=None, subject=None):
+    """
+    config.yaml email 블록 기준 발송 (utils/mailer.py). 연결 1개를 재사용해 다이제스트를 순서대로 보냄
+    - text: text/plain 본문 (없으면 안내 문구), subject: 제목 (없으면 일일 다이제스트 제목)
+    - grouped/render: delivery=teams 일 때 팀별 맞춤 본문 생성용 (render → Digest 또는 html)
+    - 한 명도 받지 못하면 예외 → 전달 기록(mark_delivered)을 남기지 않음
+    """
+    from utils.mailer import mail_settings, plan_digests, send_digests   # smtplib/ssl 은 발송 시에만 로드
+    st = mail_settings(cfg)
+    report = send_digests(st, plan_digests(st, html, grouped, render, text=text, subject=subject))
+    failed = report.failures()
+    if failed:
+        print("❌ 일부 수신자가 거부됨:", {r: f"{s}: {why}" for r, (s, why) in failed.items()})
+    if not report.delivered:
+        raise RuntimeError(f"no recipient accepted the digest ({len(failed)} failed)")
+    print(f"[OK] 메일 발송 완료 ({report.delivered}명, 메시지 {len(report.messages)}통, 연결 {report.connects}회)")
+    return report
+
+
+# ----------------- selection stages -----------------
+# fetch → 파싱/1차필터 → 소분류 dedupe → 사전 점수 → 선발(유한 heap) → 전역 dedupe → 렌더
+# 기사는 제너레이터로 흘러가고, 소분류마다 선발 상위 K 개(+ AI 판정 대기분)만 메모리에 남는다
+
+def _mentions(entry, keywords):
+    text = f"{entry.get('title', '')} {entry.get('summary', '')}".lower()
+    return any(k in text for k in keywords)
+
+def _feed_entries(src, d, kws_low):
+    """피드 1개에서 소분류가 읽는 entry (고정 피드는 소분류 키워드가 있는 것만)"""
+    if src.per_query:
+        return d.entries
+    return (e for e in d.entries if _mentions(e, kws_low))
+
+def minor_entries(tax, feeds, sources):
+    """iter_minor_items 와 같은 순서·필터의 (소스, entry) (파싱·출력 없음, 실패/해제된 피드는 건너뜀)"""
+    kws_low = [k.lower() for k in tax["keywords"]]
+    for src, q in minor_feeds(sources, tax):
+        d = feeds.get((src.name, q))
+        if d is None or isinstance(d, Exception):
+            continue
+        for e in _feed_entries(src, d, kws_low):
+            yield src, e
+
+def iter_minor_items(tax, feeds, index, sources):
+    """
+    소분류가 읽는 피드(소스 순 → 키워드 순)의 entry → 1차필터 통과 기사 (EntryIndex 로 기사당 1회 파싱)
+    고정 피드(rss/archive)는 제목·요약에 소분류 키워드가 있는 entry 만
+    """
+    major, minor = tax["major"], tax["minor"]
+    kws_low = None
+    for src, q in minor_feeds(sources, tax):
+        label = q if src.per_query else src.name
+        try:
+            d = feeds[(src.name, q)]
+            if isinstance(d, Exception):
+                raise d
+            print(f"[FETCH] {major}/{minor}/{label}: entries={len(d.entries)}")
+            if not src.per_query:
+                kws_low = kws_low or [k.lower() for k in tax["keywords"]]
+            for e in _feed_entries(src, d, kws_low):
+                art = index.add(e, major, minor, source=src.name)
+                if art is not None:
+                    yield art
+        except Exception as ex:
+            print(f"[WARN] fetch failed for {label}: {ex}")
+
+def prescore_items(items, keywords, cfg):
+    """휴리스틱 사전 점수(pre_score) 부여"""
+    hitset = set(keywords)
+    for it in items:
+        it.pre_score = it.base_score + apply_unrelated_penalty(hitset, it.text, cfg, hits=it.hits)
+        yield it
+
+def _ai_text(it):
+    return f"{it.title}. {it.summary}"
+
+def summarize_digest(grouped, cfg, ctx=None):
+    """
+    최종 다이제스트 기사(전역 dedupe 후)에만 요약(brief) 부여. 꺼져 있으면 아무것도 하지 않음
+    - 상주 실행은 ctx 의 요약기(클라이언트·캐시) 재사용, 아니면 실행 1회용으로 만들고 닫음
+    """
+    if not get_runtime(cfg).summarize_enabled:
+        return 0
+    items = [it for minors in grouped.values() for its in minors.values() for it in its]
+    if not items:
+        return 0
+    engine = ctx.summarizer(cfg) if ctx is not None else SummaryEngine(cfg)
+    try:
+        for it, brief in zip(items, engine.summarize([_ai_text(it) for it in items])):
+            it.brief = brief
+    finally:
+        if ctx is not None:
+            engine.flush()
+        else:
+            engine.close()
+    print(f"[AI] summarize: articles={len(items)}, calls={engine.calls}, rate_limited={engine.rate_limited}, "
+          f"cache_hits={engine.cache.hits}, heuristic={engine.fallbacks}")
+    return len(items)
+
+def cached_ai_score(it, engine, state=None):
+    """판정 캐시 → 상태 저장소 순으로 이전 AI 판정 조회 (없으면 None)"""
+    sc = engine.lookup(_ai_text(it))
+    if sc is None and state is not None:
+        sc = state.ai_score(it.key)
+    return sc
+
+class MinorSelection:
+    """
+    소분류 1개의 스트리밍 선발 상태 (bucket 전체 대신 유한 크기 heap 만 보관)
+    - keep: 관련성이 확정된 기사 중 선발 순서 상위 cap 개
+        scored/global: (사전 점수, 게시 시각) 내림차순 / recent: 게시 시각 내림차순 (동점은 도착 순)
+    - AI 판정 대기: scored → 사전 점수 상위 ai_cap 개, global → 컷오프 근처 풀
+      대기에서 밀려난 기사는 휴리스틱 관련성으로 확정되어 keep 으로 간다
+    - 로컬 분류기(openai.local_model)가 있으면 이전 판정이 없는 기사를 LOCAL_CHUNK 개씩 먼저 점수 매겨
+      확신 구간은 바로 확정 → 애매한 기사만 AI 판정 대기(예산)에 들어감
+    - seen: 이미 확정된 전역 URL 집합이면 keep 에 넣기 전에 제외 (cap = K 로 충분)
+    """
+    RECORD_CHUNK = 500
+    LOCAL_CHUNK = 64
+
+    def __init__(self, tax, cfg, mode, cap, engine=None, state=None, ai_cap=0, seen=None):
+        self.tax = tax
+        self.cfg, self.state = cfg, state
+        self.scored = mode in ("scored", "global")
+        rt = get_runtime(cfg)
+        self.k = rt.app.max_items_per_subcategory
+        self.keep = TopK(cap)
+        self.seen = seen
+        self.engine = engine
+        self.pending = None
+        if engine is not None and mode == "scored":
+            self.pending = TopK(ai_cap)
+        elif engine is not None and mode == "global":
+            self.pending = BorderlinePool(self.k, rt.borderline_margin)
+        self.raw = self.deduped = 0
+        self.ai_used = self.ai_cached = self.borderline = self.local_decided = 0
+
+    def counted(self, items):
+        for it in items:
+            self.raw += 1
+            yield it
+
+    def _decide(self, seq, it):
+        """관련성이 확정된 기사 → 선발 heap (AI 판정 → 로컬 분류기 → 휴리스틱 순)"""
+        score = it.ai_score if it.ai_score is not None else it.local_score
+        if self.scored and not is_relevant(_ai_text(it), self.cfg, hits=it.hits,
+                                           ai_score=-1.0 if score is None else score):
+            return
+        if self.seen is not None and it.norm_url in self.seen:
+            return
+        ts = it.sort_ts
+        self.keep.push((it.pre_score or 0.0, ts) if self.scored else ts, seq, it)
+
+    def _record(self, items):
+        """사전 점수 + AI 판정만 기록 (로컬 분류기 점수는 다음 실행에서 AI 판정으로 읽히지 않도록 제외)"""
+        if self.state is not None and items:
+            self.state.record((it.key, it.title, it.pre_score, it.ai_score) for it in items)
+
+    def _prejudged(self, items):
+        """(기사, 이전 AI 판정, 로컬 확정 점수) 스트림 (없으면 None). 로컬 분류기는 LOCAL_CHUNK 개씩 일괄"""
+        if self.pending is None:
+            for it in items:
+                yield it, None, None
+            return
+        if self.engine.local is None:
+            for it in items:
+                yield it, cached_ai_score(it, self.engine, self.state), None
+            return
+        chunk = []
+        for it in items:
+            chunk.append((it, cached_ai_score(it, self.engine, self.state)))
+            if len(chunk) >= self.LOCAL_CHUNK:
+                yield from self._local_chunk(chunk)
+                chunk = []
+        yield from self._local_chunk(chunk)
+
+    def _local_chunk(self, chunk):
+        todo = [it for it, cached in chunk if cached is None]
+        local = dict(zip(map(id, todo), self.engine.local_scores([_ai_text(it) for it in todo])))
+        out = []
+        for it, cached in chunk:
+            sc = local.get(id(it))
+            if sc is not None:
+                self.local_decided += 1
+            out.append((it, cached, sc))
+        return out
+
+    def feed(self, items):
+        """dedupe/사전 점수까지 끝난 기사 스트림 소비"""
+        buf = []
+        for seq, (it, cached, local) in enumerate(self._prejudged(items)):
+            self.deduped = seq + 1
+            decided = True
+            if self.pending is not None:
+                if cached is not None:
+                    it.ai_score = cached
+                    self.ai_cached += 1
+                elif local is not None:
+                    it.local_score = local
+                else:
+                    decided = False
+            if isinstance(self.pending, BorderlinePool):
+                for s, x, done in self.pending.push(it.pre_score, seq, it, decided):
+                    if not done:
+                        self._decide(s, x)
+            elif not decided:
+                out = self.pending.push(it.pre_score, seq, it)
+                if out is not None:
+                    self._decide(*out)
+            if decided:
+                self._decide(seq, it)
+            buf.append(it)
+            if len(buf) >= self.RECORD_CHUNK:
+                self._record(buf)
+                buf = []
+        self._record(buf)
+
+    def classify_pending(self):
+        """scored: 대기 중인 사전 점수 상위 기사 일괄 AI 판정 → 관련성 확정. 판정 수 반환"""
+        todo = self.pending.ranked()
+        for (seq, it), sc in zip(todo, self.engine.classify([_ai_text(it) for _, it in todo], local=False)):
+            it.ai_score = sc
+            self._decide(seq, it)
+        self.ai_used = len(todo)
+        self._record([it for _, it in todo])
+        self.pending = None
+        return len(todo)
+
+    def release_pool(self):
+        """global: 계획 후 풀에 남은 미확정 기사(AI 판정 또는 휴리스틱) 관련성 확정"""
+        judged = []
+        for score, seq, it, decided in self.pending.pool:
+            if not decided:
+                self._decide(seq, it)
+                if it.ai_score is not None:
+                    judged.append(it)
+        self._record(judged)
+        self.pending = None
+
+    def select(self, global_seen):
+        """선발 순서대로 전역 URL 중복을 건너뛰며 상위 K 개"""
+        kept = take_unseen((it for _, it in self.keep.ranked()), self.k, global_seen)
+        self.keep = None
+        return kept
+
+def take_unseen(ranked, k, global_seen):
+    """선발 순서의 기사 중 global_seen 에 없는 URL 상위 k 개 (고른 URL 은 global_seen 에 추가)"""
+    kept = []
+    for it in ranked:
+        nu = it.norm_url
+        if nu in global_seen:
+            continue
+        kept.append(it)
+        global_seen.add(nu)
+        if len(kept) >= k:
+            break
+    return kept
+
+def assign_ai_global(selections, engine, budget, cfg):
+    """
+    2단계 선발: 전 소분류 스트리밍 후 AI 판정 대상을 전역으로 계획
+    - 소분류별 컷오프(max_items_per_subcategory 경계 점수)에 가까운 기사일수록 판정 가치가 큼
+    - 컷오프와 borderline_margin 이상 떨어진 기사(확실히 포함/제외)는 판정하지 않음
+    - 선택된 기사는 한 번에 일괄 판정 (같은 기사가 여러 소분류에 있으면 1회만)
+    """
+    margin = get_runtime(cfg).borderline_margin
+    candidates = []
+    for mi, m in enumerate(selections):
+        cutoff = m.pending.cutoff() if m.k > 0 else None
+        if cutoff is None:
+            continue
+        for rank, (score, seq, it, decided) in m.pending.ranked():
+            if decided:
+                continue
+            dist = abs(score - cutoff)
+            if dist <= margin:
+                m.borderline += 1
+                candidates.append((dist, rank, mi, it))
+
+    candidates.sort(key=lambda c: (c[0], c[1], c[2]))
+    chosen, texts = [], {}
+    for dist, rank, mi, it in candidates:
+        txt = _ai_text(it)
+        if txt not in texts:
+            if len(texts) >= budget:
+                continue
+            texts[txt] = None
+        chosen.append((mi, it, txt))
 
+    uniq = list(texts)
+    for txt, sc in zip(uniq, engine.classify(uniq, local=False)):
+        texts[txt] = sc
+    for mi, it, txt in chosen:
+        it.ai_score = texts[txt]
+        selections[mi].ai_used += 1
 
+    for m in selections:
+        m.release_pool()
+        tax = m.tax
+        print(f"[AI-PLAN] {tax['major']}/{tax['minor']}: bucket={m.deduped}, borderline={m.borderline}, allocated={m.ai_used}, cached={m.ai_cached}, local={m.local_decided}")
+    print(f"[AI-PLAN] candidates={len(candidates)}, budget={budget}, classified={len(uniq)}")
+    return len(uniq)
 
 
 # ----------------- main -----------------
 
-def run_once():
-    cfg = load_config()
-    tz = pytz.timezone(cfg["app"]["timezone"])
+REPORT_PATH = "run_report.json"
+
+def run_once(ctx=None):
+    """
+    1회 실행 + 계측 리포트(run_report.json) 저장. --profile=cprofile|tracemalloc 지원
+    - ctx: 상주 실행의 WarmContext (세션/AI 판정기/상태/피드 캐시/파싱 메모 재사용, 실행 후에도 유지)
+    """
+    metrics = reset_metrics()
+    try:
+        with profiled(profile_mode(sys.argv), metrics):
+            _run_once(metrics, ctx)
+    finally:
+        metrics.write(REPORT_PATH)
+
+def _ai_engine(cfg):
+    """실행 1회용 AI 판정기 (꺼져 있거나 키가 없으면 None)"""
+    if not get_runtime(cfg).ai_enabled:
+        return None
+    engine = RelevanceEngine(cfg)
+    if not engine.available:
+        print("[WARN] AI filter enabled but OpenAI client/API key unavailable → heuristic only")
+        return None
+    return engine
+
+def _run_once(metrics, ctx=None):
+    cfg = ctx.config() if ctx is not None else load_config()
+    rt = get_runtime(cfg)
+    tz = rt.app.tz
     now = datetime.now(tz)
     end_dt = now
-    start_dt = end_dt - timedelta(hours=cfg["app"]["lookback_hours"])
+    start_dt = end_dt - timedelta(hours=rt.app.lookback_hours)
 
-    selection_mode = (cfg.get("app", {}).get("selection_mode") or "scored").lower()
+    selection_mode = rt.app.selection_mode
 
-    print(f"[INFO] Window: {start_dt} ~ {end_dt} {cfg['app']['timezone']} (mode={selection_mode})")
+    print(f"[INFO] Window: {start_dt} ~ {end_dt} {rt.app.timezone} (mode={selection_mode})")
     taxonomy = cfg["taxonomy"]
 
     grouped = {}                 # ← 반드시 run_once() 내부에서 초기화
@@ -173,110 +610,100 @@ def run_once():
     total_kept = 0
     global_seen_urls = set()
 
-    ai_budget = int(cfg.get("openai", {}).get("relevance_max_checks", 20))
+    ai_budget = rt.relevance_max_checks
     ai_used = 0
-    use_ai = bool(cfg.get("openai", {}).get("enable_ai_filter", False))
-
-    # --- 수집/1차필터/선별 ---
-    for tax in taxonomy:
-        major, minor = tax["major"], tax["minor"]
-        grouped.setdefault(major, {})
-        grouped[major].setdefault(minor, [])
-        keywords = tax["keywords"]
-
-        bucket = []
-        for kw in keywords:
-            try:
-                d = google_news_rss(kw, cfg)
-                print(f"[FETCH] {major}/{minor}/{kw}: entries={len(d.entries)}")
-                for e in d.entries:
-                    link = e.get("link", "")
-                    if not link or is_block_domain(link, cfg):
-                        continue
-                    title, summary = extract_text(e)
-                    if not title:
-                        continue
-                    pub_p = getattr(e, "published_parsed", None)
-                    if not within_window(pub_p, tz, start_dt, end_dt):
-                        continue
-                    low = f"{title} {summary}".lower()
-                    if any(w.lower() in low for w in cfg["filters"].get("block_keywords", [])):
-                        continue
-                    bucket.append({
-                        "title": title,
-                        "summary": summary,
-                        "link": link,
-                        "published": getattr(e, "published", ""),
-                        "published_local": to_local_str(pub_p, tz),
-                        "published_dt": published_dt_kst(pub_p, tz),
-                        "major": major,
-                        "minor": minor
-                    })
-            except Exception as ex:
-                print(f"[WARN] fetch failed for {kw}: {ex}")
-
-        before = len(bucket)
-        bucket = dedupe_items(bucket)  # (URL + 제목유사도 + 단어중복) 소분류 dedupe
-        after_dedupe = len(bucket)
-
-        if selection_mode == "scored":
-            hitset = set(keywords)
-            for it in bucket:
-                txt = f"{it['title']} {it.get('summary','')}"
-                it["_pre_score"] = compute_score(txt, cfg) + apply_unrelated_penalty(hitset, txt, cfg)
-            bucket.sort(key=lambda x: x["_pre_score"], reverse=True)
-
-            can_use = max(0, ai_budget - ai_used)
-            top_n = min(can_use, len(bucket))
-            filtered = []
-            cfg_no_ai = {**cfg, "openai": {**cfg.get("openai", {}), "enable_ai_filter": False}}
-            ai_used_now = 0
-            for idx, it in enumerate(bucket):
-                txt = f"{it['title']}. {it.get('summary','')}"
-                if idx < top_n and use_ai:
-                    rel = is_relevant(txt, cfg)     # 빠른 버전 relevance (delay=0, retries=1)
-                    ai_used += 1
-                    ai_used_now += 1
-                else:
-                    rel = is_relevant(txt, cfg_no_ai)
-                if rel:
-                    filtered.append(it)
-
-            # 점수 우선, 동점 최신순
-            filtered.sort(key=lambda it: (it.get("_pre_score", 0.0), it.get("published_dt")), reverse=True)
-        else:
-            filtered = sorted(bucket, key=lambda it: it.get("published_dt"), reverse=True)
-            ai_used_now = 0
-
-        kept_unique = []
-        for it in filtered:
-            nu = normalize_url(it["link"])
-            if nu in global_seen_urls:
-                continue
-            kept_unique.append(it)
-            global_seen_urls.add(nu)
-            if len(kept_unique) >= cfg["app"]["max_items_per_subcategory"]:
-                break
-
+    engine = ctx.engine(cfg) if ctx is not None else _ai_engine(cfg)
+
+    # --- 수집: 전 소스 × 키워드 동시 fetch (요청별 실패/지연은 해당 피드만 손실) ---
+    sources = ctx.sources(cfg) if ctx is not None else sources_from_config(cfg)
+    with metrics.timer("stage.fetch"):
+        feeds = fetch_feeds(taxonomy, cfg, ctx, sources)
+    # --- 링크 해석: 리다이렉트 → 원문 URL (차단 도메인·URL dedupe 가 원문 기준으로 동작) ---
+    with metrics.timer("stage.resolve"):
+        links = resolve_links(feeds, cfg, ctx)
+    state = ctx.state(cfg) if ctx is not None else StateStore.from_config(cfg)    # 이전 실행의 발송/판정 이력
+    index = EntryIndex(cfg, tz, start_dt, end_dt, state=state, memo=ctx.memo if ctx is not None else None,
+                       cross_source=len(sources) > 1, links=links)
+    index.plan_release(taxonomy, feeds, sources)
+
+    # --- 1단계: 소분류별 스트리밍 (수집 → 1차필터 → dedupe → 사전 점수 → 유한 heap 선발) ---
+    # global 모드는 전 소분류를 본 뒤 AI 를 계획하므로 선발 확정이 끝까지 미뤄진다
+    # → 앞 소분류들이 가져갈 수 있는 URL 수(K × 앞 소분류 수)만큼 여유를 두고 보관
+    k = rt.app.max_items_per_subcategory
+    deferred = engine is not None and selection_mode == "global"
+    last_use = {(src.name, q): mi for mi, tax in enumerate(taxonomy) for src, q in minor_feeds(sources, tax)}
+    selections = []
+
+    def _finalize(sel):
+        nonlocal total_kept, total_raw
+        major, minor = sel.tax["major"], sel.tax["minor"]
+        kept_unique = sel.select(global_seen_urls)
         grouped[major][minor] = kept_unique
+        metrics.incr("select.kept", len(kept_unique), minor=minor)
         total_kept += len(kept_unique)
-        total_raw += before
-        print(f"[KEEP] {major}/{minor}: raw={before}, deduped={after_dedupe}, ai_used_now={ai_used_now}, kept={len(kept_unique)}")
+        total_raw += sel.raw
+        print(f"[KEEP] {major}/{minor}: raw={sel.raw}, deduped={sel.deduped}, ai_used_now={sel.ai_used}, ai_cached={sel.ai_cached}, local={sel.local_decided}, kept={len(kept_unique)}")
+
+    for mi, tax in enumerate(taxonomy):
+        grouped.setdefault(tax["major"], {}).setdefault(tax["minor"], [])
+        sel = MinorSelection(tax, cfg, selection_mode,
+                             cap=k * (mi + 1) if deferred else k,
+                             engine=engine, state=state, ai_cap=max(0, ai_budget - ai_used),
+                             seen=None if deferred else global_seen_urls)
+        with metrics.timer("stage.stream", minor=tax["minor"]):
+            stream = dedupe_stream(sel.counted(iter_minor_items(tax, feeds, index, sources)))   # (URL + 제목유사도 + 단어중복)
+            if selection_mode in ("scored", "global"):
+                stream = prescore_items(stream, tax["keywords"], cfg)
+            sel.feed(stream)
+        for src, q in minor_feeds(sources, tax):
+            if last_use[(src.name, q)] == mi:
+                feeds.pop((src.name, q), None)     # 이후 소분류에서 쓰지 않는 피드는 바로 해제
+        index.release(mi)                              # 이후 소분류가 읽지 않는 기사도 해제
+
+        # --- 2단계(scored): taxonomy 순 선착순 AI 예산 배분 → 3단계: 전역 URL 중복 제외 상위 K 확정 ---
+        if deferred:
+            selections.append(sel)
+            continue
+        if sel.pending is not None:
+            with metrics.timer("stage.ai"):
+                ai_used += sel.classify_pending()
+        _finalize(sel)
+
+    # --- 2단계(global): 경계 기사 우선 일괄 AI 판정 → 3단계: 소분류 순서대로 선발 확정 ---
+    if deferred:
+        with metrics.timer("stage.ai"):
+            ai_used = assign_ai_global(selections, engine, ai_budget, cfg)
+        for sel in selections:
+            _finalize(sel)
+        selections = None
 
     # ---------------- 최종: 제목 유사도 + 단어 중복 기반 전역 dedupe ----------------
-    all_final = []
-    for major, minors in grouped.items():
-        for minor, items in minors.items():
-            all_final.extend(items)
+    all_final = (it for minors in grouped.values() for items in minors.values() for it in items)
 
     # utils.dedupe.dedupe_by_title_similarity(threshold=0.88, min_overlap=2)를 사용
-    final_dedup = dedupe_by_title_similarity(all_final, threshold=0.88, min_overlap=2)
+    with metrics.timer("stage.dedupe_global"):
+        final_dedup = dedupe_by_title_similarity(all_final, threshold=0.88, min_overlap=2)
 
     grouped_clean = {}
     for it in final_dedup:
-        grouped_clean.setdefault(it["major"], {}).setdefault(it["minor"], []).append(it)
+        grouped_clean.setdefault(it.major, {}).setdefault(it.minor, []).append(it)
+
+    if ctx is not None:
+        ctx.remember(index.records)
+    if engine is not None:
+        if ctx is not None:
+            engine.flush()
+        else:
+            engine.close()
+        print(f"[AI] relevance: articles={ai_used}, calls={engine.calls}, rate_limited={engine.rate_limited}, "
+              f"cache_hits={engine.cache.hits}, local={engine.local_decided}")
 
-    html = make_html_email(grouped_clean, cfg, start_dt, end_dt)
+    with metrics.timer("stage.summarize"):
+        summarize_digest(grouped_clean, cfg, ctx)
+
+    with metrics.timer("stage.render"):
+        digest = render_digest(grouped_clean, cfg, start_dt, end_dt)
+    html = digest.html
 
     try:
         with open("email_preview.html", "w", encoding="utf-8") as f:
@@ -285,29 +712,182 @@ def run_once():
     except Exception as ex:
         print(f"[WARN] preview save failed: {ex}")
 
-    print(f"[SUMMARY] total_raw={total_raw}, total_kept={total_kept}, final={len(final_dedup)}, ai_used_total={ai_used}")
+    metrics.incr("entries.raw", index.raw)
+    metrics.incr("entries.unique", index.unique)
+    metrics.incr("digest.items", len(final_dedup))
+    print(f"[SUMMARY] entries_raw={index.raw}, entries_unique={index.unique}, cross_source_dups={index.cross_dups}, skipped_delivered={state.skipped if state else 0}, total_raw={total_raw}, total_kept={total_kept}, final={len(final_dedup)}, ai_used_total={ai_used}")
 
     try:
-        send_email(html, cfg)   # ← 환경변수 기반 send_email(html, cfg) 유지
+        with metrics.timer("stage.send"):
+            send_email(html, cfg, grouped_clean, text=digest.text,
+                       render=lambda g: render_digest(g, cfg, start_dt, end_dt))
         print(f"[OK] Sent {len(final_dedup)} items.")
+        if state is not None:
+            state.mark_delivered([(it.key, it.title) for it in final_dedup])
     except Exception as ex:
         print(f"[ERROR] send_email failed: {ex}")
         raise
+    finally:
+        if state is not None:
+            removed = state.compact()
+            print(f"[STATE] delivered={len(state.delivered_urls)}, compacted={removed}")
+            if ctx is None:
+                state.close()
 
 
-def main():
-    if "--once" in sys.argv or BlockingScheduler is None:
-        run_once()
+# ----------------- 상주 실행: 속보 알림 + 스케줄 -----------------
+
+ALERT_REPORT_PATH = "alert_report.json"
+ALERT_HEADING = "[특수영업팀 가격 시그널 속보]"
+
+def run_alert(ctx, spec):
+    """속보 알림 1회 (계측 리포트는 alert_report.json)"""
+    metrics = reset_metrics()
+    try:
+        _run_alert(metrics, ctx, spec)
+    finally:
+        metrics.write(ALERT_REPORT_PATH)
+
+def _run_alert(metrics, ctx, spec):
+    """
+    직전 tick 이후 피드에 새로 보인 기사 중 시그널 용어군(signal_groups)에 걸리고
+    기본 점수가 min_score 이상인 기사만 골라 즉시 발송
+    - 세션/피드 캐시(304)/파싱 메모/상태 저장소는 상주 컨텍스트 것을 그대로 사용 → 대부분 재파싱 없음
+    - 게시 시각이 lookback_minutes 보다 오래된 기사는 제외 (첫 tick 의 범위이기도 함)
+    """
+    cfg = ctx.config()
+    tz = get_runtime(cfg).app.tz
+    end_dt = datetime.now(tz)
+    start_dt = end_dt - timedelta(minutes=spec["lookback_minutes"])
+    minors = set(spec["minors"])
+    taxonomy = [t for t in cfg["taxonomy"] if not minors or t["minor"] in minors]
+
+    sources = ctx.sources(cfg)
+    with metrics.timer("stage.fetch"):
+        feeds = fetch_feeds(taxonomy, cfg, ctx, sources)
+    with metrics.timer("stage.resolve"):
+        links = resolve_links(feeds, cfg, ctx)
+    index = EntryIndex(cfg, tz, start_dt, end_dt, state=ctx.state(cfg), memo=ctx.memo,
+                       cross_source=len(sources) > 1, links=links)
+    seen = ctx.seen_for(spec["name"])
+    now_ts = end_dt.timestamp()
+    fresh = []
+    with metrics.timer("stage.stream"):
+        for tax in taxonomy:
+            for it in iter_minor_items(tax, feeds, index, sources):
+                if it.key in seen:
+                    continue
+                seen[it.key] = now_ts
+                if it.base_score >= spec["min_score"] and any(it.hits.any(g) for g in spec["signal_groups"]):
+                    fresh.append(it)
+    fresh.sort(key=lambda it: (it.base_score, it.sort_ts), reverse=True)
+    items = list(dedupe_stream(fresh))
+
+    engine = ctx.engine(cfg) if spec["use_ai"] else None
+    if engine is not None and items:
+        items = items[:spec["max_items"] * 2]
+        with metrics.timer("stage.ai"):
+            scores = engine.classify([_ai_text(it) for it in items])
+        engine.flush()
+        items = [it for it, sc in zip(items, scores) if is_relevant(it.text, cfg, hits=it.hits, ai_score=sc)]
+    items = items[:spec["max_items"]]
+
+    metrics.incr("entries.raw", index.raw)
+    metrics.incr("alert.items", len(items))
+    print(f"[ALERT] {spec['name']}: entries_raw={index.raw}, new={len(fresh)}, alert={len(items)}")
+    if not items:
         return
-    cfg = load_config()
-    tz = pytz.timezone(cfg["app"]["timezone"])
-    sched = BlockingScheduler(timezone=tz)
-    sched.add_job(run_once, 'cron', hour=cfg["app"]["run_time_hour"], minute=0)
-    print(f"[Scheduler] Started. Will run daily at %02d:00 %s." % (cfg["app"]["run_time_hour"], cfg["app"]["timezone"]))
+    grouped = {}
+    for it in items:
+        grouped.setdefault(it.major, {}).setdefault(it.minor, []).append(it)
+    with metrics.timer("stage.summarize"):
+        summarize_digest(grouped, cfg, ctx)
+    with metrics.timer("stage.render"):
+        digest = render_digest(grouped, cfg, start_dt, end_dt, heading=ALERT_HEADING)
+    with metrics.timer("stage.send"):
+        send_email(digest.html, cfg, grouped, text=digest.text,
+                   subject=f"{ALERT_HEADING} {end_dt.strftime('%Y-%m-%d %H:%M')}",
+                   render=lambda g: render_digest(g, cfg, start_dt, end_dt, heading=ALERT_HEADING))
+
+def run_daemon(path="config.yaml"):
+    """
+    상주 실행: daemon.schedules 의 다이제스트/속보 알림을 웜 컨텍스트 하나로 실행
+    - tick 마다 config.yaml 수정 여부만 확인 (바뀌면 다시 읽고 스케줄도 다시 등록)
+    - tick 은 한 번에 하나씩 (겹치면 뒤 tick 은 앞 tick 이 끝난 뒤 1회로 합쳐짐)
+    """
+    from apscheduler.schedulers.blocking import BlockingScheduler
+    ctx = WarmContext(path)
+    cfg = ctx.config()
+    sched = BlockingScheduler(timezone=get_runtime(cfg).app.tz,
+                              job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 600})
+    installed = []
+
+    def _install(cfg):
+        nonlocal installed
+        specs = schedules_from_config(cfg)
+        if specs == installed:
+            return
+        sched.remove_all_jobs()
+        for spec in specs:
+            sched.add_job(_tick, "cron", args=(spec,), id=spec["name"], **spec["cron"])
+            print(f"[Scheduler] {spec['name']} ({spec['kind']}): cron {spec['cron']}")
+        installed = specs
+
+    def _tick(spec):
+        with ctx.lock:
+            t0 = datetime.now()
+            try:
+                if spec["kind"] == "alert":
+                    run_alert(ctx, spec)
+                else:
+                    run_once(ctx)
+            except Exception as ex:
+                print(f"[ERROR] {spec['name']} failed: {ex}")
+            ctx.last_tick[spec["name"]] = t0.timestamp()
+            print(f"[DAEMON] {spec['name']} done in {(datetime.now() - t0).total_seconds():.1f}s (config reloads={ctx.reloads})")
+            _install(ctx.config())
+
+    _install(cfg)
+    print(f"[Scheduler] Started ({len(installed)} schedules, {cfg['app']['timezone']}).")
     try:
         sched.start()
     except (KeyboardInterrupt, SystemExit):
         pass
+    finally:
+        ctx.close()
+
+def check_config(path="config.yaml") -> int:
+    """--check-config: 설정 검증만 (중복 키도 오류로 취급). 종료 코드 반환"""
+    try:
+        cfg = load_config(path, strict=True)
+    except (ConfigError, OSError) as ex:
+        print(f"❌ {ex}")
+        return 1
+    rt = get_runtime(cfg)
+    print(f"[OK] {path}: {len(cfg['taxonomy'])} minors, {len(rt.matcher.pattern_ids)} terms, "
+          f"{len(rt.block_domains)} blocked domains, mode={rt.app.selection_mode}")
+    return 0
+
+def main():
+    if "--check-config" in sys.argv:
+        sys.exit(check_config())
+    if "--train-local-model" in sys.argv or "--local-model-report" in sys.argv:
+        from utils.local_model import train_from_log, report_from_log
+        cfg = load_config()
+        sys.exit(train_from_log(cfg) if "--train-local-model" in sys.argv else report_from_log(cfg))
+    missing = check_env(required_env(load_config()))
+    if missing:
+        print(f"❌ 환경변수가 올바르게 설정되지 않았습니다. ({', '.join(missing)})")
+        sys.exit(1)
+    if "--once" not in sys.argv:
+        try:
+            import apscheduler  # noqa: F401
+        except Exception:
+            print("[WARN] apscheduler not installed → single run")
+        else:
+            run_daemon()
+            return
+    run_once()
 
 if __name__ == "__main__":
     main()
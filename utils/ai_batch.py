@@ -0,0 +1,178 @@
+# utils/ai_batch.py
+"""
+배치·동시 chat 요청 공용 엔진 (RelevanceEngine / SummaryEngine 의 기반)
+- 기사 여러 건을 [{"id": 번호, "text": 기사}] JSON 배열 하나로 묶어 한 요청에 보내고, JSON 배열 응답을 id 로 되돌림
+- 공유 AsyncOpenAI 클라이언트 + 토큰 버킷(<prefix>_rpm)으로 배치 동시 실행 (<prefix>_concurrency)
+  429 → Retry-After 만큼 버킷 정지 후 재시도 (<prefix>_retries)
+- 하위 클래스는 system 프롬프트(SYSTEM)와 응답 항목 해석(parse_item)만 정함
+- 결과 캐시 키: sha256(모델·프롬프트·텍스트). 이벤트 루프/클라이언트는 close() 전까지 유지 (상주 실행 재사용)
+- openai SDK 는 처음 호출할 때 로드 (import 만 수백 ms)
+"""
+import os, re, json, time, hashlib
+from functools import lru_cache
+
+from utils.ratelimit import AsyncTokenBucket
+from utils.metrics import get_metrics
+
+
+@lru_cache(maxsize=None)
+def openai_sdk():
+    """openai SDK (AI 를 실제로 호출할 때 처음 로드). 미설치면 None"""
+    try:
+        import openai
+    except Exception:
+        return None
+    return openai
+
+
+def retry_after(exc, default: float) -> float:
+    """RateLimitError 응답의 Retry-After(초/ms) 헤더, 없으면 default"""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return default
+
+
+def is_rate_limited(exc) -> bool:
+    sdk = openai_sdk()
+    return (sdk is not None and isinstance(exc, sdk.RateLimitError)) or "429" in str(exc) or "Rate limit" in str(exc)
+
+
+def parse_json_array(ans: str, n: int, parse_item, missing=None) -> list:
+    """응답 속 JSON 배열 → 입력 순서 목록. parse_item(항목 dict) 가 None 이거나 빠진 번호는 missing"""
+    out = [missing] * n
+    m = re.search(r"\[.*\]", ans or "", re.S)
+    if not m:
+        return out
+    try:
+        arr = json.loads(m.group(0))
+    except ValueError:
+        return out
+    for v in arr:
+        if not isinstance(v, dict):
+            continue
+        try:
+            i = int(v.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= i < n:
+            val = parse_item(v)
+            if val is not None:
+                out[i] = val
+    return out
+
+
+class BatchChatEngine:
+    """
+    openai.<prefix>_batch_size / _concurrency / _retries / _backoff_secs / _rpm 설정의 배치 요청기
+    - calls: API 요청 수, rate_limited: 429 횟수 (상주 실행은 실행마다 0 으로 초기화)
+    """
+    KIND = ""               # 계측 kind / 경고 문구
+    SYSTEM = ""             # 배치 system 프롬프트 (캐시 키에도 포함)
+    TEXT_LIMIT = 1800       # 기사당 보내는 글자 수
+    TEMPERATURE = 0.0
+    TOKENS_PER_ITEM = 40    # max_tokens = 기사 수 × TOKENS_PER_ITEM + 20
+    MISSING = None          # 응답에서 빠지거나 실패한 기사 값
+
+    def __init__(self, cfg: dict, prefix: str, model: str, batch_size=10, backoff=8.0, adaptive=False):
+        o = cfg.get("openai", {}) or {}
+        self.model = model
+        self.batch_size = max(1, int(o.get(f"{prefix}_batch_size", batch_size)))
+        self.concurrency = max(1, int(o.get(f"{prefix}_concurrency", 4)))
+        self.retries = max(0, int(o.get(f"{prefix}_retries", 2)))
+        self.backoff = float(o.get(f"{prefix}_backoff_secs", backoff))
+        self.rpm = float(o.get(f"{prefix}_rpm", 60))
+        self.api_key = os.getenv(o.get("api_key_env", "OPENAI_API_KEY") or "")
+        self.base_url = o.get("base_url") or None
+        self.calls = 0
+        self.rate_limited = 0
+        self._loop = None
+        self._client = None
+        self._bucket = AsyncTokenBucket.per_minute(self.rpm, burst=self.concurrency, adaptive=adaptive)
+
+    @property
+    def available(self) -> bool:
+        return bool(self.api_key) and openai_sdk() is not None
+
+    def key(self, text: str) -> str:
+        h = hashlib.sha256()
+        for part in (self.model, self.SYSTEM, (text or "")[:self.TEXT_LIMIT]):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def parse_item(self, v: dict):
+        """응답 항목 1개 → 값 (못 쓰면 None)"""
+        raise NotImplementedError
+
+    def parse_answer(self, ans: str, n: int) -> list:
+        return parse_json_array(ans, n, self.parse_item, self.MISSING)
+
+    def request_all(self, texts: list) -> list:
+        """texts 를 batch_size 씩 묶어 동시 요청 → 입력 순서 결과 (실패분은 MISSING)"""
+        import asyncio
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self._request_all(texts))
+
+    async def _request_all(self, texts: list) -> list:
+        import asyncio
+        if self._client is None:
+            self._client = openai_sdk().AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+        sem = asyncio.Semaphore(self.concurrency)
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+        async def _run(batch):
+            async with sem:
+                return await self._request(batch)
+
+        results = await asyncio.gather(*[_run(b) for b in batches])
+        return [s for r in results for s in r]
+
+    async def _request(self, batch: list) -> list:
+        bucket = self._bucket
+        payload = json.dumps([{"id": i, "text": (t or "")[:self.TEXT_LIMIT]} for i, t in enumerate(batch)],
+                             ensure_ascii=False)
+        for attempt in range(self.retries + 1):
+            await bucket.acquire()
+            m = get_metrics()
+            t0 = time.perf_counter()
+            try:
+                self.calls += 1
+                m.incr("ai.calls", kind=self.KIND)
+                m.incr("ai.articles", len(batch), kind=self.KIND)
+                resp = await self._client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "system", "content": self.SYSTEM},
+                              {"role": "user", "content": payload}],
+                    temperature=self.TEMPERATURE,
+                    max_tokens=self.TOKENS_PER_ITEM * len(batch) + 20,
+                )
+                m.observe("ai.latency", time.perf_counter() - t0, kind=self.KIND)
+                bucket.succeeded()
+                return self.parse_answer(resp.choices[0].message.content or "", len(batch))
+            except Exception as e:
+                if not is_rate_limited(e):
+                    print(f"[WARN] {self.KIND} batch failed: {e}")
+                    break
+                self.rate_limited += 1
+                m.incr("ai.rate_limited", kind=self.KIND)
+                bucket.pause(retry_after(e, self.backoff))
+        return [self.MISSING] * len(batch)
+
+    def flush(self):
+        """결과 캐시 저장 (하위 클래스). 클라이언트/이벤트 루프는 유지"""
+
+    def close(self):
+        self.flush()
+        if self._loop is not None:
+            if self._client is not None:
+                self._loop.run_until_complete(self._client.close())
+                self._client = None
+            self._loop.close()
+            self._loop = None
@@ -0,0 +1,154 @@
+# utils/article.py
+"""
+기사 레코드 (slots dataclass)
+- 게시 시각은 epoch(ts) 하나만 보관하고 표시 문자열/aware datetime 은 필요할 때 계산
+- 파생 값 캐시: 정규화 URL, 정규화 제목 + 제목 토큰, 소문자 본문(제목+요약, 지연 계산)
+- 소분류별 선발 상태(major/minor/pre_score/ai_score/local_score)는 for_minor() 복사본에 둔다
+  (파싱·스캔 결과와 캐시 문자열은 복사본끼리 공유)
+- 이전 dict 기반 코드와의 호환: it["title"], it.get("_pre_score", 0.0), "_ai_score" in it 등
+"""
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Optional
+
+import pytz
+
+from utils.dedupe import normalize_url, prepare_title
+
+NO_TIME = "시간 정보 없음"
+
+# dict 키 → 속성 (선발 점수는 None 이면 "없는 키"로 취급)
+_ALIASES = {"_key": "key", "_pre_score": "pre_score", "_ai_score": "ai_score"}
+_OPTIONAL = frozenset(("pre_score", "ai_score"))
+_DERIVED = frozenset(("published_local", "published_dt", "text", "norm_url"))
+
+
+@dataclass(slots=True, eq=False)
+class Article:
+    title: str
+    link: str
+    summary: str = ""
+    ts: Optional[float] = None          # 게시 시각 epoch(UTC). None → 시간 정보 없음
+    tz: Any = None                      # 표시 시간대 (pytz, 기사 간 공유)
+    key: str = ""                       # EntryIndex / 상태 저장소 키
+    major: str = ""
+    minor: str = ""
+    pre_score: Optional[float] = None   # 소분류 사전 점수
+    ai_score: Optional[float] = None    # AI 판정 점수 (음수: 실패)
+    hits: Any = None                    # matcher.ScanResult (제목+요약)
+    base_score: Optional[float] = None  # compute_score (소분류 무관)
+    brief: str = ""                     # 다이제스트 표시용 1~2문장 요약 (요약 단계에서 채움)
+    local_score: Optional[float] = None # 로컬 분류기 확정 점수 (AI 판정이 아니므로 상태 저장소에 남기지 않음)
+    _norm_url: Optional[str] = field(default=None, repr=False)
+    _title_key: Any = field(default=None, repr=False)      # (정규화 제목, 토큰 튜플) 또는 False(빈 제목)
+    _text_low: Optional[str] = field(default=None, repr=False)
+
+    # ---- 파생 값 ----
+    @property
+    def text(self) -> str:
+        return f"{self.title} {self.summary}"
+
+    @property
+    def text_low(self) -> str:
+        if self._text_low is None:
+            self._text_low = self.text.lower()
+        return self._text_low
+
+    @property
+    def norm_url(self) -> str:
+        if self._norm_url is None:
+            self._norm_url = normalize_url(self.link)
+        return self._norm_url
+
+    @property
+    def title_key(self):
+        """dedupe 용 (정규화 제목, 정렬된 토큰 튜플). 빈 제목이면 None"""
+        if self._title_key is None:
+            self._title_key = prepare_title(self.title) or False
+        return self._title_key or None
+
+    @property
+    def title_tokens(self) -> tuple:
+        tk = self.title_key
+        return tk[1] if tk else ()
+
+    @property
+    def sort_ts(self) -> float:
+        """정렬용 시각 (시간 정보가 없으면 기존과 같이 1970-01-01 현지 시각)"""
+        if self.ts is not None:
+            return self.ts
+        return datetime(1970, 1, 1, tzinfo=self.tz or pytz.utc).timestamp()
+
+    @property
+    def published_dt(self) -> datetime:
+        tz = self.tz or pytz.utc
+        if self.ts is None:
+            return datetime(1970, 1, 1, tzinfo=tz)
+        return datetime.fromtimestamp(self.ts, tz)
+
+    @property
+    def published_local(self) -> str:
+        if self.ts is None:
+            return NO_TIME
+        return datetime.fromtimestamp(self.ts, self.tz or pytz.utc).strftime("%Y-%m-%d %H:%M KST")
+
+    def warm(self):
+        """dedupe 용 파생 값(정규화 URL, 제목 토큰)을 미리 채움 → for_minor 복사본들이 공유.
+        소문자 본문은 용어 사전 밖 키워드 검사에만 쓰여 처음 필요할 때 계산한다"""
+        _ = self.norm_url, self.title_key
+        return self
+
+    def for_minor(self, major: str, minor: str) -> "Article":
+        """소분류 선발용 복사본 (선발 점수는 비운 채로, 나머지 슬롯은 공유)"""
+        a = Article(self.title, self.link, self.summary, self.ts, self.tz, self.key, major, minor,
+                    None, None, self.hits, self.base_score)
+        a._norm_url, a._title_key, a._text_low = self._norm_url, self._title_key, self._text_low
+        return a
+
+    # ---- dict 호환 어댑터 (이행 기간용) ----
+    def _attr(self, k):
+        name = _ALIASES.get(k, k)
+        if name not in _FIELD_NAMES and name not in _DERIVED:
+            raise KeyError(k)
+        return name
+
+    def __getitem__(self, k):
+        name = self._attr(k)
+        v = getattr(self, name)
+        if v is None and name in _OPTIONAL:
+            raise KeyError(k)
+        return v
+
+    def get(self, k, default=None):
+        try:
+            return self[k]
+        except KeyError:
+            return default
+
+    def __contains__(self, k):
+        try:
+            self[k]
+            return True
+        except KeyError:
+            return False
+
+    def __setitem__(self, k, v):
+        name = self._attr(k)
+        if name in _DERIVED:
+            raise KeyError(f"{k} is derived")
+        setattr(self, name, v)
+
+    @classmethod
+    def from_dict(cls, d: dict, tz=None) -> "Article":
+        """기존 기사 dict → Article (published_dt 가 있으면 epoch 로 변환)"""
+        dt = d.get("published_dt")
+        return cls(
+            title=d.get("title", ""), link=d.get("link", ""), summary=d.get("summary", ""),
+            ts=dt.timestamp() if dt is not None and dt.year > 1970 else None,
+            tz=tz or (dt.tzinfo if dt is not None else None),
+            key=d.get("_key", ""), major=d.get("major", ""), minor=d.get("minor", ""),
+            pre_score=d.get("_pre_score"), ai_score=d.get("_ai_score"),
+        )
+
+
+_FIELD_NAMES = frozenset(f.name for f in fields(Article) if not f.name.startswith("_"))
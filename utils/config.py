@@ -0,0 +1,276 @@
+# utils/config.py
+"""
+config.yaml 로드 → 검증 → 런타임 설정 컴파일
+- 중복 키 검출: YAML 은 같은 매핑에 같은 키가 두 번 나오면 뒤 값이 앞 값을 조용히 덮어씀
+  → 줄 번호와 함께 경고 (strict 면 ConfigError). 값은 기존 safe_load 와 같이 뒤 값 우선
+- 스키마 검증: 필수 섹션/키와 타입, taxonomy 항목 형식. 문제는 모아서 ConfigError 한 번으로 보고
+- RuntimeConfig: 설정 로드 1회당 1번 만드는 불변 객체 (cfg['_runtime'] 에 보관, 모든 단계가 공유)
+  타입 변환된 app/AI 설정, 점수 가중치, 차단 도메인 접미사 집합(호스트명 O(1) 판정), 컴파일된 매처
+  cfg 를 고친 뒤에는 compile_config 로 다시 만든다 (설정을 바꾼 사본 dict 는 자동으로 새로 컴파일)
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+import pytz
+import yaml
+
+from utils.matcher import SCORING_GROUPS, TermMatcher, get_matcher
+from utils.sources import SOURCE_KINDS
+
+SELECTION_MODES = ("scored", "global", "recent")
+# scheme://[userinfo@]host[:port] 의 host (urlparse 보다 가볍고 hot path 에서 충분)
+_HOST_RE = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*://(?:[^@/?#]*@)?(\[[^\]]*\]|[^:/?#]*)")
+
+
+class ConfigError(ValueError):
+    """설정 파일 오류 (problems: 문제 목록)"""
+
+    def __init__(self, problems, path=None):
+        self.problems = list(problems)
+        where = f" ({path})" if path else ""
+        super().__init__(f"invalid config{where}:\n  - " + "\n  - ".join(self.problems))
+
+
+class _DupKeyLoader(yaml.SafeLoader):
+    """매핑마다 중복 키를 기록하는 SafeLoader"""
+
+    def __init__(self, stream):
+        super().__init__(stream)
+        self.duplicates = []    # (키, 줄, 처음 나온 줄)
+
+    def construct_mapping(self, node, deep=False):
+        if isinstance(node, yaml.MappingNode):
+            first = {}
+            for key_node, _ in node.value:
+                if not isinstance(key_node, yaml.ScalarNode) or key_node.tag == "tag:yaml.org,2002:merge":
+                    continue
+                line = key_node.start_mark.line + 1
+                if key_node.value in first:
+                    self.duplicates.append((key_node.value, line, first[key_node.value]))
+                else:
+                    first[key_node.value] = line
+        return super().construct_mapping(node, deep=deep)
+
+
+def load_yaml(path: str):
+    """YAML 파일 → (데이터, 중복 키 목록)"""
+    with open(path, "r", encoding="utf-8") as f:
+        loader = _DupKeyLoader(f)
+        try:
+            data = loader.get_single_data()
+        finally:
+            loader.dispose()
+    return data, loader.duplicates
+
+
+def _is_num(v) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _is_str_list(v) -> bool:
+    return isinstance(v, list) and all(isinstance(x, str) for x in v)
+
+
+def validate(cfg) -> list:
+    """스키마 검사 → 문제 목록 (없으면 빈 목록)"""
+    if not isinstance(cfg, dict):
+        return ["top level must be a mapping"]
+    problems = []
+
+    def section(name, required=True):
+        sec = cfg.get(name)
+        if sec is None:
+            if required:
+                problems.append(f"missing section '{name}'")
+            return {}
+        if not isinstance(sec, dict):
+            problems.append(f"'{name}' must be a mapping")
+            return {}
+        return sec
+
+    app = section("app")
+    if app:
+        tz = app.get("timezone")
+        if not isinstance(tz, str) or tz not in pytz.all_timezones_set:
+            problems.append(f"app.timezone: unknown timezone {tz!r}")
+        if not _is_num(app.get("lookback_hours")) or app["lookback_hours"] <= 0:
+            problems.append("app.lookback_hours must be a positive number")
+        n = app.get("max_items_per_subcategory")
+        if not isinstance(n, int) or isinstance(n, bool) or n < 0:
+            problems.append("app.max_items_per_subcategory must be a non-negative integer")
+        h = app.get("run_time_hour", 8)
+        if not isinstance(h, int) or not 0 <= h <= 23:
+            problems.append("app.run_time_hour must be an integer 0-23")
+        mode = (app.get("selection_mode") or "scored")
+        if str(mode).lower() not in SELECTION_MODES:
+            problems.append(f"app.selection_mode must be one of {', '.join(SELECTION_MODES)} (got {mode!r})")
+
+    sources = section("sources")
+    gn = sources.get("google_news")
+    if not isinstance(gn, dict):
+        problems.append("missing mapping 'sources.google_news'")
+    else:
+        for k in ("base", "hl", "gl", "ceid"):
+            if not isinstance(gn.get(k), str) or not gn[k]:
+                problems.append(f"sources.google_news.{k} must be a non-empty string")
+    for name, spec in sources.items():
+        if not isinstance(spec, dict):
+            problems.append(f"sources.{name} must be a mapping")
+            continue
+        kind = spec.get("kind") or name
+        if kind not in SOURCE_KINDS:
+            problems.append(f"sources.{name}.kind must be one of {', '.join(SOURCE_KINDS)} (got {kind!r})")
+        elif kind == "rss" and not (spec.get("url") or spec.get("path")):
+            problems.append(f"sources.{name}: rss source needs 'url' or 'path'")
+        elif kind == "archive" and not spec.get("path"):
+            problems.append(f"sources.{name}: archive source needs 'path'")
+        for k in ("rpm", "timeout_secs"):
+            if spec.get(k) is not None and (not _is_num(spec[k]) or spec[k] < 0):
+                problems.append(f"sources.{name}.{k} must be a non-negative number")
+        if spec.get("minors") is not None and not _is_str_list(spec["minors"]):
+            problems.append(f"sources.{name}.minors must be a list of strings")
+
+    filters = section("filters", required=False)
+    for k in ("block_domains", "block_keywords"):
+        if filters.get(k) is not None and not _is_str_list(filters[k]):
+            problems.append(f"filters.{k} must be a list of strings")
+
+    scoring = section("scoring")
+    if scoring:
+        if not _is_num(scoring.get("base", 0.0)):
+            problems.append("scoring.base must be a number")
+        for g in SCORING_GROUPS:
+            grp = scoring.get(g)
+            if not isinstance(grp, dict):
+                problems.append(f"missing mapping 'scoring.{g}'")
+                continue
+            if not _is_str_list(grp.get("terms")):
+                problems.append(f"scoring.{g}.terms must be a list of strings")
+            if not _is_num(grp.get("weight")):
+                problems.append(f"scoring.{g}.weight must be a number")
+
+    openai = section("openai", required=False)
+    for k in ("relevance_threshold", "borderline_margin", "local_model_low", "local_model_high"):
+        if k in openai and not _is_num(openai[k]):
+            problems.append(f"openai.{k} must be a number")
+    if "relevance_max_checks" in openai and not isinstance(openai["relevance_max_checks"], int):
+        problems.append("openai.relevance_max_checks must be an integer")
+
+    taxonomy = cfg.get("taxonomy")
+    if not isinstance(taxonomy, list) or not taxonomy:
+        problems.append("'taxonomy' must be a non-empty list")
+    else:
+        for i, t in enumerate(taxonomy):
+            if not isinstance(t, dict):
+                problems.append(f"taxonomy[{i}] must be a mapping")
+                continue
+            name = f"taxonomy[{i}] ({t.get('major')}/{t.get('minor')})"
+            if not isinstance(t.get("major"), str) or not isinstance(t.get("minor"), str):
+                problems.append(f"{name}: major/minor must be strings")
+            if not _is_str_list(t.get("keywords")) or not t["keywords"]:
+                problems.append(f"{name}: keywords must be a non-empty list of strings")
+    return problems
+
+
+@dataclass(frozen=True)
+class AppSettings:
+    timezone: str
+    tz: Any
+    run_time_hour: int
+    lookback_hours: float
+    max_items_per_subcategory: int
+    selection_mode: str
+
+
+@dataclass(frozen=True)
+class RuntimeConfig:
+    source: dict = field(repr=False, compare=False)    # 컴파일한 원본 cfg (같은 객체인지 확인용)
+    app: AppSettings
+    base_score: float
+    weights: tuple               # ((용어군, 가중치), ...) SCORING_GROUPS 순서
+    block_domains: frozenset     # 소문자 도메인 (호스트명 접미사 비교)
+    matcher: TermMatcher = field(repr=False, compare=False)
+    ai_enabled: bool
+    relevance_threshold: float
+    relevance_max_checks: int
+    borderline_margin: float
+    summarize_enabled: bool
+    duplicates: tuple       # 로드 시 발견한 중복 키 (키, 줄, 처음 나온 줄)
+
+    def is_block_host(self, link: str) -> bool:
+        """link 호스트명이 차단 도메인이거나 그 하위 도메인인지 (라벨 수만큼 집합 조회)"""
+        if not self.block_domains or not link:
+            return False
+        m = _HOST_RE.match(link)
+        host = m.group(1).lower().rstrip(".") if m else ""
+        while host:
+            if host in self.block_domains:
+                return True
+            _, dot, host = host.partition(".")
+            if not dot:
+                break
+        return False
+
+
+def compile_config(cfg: dict, duplicates=()) -> RuntimeConfig:
+    """검증 + 컴파일 (문제가 있으면 ConfigError). 결과는 cfg['_runtime'] 에도 보관"""
+    problems = validate(cfg)
+    if problems:
+        raise ConfigError(problems)
+    app, sc = cfg["app"], cfg["scoring"]
+    o = cfg.get("openai", {}) or {}
+    tz = pytz.timezone(app["timezone"])
+    cfg.pop("_matcher", None)       # 설정이 바뀌었을 수 있으므로 매처도 다시 컴파일
+    rt = RuntimeConfig(
+        source=cfg,
+        app=AppSettings(
+            timezone=app["timezone"], tz=tz,
+            run_time_hour=int(app.get("run_time_hour", 8)),
+            lookback_hours=float(app["lookback_hours"]),
+            max_items_per_subcategory=int(app["max_items_per_subcategory"]),
+            selection_mode=(app.get("selection_mode") or "scored").lower(),
+        ),
+        base_score=float(sc.get("base", 0.0)),
+        weights=tuple((g, sc[g]["weight"]) for g in SCORING_GROUPS),
+        block_domains=frozenset(d.strip().lower().lstrip(".") for d in
+                                (cfg.get("filters", {}) or {}).get("block_domains") or [] if d.strip()),
+        matcher=get_matcher(cfg),
+        ai_enabled=bool(o.get("enable_ai_filter", False)),
+        relevance_threshold=float(o.get("relevance_threshold", 0.65)),
+        relevance_max_checks=int(o.get("relevance_max_checks", 20)),
+        borderline_margin=float(o.get("borderline_margin", 2.0)),
+        summarize_enabled=bool(o.get("enable_summarize", False)),
+        duplicates=tuple(duplicates),
+    )
+    cfg["_runtime"] = rt
+    return rt
+
+
+def get_runtime(cfg: dict) -> RuntimeConfig:
+    """cfg 에 컴파일된 RuntimeConfig (없거나 다른 dict 용이면 새로 컴파일)"""
+    rt = cfg.get("_runtime")
+    if rt is None or rt.source is not cfg:
+        rt = compile_config(cfg)
+    return rt
+
+
+def load_config(path: str = "config.yaml", strict: bool = False) -> dict:
+    """
+    config.yaml → 검증·컴파일된 cfg dict (cfg['_runtime'] 포함)
+    - 중복 키: 경고 출력 (strict 면 ConfigError)
+    """
+    try:
+        cfg, dups = load_yaml(path)
+    except yaml.YAMLError as ex:
+        raise ConfigError([str(ex)], path) from None
+    dup_msgs = [f"duplicate key '{k}' at line {line} overrides line {first}" for k, line, first in dups]
+    if dups and strict:
+        raise ConfigError(dup_msgs, path)
+    for msg in dup_msgs:
+        print(f"[WARN] {path}: {msg}")
+    try:
+        compile_config(cfg, dups)
+    except ConfigError as ex:
+        raise ConfigError(ex.problems, path) from None
+    return cfg
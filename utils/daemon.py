@@ -0,0 +1,185 @@
+# utils/daemon.py
+"""
+상주(daemon) 실행용 웜 컨텍스트 + 스케줄 설정
+- 실행 사이에 유지: HTTP 세션(keep-alive), AI 판정기·요약기(OpenAI 클라이언트·이벤트 루프·디스크 캐시),
+  상태 저장소(발송 이력 메모리 인덱스), 피드 조건부 GET 캐시 + item 단위 파싱 캐시, 컴파일된 설정(cfg['_runtime']),
+  기사 파싱 결과 메모(정규화 URL → Article, 다음 실행에서 같은 기사는 재파싱/재스캔 없음)
+- config.yaml 은 파일 수정 시각이 바뀐 경우에만 다시 읽고, 설정에 묶인 자원은 그때 새로 만든다
+  (고친 설정이 검증에 실패하면 이전 설정으로 계속 실행)
+- 스케줄: daemon.schedules (없으면 app.run_time_hour 하루 1회 다이제스트)
+"""
+import os, time, threading
+
+from utils.config import load_config, get_runtime, ConfigError
+from utils.fetch import fetch_settings, make_session
+from utils.feed_cache import FeedCache, ItemParseCache
+from utils.links import LinkResolver
+from utils.relevance import RelevanceEngine
+from utils.sources import sources_from_config
+from utils.summarize import SummaryEngine
+from utils.state import StateStore
+
+SCHEDULE_KINDS = ("digest", "alert")
+ALERT_SEEN_TTL = 48 * 3600     # 속보 알림에서 이미 본 기사 키 보존 시간
+
+
+def schedules_from_config(cfg: dict) -> list:
+    """
+    daemon.schedules → [{"name", "kind", "cron", ...}] (cron 은 APScheduler cron 트리거 인자)
+    - kind: digest(전체 다이제스트) / alert(직전 tick 이후 새 기사 중 시그널 기사만 즉시 발송)
+    """
+    app = cfg.get("app", {}) or {}
+    raw = (cfg.get("daemon", {}) or {}).get("schedules") or [
+        {"name": "daily_digest", "kind": "digest", "cron": {"hour": app.get("run_time_hour", 8), "minute": 0}}]
+    out = []
+    for i, s in enumerate(raw):
+        kind = (s.get("kind") or "digest").lower()
+        if kind not in SCHEDULE_KINDS:
+            print(f"[WARN] daemon schedule {s.get('name') or i}: unknown kind={kind} → skipped")
+            continue
+        spec = {
+            "name": s.get("name") or f"{kind}{i + 1}",
+            "kind": kind,
+            "cron": dict(s.get("cron") or {"minute": 0}),
+        }
+        if kind == "alert":
+            spec.update({
+                "minors": list(s.get("minors") or []),                       # 비우면 전체 소분류
+                "signal_groups": list(s.get("signal_groups") or ["price_signals"]),
+                "min_score": float(s.get("min_score", 3.0)),
+                "max_items": int(s.get("max_items", 10)),
+                "lookback_minutes": float(s.get("lookback_minutes", 90)),    # 첫 tick / 최대 게시 시각 범위
+                "use_ai": bool(s.get("use_ai", False)),
+            })
+        out.append(spec)
+    return out
+
+
+class WarmContext:
+    """실행 간 유지되는 자원 (동시에 한 실행만 사용: with ctx.lock)"""
+
+    def __init__(self, path: str = "config.yaml"):
+        self.path = path
+        self.cfg = None
+        self.mtime = None
+        self.reloads = 0
+        self.lock = threading.Lock()
+        self.memo = {}              # 정규화 URL → Article 또는 제외 사유 (시간창과 무관한 판정만)
+        self.alert_seen = {}        # 스케줄 이름 → {기사 키: 처음 본 시각}
+        self.last_tick = {}         # 스케줄 이름 → 마지막 실행 epoch
+        self.parser = ItemParseCache()   # 설정과 무관 → 설정을 다시 읽어도 유지
+        self._session = None
+        self._engine = None
+        self._engine_checked = False
+        self._summarizer = None
+        self._sources = None
+        self._links = None
+        self._state = None
+        self._feed_cache = None
+
+    # ---- 설정 ----
+    def config(self) -> dict:
+        """파일이 바뀌었을 때만 다시 읽음 (설정에 묶인 자원·메모는 폐기 → 다음 사용 시 재생성)"""
+        mtime = os.stat(self.path).st_mtime_ns
+        if self.cfg is None or mtime != self.mtime:
+            try:
+                cfg = load_config(self.path)
+            except ConfigError as ex:
+                if self.cfg is None:
+                    raise
+                print(f"[ERROR] {ex}\n[DAEMON] keeping previous config")
+                self.mtime = mtime      # 같은 파일로 매 tick 오류를 반복하지 않음
+                return self.cfg
+            if self.cfg is not None:
+                self.reloads += 1
+                print(f"[DAEMON] config changed → reloaded ({self.path})")
+                self._release()
+            self.cfg, self.mtime = cfg, mtime
+        return self.cfg
+
+    # ---- 자원 (최초 사용 시 생성) ----
+    def session(self, cfg):
+        if self._session is None:
+            st = fetch_settings(cfg)
+            self._session = make_session(max(st["max_workers"], st["per_host"]), st["replay_dir"], st["replay_scale"],
+                                         st["replay_rebase"])
+        return self._session
+
+    def sources(self, cfg):
+        """수집 소스 어댑터 (소스별 요청 제한 상태를 실행 간 유지)"""
+        if self._sources is None:
+            self._sources = sources_from_config(cfg)
+        return self._sources
+
+    def link_resolver(self, cfg):
+        """링크 해석기 (HEAD 용 세션·해석 캐시를 실행 간 유지)"""
+        if self._links is None:
+            self._links = LinkResolver(cfg)
+        return self._links
+
+    def feed_cache(self, cfg):
+        if self._feed_cache is None:
+            self._feed_cache = FeedCache.from_config(cfg)
+        if self._feed_cache is not None:
+            self._feed_cache.hits = self._feed_cache.misses = 0
+        return self._feed_cache
+
+    def state(self, cfg):
+        if self._state is None:
+            self._state = StateStore.from_config(cfg)
+        if self._state is not None:
+            self._state.skipped = 0
+        return self._state
+
+    def engine(self, cfg):
+        """AI 판정기 (꺼져 있거나 키가 없으면 None). 실행별 카운터는 매번 초기화"""
+        if not self._engine_checked:
+            self._engine_checked = True
+            if get_runtime(cfg).ai_enabled:
+                engine = RelevanceEngine(cfg)
+                if engine.available:
+                    self._engine = engine
+                else:
+                    print("[WARN] AI filter enabled but OpenAI client/API key unavailable → heuristic only")
+        if self._engine is not None:
+            e = self._engine
+            e.calls = e.rate_limited = e.local_decided = e.cache.hits = 0
+        return self._engine
+
+    def summarizer(self, cfg):
+        """요약기 (API 키가 없으면 규칙 기반 요약만). 실행별 카운터는 매번 초기화"""
+        if self._summarizer is None:
+            self._summarizer = SummaryEngine(cfg)
+        s = self._summarizer
+        s.calls = s.rate_limited = s.fallbacks = s.cache.hits = 0
+        return s
+
+    def remember(self, records: dict):
+        """이번 실행의 파싱 결과만 다음 실행용 메모로 유지 (피드에서 빠진 기사는 자연히 정리)"""
+        self.memo = {k: v for k, v in records.items() if not isinstance(v, str) or v == "keyword"}
+
+    def seen_for(self, name: str, now=None) -> dict:
+        now = now or time.time()
+        seen = self.alert_seen.setdefault(name, {})
+        for k in [k for k, t in seen.items() if now - t > ALERT_SEEN_TTL]:
+            del seen[k]
+        return seen
+
+    # ---- 정리 ----
+    def _release(self):
+        if self._engine is not None:
+            self._engine.close()
+        if self._summarizer is not None:
+            self._summarizer.close()
+        if self._links is not None:
+            self._links.close()
+        if self._state is not None:
+            self._state.close()
+        if self._session is not None:
+            self._session.close()
+        self._session = self._engine = self._summarizer = self._state = self._feed_cache = self._sources = self._links = None
+        self._engine_checked = False
+        self.memo = {}
+
+    def close(self):
+        self._release()
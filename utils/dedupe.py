@@ -1,7 +1,12 @@
 import re
+from itertools import combinations
+from math import comb
 from urllib.parse import urlparse, parse_qs, urlunparse
+from rapidfuzz import process
 from rapidfuzz.distance import Levenshtein
 
+from utils.metrics import get_metrics
+
 # ---- 기존 URL 정규화 ----
 def normalize_url(u: str) -> str:
     try:
@@ -58,41 +63,160 @@ def is_duplicate_by_overlap(a: str, b: str, min_overlap: int = 2) -> bool:
         return False
     return _word_overlap_count(a, b) >= min_overlap
 
+# ================== keep-first 제목 중복 판정 엔진 ==================
+
+WS_RE = re.compile(r'\s+')
+_COMBO_MAX = 3          # min_overlap 이 이 이하면 토큰 조합 집합으로 O(1) 조회
+_COMBO_LIMIT = 4096     # 제목 하나의 조합 수가 이보다 많으면 역색인 카운팅으로 처리
+
+
+def prepare_title(title):
+    """dedupe 비교용 (공백 정규화 제목, 정렬된 고유 토큰 튜플). 빈 제목이면 None"""
+    t = (title or "").strip()
+    if not t:
+        return None
+    return WS_RE.sub(' ', t), tuple(sorted(set(_tokenize_title(t))))
+
+
+# 기사는 dict 또는 Article (Article 은 캐시된 파생 값 사용)
+def _url_key(it):
+    return normalize_url(it["link"]) if isinstance(it, dict) else it.norm_url
+
+
+def _title_key(it):
+    return prepare_title(it.get("title")) if isinstance(it, dict) else it.title_key
+
+
+class TitleDeduper:
+    """
+    이미 남긴 제목들과 (레벤슈타인 유사도 ≥ threshold) OR (공통 단어 ≥ min_overlap) 이면 중복.
+    is_similar_title / is_duplicate_by_overlap 을 남긴 제목 전체와 비교하던 것과 결과 동일하되
+    - 제목별 정규화/토큰화는 1회만
+    - 단어 중복: min_overlap 개 토큰 조합 집합(또는 토큰 역색인)으로 후보만 조회
+      조합이 _COMBO_LIMIT 를 넘는 긴 제목은 조합을 만들지 않고 역색인(long_index)에만 등록
+    - 레벤슈타인: 유사도 기준을 만족할 수 있는 길이대의 제목만 rapidfuzz extractOne(score_cutoff) 로 일괄 비교
+    """
+
+    def __init__(self, threshold=0.88, min_overlap=2):
+        self.threshold = threshold
+        self.min_overlap = min_overlap
+        self.by_len = {}        # 정규화 제목 길이 → [정규화 제목, ...]
+        self.combos = set()     # 남긴 제목들의 min_overlap 개 토큰 조합
+        self.index = {}         # 토큰 → [남긴 제목 번호, ...] (조합이 너무 많을 때용)
+        self.long_index = {}    # 토큰 → [combos 에 없는 긴 제목 번호, ...]
+        self.kept = 0           # 비어 있지 않은 남긴 제목 수
+        self.comparisons = 0    # 레벤슈타인 후보 비교 수 (계측용)
+
+    def _len_range(self, n):
+        # sim = 1 - d/max(la, lb) ≥ thr 이려면 |la-lb| ≤ d ≤ (1-thr)·max(la, lb)
+        thr = self.threshold
+        if thr <= 0:
+            return None
+        return max(int(n * thr) - 1, 1), int(n / thr) + 1
+
+    def _similar(self, norm):
+        rng = self._len_range(len(norm))
+        if rng is None:
+            lengths = list(self.by_len)
+        else:
+            lengths = [n for n in range(rng[0], rng[1] + 1) if n in self.by_len]
+        for n in lengths:
+            choices = self.by_len[n]
+            self.comparisons += len(choices)
+            if process.extractOne(norm, choices, scorer=Levenshtein.normalized_similarity,
+                                  processor=None, score_cutoff=self.threshold) is not None:
+                return True
+        return False
+
+    def _use_combos(self, toks) -> bool:
+        m = self.min_overlap
+        return 0 < m <= _COMBO_MAX and comb(len(toks), m) <= _COMBO_LIMIT
+
+    @staticmethod
+    def _count_overlap(index, toks, m) -> bool:
+        counts = {}
+        for tok in toks:
+            for i in index.get(tok, ()):
+                c = counts[i] = counts.get(i, 0) + 1
+                if c >= m:
+                    return True
+        return False
+
+    def _overlap(self, toks):
+        m = self.min_overlap
+        if m <= 0:
+            return self.kept > 0
+        if len(toks) < m:
+            return False
+        if self._use_combos(toks):
+            combos = self.combos
+            if any(c in combos for c in combinations(toks, m)):
+                return True
+            # 조합 없이 등록된 긴 제목들은 역색인으로
+            return bool(self.long_index) and self._count_overlap(self.long_index, toks, m)
+        return self._count_overlap(self.index, toks, m)
+
+    def _prepare(self, title):
+        return prepare_title(title)
+
+    def is_dup(self, title, prepared=None) -> bool:
+        p = prepared or self._prepare(title)
+        if p is None or not self.kept:
+            return False
+        norm, toks = p
+        return self._overlap(toks) or self._similar(norm)
+
+    def add(self, title, prepared=None) -> None:
+        p = prepared or self._prepare(title)
+        if p is None:
+            return   # 빈 제목은 어떤 제목과도 중복이 아님
+        norm, toks = p
+        self.by_len.setdefault(len(norm), []).append(norm)
+        m = self.min_overlap
+        if self._use_combos(toks):
+            self.combos.update(combinations(toks, m))
+        elif 0 < m <= _COMBO_MAX:
+            for tok in toks:
+                self.long_index.setdefault(tok, []).append(self.kept)
+        for tok in toks:
+            self.index.setdefault(tok, []).append(self.kept)
+        self.kept += 1
+
+    def keep(self, title, prepared=None) -> bool:
+        """중복이 아니면 등록하고 True (prepared: prepare_title 결과 재사용)"""
+        p = prepared or self._prepare(title)
+        if self.is_dup(title, prepared=p):
+            return False
+        self.add(title, prepared=p)
+        return True
+
+
 # ================== 통합 중복 제거 함수들 ==================
 
+def dedupe_stream(items):
+    """소분류 내부: URL/제목 유사도/단어 중복으로 중복 제거 (제너레이터, 남긴 제목의 비교용 정보만 보관)"""
+    seen_urls = set()
+    titles = TitleDeduper(threshold=0.88, min_overlap=2)
+    try:
+        for it in items:
+            nu = _url_key(it)
+            if nu in seen_urls:
+                continue
+            # 이미 내보낸 기사들과 제목 중복/유사도 검사
+            if not titles.keep(None, prepared=_title_key(it)):
+                continue
+            seen_urls.add(nu)
+            yield it
+    finally:
+        get_metrics().incr("dedupe.comparisons", titles.comparisons, stage="minor")
+
 def dedupe_items(items: list) -> list:
     """소분류 내부: URL/제목 유사도/단어 중복으로 중복 제거"""
-    seen_urls = set()
-    result = []
-    for it in items:
-        nu = normalize_url(it["link"])
-        if nu in seen_urls:
-            continue
-        t = (it.get("title") or "").strip()
-        # 이미 담긴 결과와 제목 중복/유사도 검사
-        dup = False
-        for prev in result:
-            pt = (prev.get("title") or "").strip()
-            if is_similar_title(t, pt, threshold=0.88) or is_duplicate_by_overlap(t, pt, min_overlap=2):
-                dup = True
-                break
-        if dup:
-            continue
-        seen_urls.add(nu)
-        result.append(it)
-    return result
+    return list(dedupe_stream(items))
 
 def dedupe_by_title_similarity(items: list, threshold=0.88, min_overlap=3) -> list:
     """전역 단계: (레벤슈타인 유사도) OR (단어 중복≥min_overlap) 로 중복 제거"""
-    result, seen_titles = [], []
-    for it in items:
-        t = (it.get("title") or "").strip()
-        dup = False
-        for st in seen_titles:
-            if is_similar_title(t, st, threshold=threshold) or is_duplicate_by_overlap(t, st, min_overlap=min_overlap):
-                dup = True
-                break
-        if not dup:
-            result.append(it)
-            seen_titles.append(t)
+    titles = TitleDeduper(threshold=threshold, min_overlap=min_overlap)
+    result = [it for it in items if titles.keep(None, prepared=_title_key(it))]
+    get_metrics().incr("dedupe.comparisons", titles.comparisons, stage="global")
     return result
@@ -0,0 +1,222 @@
+# utils/feed_cache.py
+"""
+조건부 GET 피드 캐시 (ETag / Last-Modified, 디스크 보존)
+- 키: 정규화된 쿼리 URL
+- 값: ETag/Last-Modified + 이미 파싱된 entries → 304 이면 재다운로드/재파싱 없이 반환
+- TTL + 용량 기반 축출 (GitHub Actions 에서는 캐시 디렉터리를 actions/cache 로 보존)
+- ItemParseCache: 상주 실행용 메모리 캐시. 200 응답이어도 이전에 본 <item> 블록은 재파싱하지 않음
+- feedparser 는 처음 파싱/복원할 때 로드
+"""
+import os, re, json, time, hashlib, threading
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+
+# 파이프라인에서 실제로 쓰는 entry 필드만 보존
+ENTRY_FIELDS = ("title", "summary", "link", "id", "published", "published_parsed")
+_ITEM_RE = re.compile(r"<item[\s>].*?</item>", re.S)
+
+
+def _fp():
+    import feedparser
+    return feedparser
+
+
+def normalize_query_url(url: str) -> str:
+    """스킴/호스트 소문자화 + 쿼리 파라미터 정렬"""
+    p = urlparse(url)
+    q = urlencode(sorted(parse_qsl(p.query, keep_blank_values=True)))
+    return urlunparse((p.scheme.lower(), p.netloc.lower(), p.path or "/", "", q, ""))
+
+
+def _dump_entry(e) -> dict:
+    out = {}
+    for k in ENTRY_FIELDS:
+        v = e.get(k)
+        if v is None:
+            continue
+        out[k] = list(v[:9]) if k == "published_parsed" else v
+    return out
+
+
+def compact_feed(feed):
+    """파싱 직후 피드를 ENTRY_FIELDS 만 가진 entries 로 축소 (*_detail, links 등 미사용 필드 해제)"""
+    fpd = _fp().FeedParserDict
+    return fpd(entries=[
+        fpd({k: e[k] for k in ENTRY_FIELDS if e.get(k) is not None})
+        for e in feed.entries
+    ])
+
+
+def _load_entry(d: dict):
+    e = _fp().FeedParserDict(d)
+    if d.get("published_parsed"):
+        e["published_parsed"] = time.struct_time(tuple(d["published_parsed"]))
+    return e
+
+
+class FeedCache:
+    def __init__(self, root: str, ttl_secs: float = 48 * 3600, max_bytes: int = 50 * 1024 * 1024):
+        self.root = root
+        self.ttl_secs = ttl_secs
+        self.max_bytes = max_bytes
+        self.hits = 0        # 304 → 캐시 반환
+        self.misses = 0      # 200 → 새로 파싱
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, cfg: dict):
+        """cache.enabled 가 꺼져 있으면 None"""
+        c = cfg.get("cache", {}) or {}
+        if not c.get("enabled", False):
+            return None
+        return cls(
+            os.path.join(c.get("dir", ".cache"), "feeds"),
+            ttl_secs=float(c.get("feed_ttl_hours", 48)) * 3600,
+            max_bytes=int(float(c.get("feed_max_mb", 50)) * 1024 * 1024),
+        )
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha1(normalize_query_url(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.root, f"{key}.json")
+
+    def _read(self, url: str):
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                rec = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - rec.get("stored_at", 0) > self.ttl_secs:
+            return None
+        return rec
+
+    def conditional_headers(self, url: str) -> dict:
+        rec = self._read(url)
+        if not rec:
+            return {}
+        h = {}
+        if rec.get("etag"):
+            h["If-None-Match"] = rec["etag"]
+        if rec.get("last_modified"):
+            h["If-Modified-Since"] = rec["last_modified"]
+        return h
+
+    def cached_feed(self, url: str, headers=None):
+        """
+        304 응답 시 호출: 저장된 entries 를 FeedParserDict 로 복원 (없으면 None)
+        - 304 = 검증 성공 → stored_at 갱신 (계속 304 인 피드가 TTL 뒤 전체 재다운로드되지 않도록)
+          응답에 새 ETag/Last-Modified 가 있으면 함께 반영. 파일 mtime 도 바뀌므로 LRU 접근 시각 갱신을 겸함
+        """
+        rec = self._read(url)
+        if rec is None:
+            return None
+        headers = headers or {}
+        rec["etag"] = headers.get("ETag") or rec.get("etag")
+        rec["last_modified"] = headers.get("Last-Modified") or rec.get("last_modified")
+        rec["stored_at"] = time.time()
+        self._write(url, rec)
+        with self._lock:
+            self.hits += 1
+        return _fp().FeedParserDict(entries=[_load_entry(d) for d in rec.get("entries", [])])
+
+    def store(self, url: str, headers, feed) -> None:
+        with self._lock:
+            self.misses += 1
+        etag, last_mod = headers.get("ETag"), headers.get("Last-Modified")
+        if not etag and not last_mod:
+            return   # 조건부 요청이 불가능한 응답은 저장하지 않는다
+        rec = {
+            "url": normalize_query_url(url),
+            "etag": etag,
+            "last_modified": last_mod,
+            "stored_at": time.time(),
+            "entries": [_dump_entry(e) for e in feed.entries],
+        }
+        self._write(url, rec)
+
+    def _write(self, url: str, rec: dict) -> None:
+        """임시 파일 → os.replace"""
+        path = self._path(url)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(rec, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as ex:
+            print(f"[WARN] feed cache write failed: {ex}")
+
+    def prune(self) -> int:
+        """TTL 만료 파일 삭제 후, 용량 초과 시 오래 안 쓴 순으로 삭제. 삭제 수 반환"""
+        now = time.time()
+        files, removed = [], 0
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if not name.endswith(".json") or now - st.st_mtime > self.ttl_secs:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        total = sum(sz for _, sz, _ in files)
+        for _, sz, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+                total -= sz
+            except OSError:
+                pass
+        return removed
+
+
+class ItemParseCache:
+    """
+    RSS <item> 블록 해시 → 파싱된 entry (compact_feed 형식, 메모리)
+    - Google News 는 조건부 GET 을 거의 지원하지 않고 lastBuildDate 때문에 본문도 매번 달라지지만
+      item 블록 자체는 그대로인 경우가 대부분 → 새/바뀐 블록만 모아 채널 머리·꼬리로 감싼 작은 문서로 파싱
+    - 블록 수와 파싱된 entry 수가 다르면(비정형 XML) 전체 파싱으로 폴백
+    - entry 는 여러 피드/실행이 공유하므로 읽기 전용으로 다룬다
+    """
+
+    def __init__(self, max_items: int = 20000):
+        self.max_items = max_items
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def parse(self, text: str):
+        spans = [m.span() for m in _ITEM_RE.finditer(text)]
+        if not spans:
+            return compact_feed(_fp().parse(text))
+        blocks = [text[a:b] for a, b in spans]
+        keys = [hashlib.sha1(b.encode("utf-8")).digest() for b in blocks]
+        with self._lock:
+            missing = [i for i, k in enumerate(keys) if k not in self.entries]
+        if missing:
+            doc = text[:spans[0][0]] + "".join(blocks[i] for i in missing) + text[spans[-1][1]:]
+            fresh = compact_feed(_fp().parse(doc)).entries
+            if len(fresh) != len(missing):
+                return compact_feed(_fp().parse(text))
+            with self._lock:
+                if len(self.entries) + len(fresh) > self.max_items:
+                    # 오래 전에 넣은 절반을 버림 (dict 삽입 순서)
+                    for k in list(self.entries)[:len(self.entries) // 2]:
+                        del self.entries[k]
+                for i, e in zip(missing, fresh):
+                    self.entries[keys[i]] = e
+        with self._lock:
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+            entries = [self.entries.get(k) for k in keys]
+        if any(e is None for e in entries):     # 다른 스레드가 방금 축출한 경우
+            return compact_feed(_fp().parse(text))
+        return _fp().FeedParserDict(entries=entries)
@@ -0,0 +1,114 @@
+# utils/fetch.py
+"""
+키워드 RSS 동시 수집기
+- 공유 keep-alive 세션(커넥션 풀) 하나로 모든 키워드 조회
+- 호스트별 동시 요청 수 제한 (news.google.com 과부하/429 방지)
+- 전체 데드라인: 느린/실패 키워드는 자기 결과만 잃고 나머지는 그대로 반환
+- requests 는 세션을 만들 때 로드 (모듈 import 만으로는 불러오지 않음)
+"""
+import threading, time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from utils.metrics import get_metrics
+
+USER_AGENT = "Mozilla/5.0 (refinery-news-bot; +github)"
+
+
+def fetch_settings(cfg: dict) -> dict:
+    """config.yaml 의 fetch 블록(없으면 기본값)"""
+    f = cfg.get("fetch", {}) or {}
+    return {
+        "max_workers": max(1, int(f.get("max_workers", 8))),
+        "per_host": max(1, int(f.get("per_host", 4))),
+        "timeout": float(f.get("timeout_secs", 15)),
+        "deadline": float(f.get("deadline_secs", 90)),
+        "replay_dir": f.get("replay_dir") or None,      # 녹화 픽스처 재생 (utils/replay.py)
+        "replay_scale": int(f.get("replay_scale", 1)),
+        "replay_rebase": bool(f.get("replay_rebase", True)),   # False: 녹화 당시 pubDate 그대로 (backfill)
+    }
+
+
+def make_session(pool_size: int = 8, replay_dir=None, replay_scale: int = 1, replay_rebase: bool = True) -> "requests.Session":
+    """keep-alive 커넥션을 재사용하는 공유 세션 (replay_dir 가 있으면 픽스처 재생 세션)"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    s = requests.Session()
+    s.headers["User-Agent"] = USER_AGENT
+    if replay_dir:
+        from utils.replay import mount_replay
+        return mount_replay(s, replay_dir, scale=replay_scale, rebase=replay_rebase)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+class HostLimiter:
+    """호스트(netloc)별 세마포어"""
+
+    def __init__(self, per_host: int):
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._sems = {}
+
+    def get(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._sems.get(host)
+            if sem is None:
+                sem = self._sems[host] = threading.BoundedSemaphore(self.per_host)
+            return sem
+
+
+def fetch_all(queries, fetch_one, url_of, cfg: dict, session=None, label_of=str) -> dict:
+    """
+    queries 전체를 스레드 풀로 동시에 수집.
+    - fetch_one(query, session, timeout) → 파싱된 피드
+    - url_of(query) → 요청 URL (호스트별 제한 키로 사용)
+    - label_of(query) → 계측 라벨
+    반환: {query: 피드 또는 Exception} (데드라인 초과 시 TimeoutError)
+    """
+    st = fetch_settings(cfg)
+    queries = list(dict.fromkeys(queries))   # 중복 키워드는 한 번만
+    if not queries:
+        return {}
+
+    own_session = session is None
+    if own_session:
+        session = make_session(max(st["max_workers"], st["per_host"]), st["replay_dir"], st["replay_scale"],
+                               st["replay_rebase"])
+    limiter = HostLimiter(st["per_host"])
+
+    metrics = get_metrics()
+
+    def _task(q):
+        host = urlparse(url_of(q)).netloc
+        with limiter.get(host):
+            with metrics.timer("fetch.query", kw=label_of(q)):
+                return fetch_one(q, session, st["timeout"])
+
+    results = {}
+    started = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=st["max_workers"], thread_name_prefix="fetch")
+    futures = {pool.submit(_task, q): q for q in queries}
+    done, pending = wait(futures, timeout=st["deadline"])
+    for fut in done:
+        q = futures[fut]
+        try:
+            results[q] = fut.result()
+        except Exception as ex:
+            results[q] = ex
+    for fut in pending:
+        fut.cancel()
+        results[futures[fut]] = TimeoutError(f"deadline {st['deadline']:.0f}s exceeded")
+    # 데드라인을 넘긴 요청은 기다리지 않는다 (각 요청은 timeout 으로 스스로 종료)
+    pool.shutdown(wait=not pending, cancel_futures=True)
+    if own_session and not pending:
+        session.close()
+
+    elapsed = time.monotonic() - started
+    failed = sum(1 for v in results.values() if isinstance(v, Exception))
+    metrics.incr("fetch.failed", failed)
+    metrics.incr("fetch.timed_out", len(pending))
+    print(f"[FETCH] {len(queries)} queries in {elapsed:.1f}s (failed={failed}, timed_out={len(pending)})")
+    return results
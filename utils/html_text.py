@@ -0,0 +1,98 @@
+# utils/html_text.py
+"""
+RSS summary HTML → 텍스트 빠른 추출기
+- html.parser.HTMLParser 기반 스트리밍 추출 (트리 생성 없음)
+- 결과는 BeautifulSoup(..., "html5lib").get_text(" ", strip=True) 와 동일하게 맞춤
+  (엔티티 디코딩, 문자열 조각별 strip 후 공백 1칸 join, html5lib 처럼 script/style 내용도 포함)
+- html5lib 과 결과가 달라질 수 있는 입력(깨진 태그, 표 구조, CR/NUL 등)만 BeautifulSoup 로 폴백
+"""
+from html.parser import HTMLParser
+
+from utils.metrics import get_metrics
+
+# html5lib 이 트리를 재배치(foster parenting 등)하거나 RCDATA 로 다루는 태그
+_UNSAFE_TAGS = {"table", "tbody", "thead", "tfoot", "tr", "td", "th", "caption", "colgroup", "col",
+                "title", "textarea", "noscript", "plaintext", "xmp", "iframe", "noembed", "noframes",
+                "select", "svg", "math", "frameset", "head", "body", "html"}
+
+
+# 내용/닫는 태그가 없는 void 요소
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+              "param", "source", "track", "wbr", "keygen"}
+# 같은 태그가 열려 있으면 html5lib 이 암묵적으로 닫는 태그
+_SELF_CLOSING_NEST = {"p", "li", "dd", "dt", "option", "optgroup", "a", "nobr", "button", "form",
+                      "h1", "h2", "h3", "h4", "h5", "h6", "rb", "rt", "rp", "rtc"}
+
+
+class _Malformed(Exception):
+    pass
+
+
+class _TextCollector(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.stack = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _UNSAFE_TAGS:
+            raise _Malformed(tag)
+        if tag in _VOID_TAGS:
+            return
+        if tag in _SELF_CLOSING_NEST and tag in self.stack:
+            raise _Malformed(f"nested <{tag}>")
+        self.stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        # html5lib 은 void 가 아닌 요소의 '/>' 를 무시하고 여는 태그로 다룬다
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        # 짝이 안 맞는 닫는 태그는 html5lib 이 무시/재배치하며 앞뒤 텍스트를 합칠 수 있다
+        if not self.stack or self.stack[-1] != tag:
+            raise _Malformed(f"</{tag}>")
+        self.stack.pop()
+
+    def handle_data(self, data):
+        # 태그로 해석되지 않은 '<' (미완성 태그 등)는 html5lib 과 처리 방식이 다름
+        if "<" in data:
+            raise _Malformed("stray '<'")
+        s = data.strip()
+        if s:
+            self.parts.append(s)
+
+    def unknown_decl(self, data):
+        raise _Malformed("declaration")
+
+
+def fast_text(html: str):
+    """빠른 경로 추출. html5lib 과 결과를 보장할 수 없는 입력이면 None"""
+    if not html:
+        return ""
+    if "\r" in html or "\x00" in html:
+        return None
+    if "<" not in html and "&" not in html:
+        return html.strip()
+    p = _TextCollector()
+    try:
+        p.feed(html)
+        p.close()
+    except Exception:
+        return None
+    if p.cdata_elem or p.rawdata:
+        return None   # 닫히지 않은 script/style 또는 처리되지 않은 잔여 입력
+    return " ".join(p.parts)
+
+
+def html_to_text(html: str) -> str:
+    """get_text(" ", strip=True) 호환 추출. 비정상 입력만 BeautifulSoup 로 폴백"""
+    text = fast_text(html)
+    if text is not None:
+        get_metrics().incr("html.fast")
+        return text
+    get_metrics().incr("html.fallback")
+    from bs4 import BeautifulSoup
+    try:
+        return BeautifulSoup(html, "html5lib").get_text(" ", strip=True)
+    except Exception:
+        return BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
@@ -0,0 +1,77 @@
+# utils/kvcache.py
+"""
+작은 JSON 파일 기반 key → value 캐시 (실행 간 보존)
+- AI 판정/요약/링크 해석 결과처럼 "한 번 구하면 재사용 가능한" 값 저장용
+- TTL + 최대 항목 수 제한, 저장은 임시 파일 → os.replace 로 원자적 교체
+- path 가 None 이면 메모리 전용
+"""
+import os, json, time, threading
+
+
+class JsonCache:
+    def __init__(self, path=None, ttl_secs=None, max_items=None):
+        self.path = path
+        self.ttl_secs = ttl_secs
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._data = {}
+        self._dirty = False
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+
+    def _fresh(self, rec, now):
+        return self.ttl_secs is None or now - rec.get("t", 0) <= self.ttl_secs
+
+    def get(self, key, default=None):
+        with self._lock:
+            rec = self._data.get(key)
+            if rec is not None and self._fresh(rec, time.time()):
+                self.hits += 1
+                return rec["v"]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = {"v": value, "t": time.time()}
+            self._dirty = True
+
+    def __len__(self):
+        return len(self._data)
+
+    def save(self):
+        """만료 항목 정리 + 용량 제한 후 디스크 저장 (변경 없으면 생략)"""
+        if not self.path:
+            return
+        with self._lock:
+            now = time.time()
+            data = {k: r for k, r in self._data.items() if self._fresh(r, now)}
+            if self.max_items and len(data) > self.max_items:
+                keep = sorted(data.items(), key=lambda kv: kv[1].get("t", 0))[-self.max_items:]
+                data = dict(keep)
+            if not self._dirty and len(data) == len(self._data):
+                return
+            self._data = data
+            self._dirty = False
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp, self.path)
+            except OSError as ex:
+                print(f"[WARN] cache save failed ({self.path}): {ex}")
+
+
+def cache_path(cfg: dict, name: str):
+    """cache.enabled 면 cache.dir/name, 아니면 None (메모리 전용)"""
+    c = cfg.get("cache", {}) or {}
+    if not c.get("enabled", False):
+        return None
+    return os.path.join(c.get("dir", ".cache"), name)
@@ -0,0 +1,191 @@
+# utils/links.py
+"""
+Google News 리다이렉트 링크(news.google.com/rss/articles/<토큰>) → 언론사 원문 URL
+- 오프라인 디코드: 구형 토큰(CBMi…)은 base64url protobuf 안에 원문 URL 이 그대로 들어 있음 → 요청 없음
+- 디코드가 안 되는 토큰(신형 AU_yqL… 등)은 HEAD(리다이렉트 추적)를 공유 커넥션 풀 + 스레드 풀로 동시 요청
+  (links.head_fallback, 실행당 max_head 건, 전체 deadline_secs). 성공 없이 max_errors 건 연속 실패하면
+  (DNS/방화벽 등) 나머지 HEAD 는 건너뜀 → 리다이렉트 링크 그대로 사용
+- 결과는 cache.dir/links.json 에 보존 (토큰 키, links.ttl_days). HEAD 가 응답했는데 원문으로 안 넘어간 토큰은
+  빈 문자열로 기록해 다시 묻지 않음. 네트워크 오류와 *.google.com(동의·중간 페이지)으로 간 응답은
+  원문으로 보지 않고 기록하지도 않음(다음 실행에서 재시도)
+- 파이프라인: 수집 직후 EntryIndex 이전 → 차단 도메인 판정과 URL dedupe 가 원문 URL 로 동작
+"""
+import re, time, base64, binascii, threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from utils.fetch import fetch_settings, make_session
+from utils.kvcache import JsonCache, cache_path
+from utils.metrics import get_metrics
+
+GNEWS_HOSTS = ("news.google.com",)
+GOOGLE_DOMAIN = "google.com"    # consent.google.com 등 중간 페이지 → 원문으로 취급하지 않음
+_PATH_RE = re.compile(r"^/(?:rss/)?articles/([A-Za-z0-9_-]+)")
+
+
+def _varint(buf: bytes, i: int):
+    n = shift = 0
+    while i < len(buf):
+        b = buf[i]
+        i += 1
+        n |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return n, i
+        shift += 7
+    raise ValueError("truncated varint")
+
+
+def decode_gnews_token(token: str):
+    """구형 토큰 → 원문 URL (필드1 varint, 필드4 문자열 = URL). 디코드할 수 없으면 None"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        if raw[:1] != b"\x08":
+            return None
+        _, i = _varint(raw, 1)
+        if raw[i:i + 1] != b"\x22":
+            return None
+        n, i = _varint(raw, i + 1)
+        url = raw[i:i + n].decode("utf-8")
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+    return url if url.startswith(("http://", "https://")) else None
+
+
+def _close_after(pool, session):
+    pool.shutdown(wait=True, cancel_futures=True)
+    session.close()
+
+
+class LinkResolver:
+    """리다이렉트 링크 일괄 해석기 (상주 실행에서는 세션·캐시를 실행 간 유지)"""
+
+    def __init__(self, cfg: dict):
+        l = cfg.get("links", {}) or {}
+        self.enabled = bool(l.get("resolve", True))
+        self.hosts = tuple(h.lower() for h in (l.get("hosts") or GNEWS_HOSTS))
+        # 녹화 픽스처 재생 중에는 네트워크를 쓰지 않음
+        self.head = bool(l.get("head_fallback", True)) and not fetch_settings(cfg)["replay_dir"]
+        self.concurrency = max(1, int(l.get("concurrency", 8)))
+        self.timeout = float(l.get("timeout_secs", 5))
+        self.deadline = float(l.get("deadline_secs", 30))
+        self.max_head = int(l.get("max_head", 500))
+        self.max_errors = max(1, int(l.get("max_errors", 8)))
+        self.cache = JsonCache(cache_path(cfg, "links.json"),
+                               ttl_secs=float(l.get("ttl_days", 30)) * 86400,
+                               max_items=int(l.get("max_items", 100000)))
+        self.decoded = self.via_head = self.unresolved = 0
+        self._session = None
+        self._errors = 0        # 성공 없이 이어진 HEAD 오류 수 (실행마다 초기화, HEAD 워커 간 공유 → _lock)
+        self._lock = threading.Lock()
+
+    def token(self, link: str):
+        """리다이렉트 링크면 토큰, 아니면 None"""
+        p = urlparse(link or "")
+        if p.netloc.lower() not in self.hosts:
+            return None
+        m = _PATH_RE.match(p.path)
+        return m.group(1) if m else None
+
+    def resolve(self, links) -> dict:
+        """links → {리다이렉트 링크: 원문 URL} (해석된 것만)"""
+        self.decoded = self.via_head = self.unresolved = self.cache.hits = 0
+        out, todo = {}, []
+        for link in dict.fromkeys(links):
+            tok = self.token(link)
+            if tok is None:
+                continue
+            url = decode_gnews_token(tok)
+            if url:
+                out[link] = url
+                self.decoded += 1
+                continue
+            url = self.cache.get(tok)
+            if url is None:
+                todo.append((link, tok))
+            elif url:
+                out[link] = url
+        if todo and self.head:
+            self._head_all(todo[:self.max_head], out)
+            self.unresolved += max(0, len(todo) - self.max_head)
+        elif todo:
+            self.unresolved += len(todo)
+        m = get_metrics()
+        m.incr("links.decoded", self.decoded)
+        m.incr("links.head", self.via_head)
+        m.incr("links.unresolved", self.unresolved)
+        m.incr("cache.link_hits", self.cache.hits)
+        print(f"[LINKS] resolved={len(out)}, decoded={self.decoded}, head={self.via_head}, "
+              f"cache_hits={self.cache.hits}, unresolved={self.unresolved}")
+        return out
+
+    def is_publisher(self, url: str) -> bool:
+        """원문 URL 로 받아들일 수 있는지 (http(s), 리다이렉트 호스트·*.google.com 아님)"""
+        if not url.startswith(("http://", "https://")):
+            return False
+        netloc = urlparse(url).netloc.lower()
+        host = netloc.rsplit("@", 1)[-1].split(":")[0]
+        return netloc not in self.hosts and host != GOOGLE_DOMAIN and not host.endswith("." + GOOGLE_DOMAIN)
+
+    def _head_one(self, session, link):
+        with self._lock:
+            if self._errors >= self.max_errors:
+                raise ConnectionError("skipped (too many HEAD errors)")
+        try:
+            r = session.head(link, allow_redirects=True, timeout=self.timeout)
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            raise
+        with self._lock:
+            self._errors = 0
+        return r.url, r.status_code
+
+    def _head_all(self, todo, out):
+        if self._session is None:
+            self._session = make_session(self.concurrency)
+        t0 = time.monotonic()
+        with self._lock:
+            self._errors = 0
+        session = self._session
+        pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="links")
+        futures = {pool.submit(self._head_one, session, link): (link, tok) for link, tok in todo}
+        done, pending = wait(futures, timeout=self.deadline)
+        for fut in done:
+            link, tok = futures[fut]
+            try:
+                url, status = fut.result()
+            except Exception:
+                self.unresolved += 1
+                continue
+            if self.is_publisher(url):
+                out[link] = url
+                self.cache.set(tok, url)
+                self.via_head += 1
+            else:
+                self.unresolved += 1
+                if status < 400 and urlparse(url).netloc.lower() in self.hosts:
+                    self.cache.set(tok, "")     # 응답은 왔지만 리다이렉트 없음 → 다시 묻지 않음
+                # 동의/중간 페이지(*.google.com)로 간 경우는 기록하지 않음 → 다음 실행에서 재시도
+        self.unresolved += len(pending)
+        if pending:
+            # deadline 초과: 대기 중인 HEAD 는 취소, 이미 보낸 요청은 timeout 안에 끝남
+            # → 그 세션은 남은 워커가 끝난 뒤 닫고, 이 해석기는 다음 실행부터 새 세션 (close() 가 쓰는 중인 세션을 닫지 않도록)
+            self._session = None
+            threading.Thread(target=_close_after, args=(pool, session), name="links-close", daemon=True).start()
+        else:
+            pool.shutdown()
+        with self._lock:
+            errors = self._errors
+        if errors >= self.max_errors:
+            print(f"[WARN] link HEAD fallback stopped after {errors} consecutive errors")
+        get_metrics().add_time("links.head_secs", time.monotonic() - t0)
+
+    def flush(self):
+        """해석 캐시 저장 (세션은 유지)"""
+        self.cache.save()
+
+    def close(self):
+        self.flush()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
@@ -0,0 +1,319 @@
+# utils/local_model.py
+"""
+로컬 관련성 분류기 (AI 판정과 휴리스틱 사이 단계, numpy 선택 의존성)
+- 학습 데이터: RelevanceEngine 이 새로 받은 AI 판정을 쌓는 로그 (cache.dir/verdict_log.jsonl, 텍스트 + 점수)
+  라벨 = 점수 >= relevance_threshold
+- 특징: 문자 2·3-gram 해시(2^18 버킷, 텍스트마다 1/sqrt(n-gram 수)) + 용어군 적중 수(log1p)
+  용어군 가중치는 scoring.*.weight 로 초기화 → 로그가 적어도 설정 가중치에서 출발
+- 모델: 로지스틱 회귀, 전체 배치 Adagrad + L2. cache.dir/relevance_model.npz (openai.local_model_path)
+- 점수: 배치 텍스트를 코드포인트 배열 하나로 이어 붙여 n-gram 해시와 가중치 합을 bincount 한 번으로 계산
+- 검증: 텍스트 해시로 고정한 20% holdout (학습에 쓰지 않음) → AI 판정과의 일치율 리포트
+    python news_pipeline.py --train-local-model     # 로그로 재학습 + 리포트 + 저장
+    python news_pipeline.py --local-model-report    # 저장된 모델의 holdout 일치율만
+- numpy 가 없거나 모델 파일이 없으면 비활성 (기존 동작 그대로)
+"""
+import os, json, time, hashlib
+from functools import lru_cache
+
+from utils.matcher import SCORING_GROUPS, BLOCK_GROUP
+
+DIM = 1 << 18
+NGRAMS = (2, 3)
+TEXT_LIMIT = 600
+GROUPS = SCORING_GROUPS + (BLOCK_GROUP,)
+BLOCK_PRIOR = -3.0          # 차단 키워드 적중의 초기 가중치
+PRIOR_SCALE = 0.5           # scoring 가중치 → 로그오즈 초기값 배율
+MODEL_FILE = "relevance_model.npz"
+LOG_FILE = "verdict_log.jsonl"
+_MASK = 0xFFFFFFFF
+_NP_ERROR = ""              # numpy import 실패 사유 (경고 표시용)
+
+
+@lru_cache(maxsize=None)
+def _np():
+    """numpy (선택 의존성, 처음 쓸 때 로드). 미설치면 None (사유는 _NP_ERROR)"""
+    global _NP_ERROR
+    try:
+        import numpy
+    except Exception as ex:
+        _NP_ERROR = f"{type(ex).__name__}: {ex}"
+        return None
+    return numpy
+
+
+def _cache_dir(cfg: dict) -> str:
+    return (cfg.get("cache", {}) or {}).get("dir", ".cache")
+
+
+def model_file(cfg: dict) -> str:
+    return (cfg.get("openai", {}) or {}).get("local_model_path") or os.path.join(_cache_dir(cfg), MODEL_FILE)
+
+
+def log_file(cfg: dict) -> str:
+    return os.path.join(_cache_dir(cfg), LOG_FILE)
+
+
+def _norm(text: str) -> str:
+    return " ".join((text or "").replace("\x00", " ").lower().split())[:TEXT_LIMIT]
+
+
+def features(texts: list, matcher):
+    """
+    texts → (버킷 번호, 행 번호, 값, 용어군 행렬) 희소 특징
+    - 텍스트를 NUL 로 이어 UTF-32 코드포인트 배열 하나로 만들고 n-gram 해시를 배열 연산으로 한 번에 계산
+      (NUL 을 포함한 n-gram = 텍스트 경계 → 제외)
+    """
+    np = _np()
+    n = len(texts)
+    cp = np.frombuffer(("\x00".join(_norm(t) for t in texts) + "\x00").encode("utf-32-le"),
+                       dtype=np.uint32).astype(np.uint64)
+    sep = cp == 0
+    row_of = np.cumsum(sep) - sep          # 위치 → 텍스트 번호
+    idx, rows = [], []
+    for k in NGRAMS:
+        m = len(cp) - k + 1
+        if m <= 0:
+            continue
+        h = np.full(m, k, dtype=np.uint64)
+        ok = np.ones(m, dtype=bool)
+        for j in range(k):
+            c = cp[j:j + m]
+            h = (h * np.uint64(0x01000193) + c) & np.uint64(_MASK)
+            ok &= c != 0
+        h ^= h >> np.uint64(13)
+        h = (h * np.uint64(0x5BD1E995)) & np.uint64(_MASK)
+        h ^= h >> np.uint64(15)
+        idx.append((h & np.uint64(DIM - 1))[ok].astype(np.int64))
+        rows.append(row_of[:m][ok])
+    idx = np.concatenate(idx) if idx else np.zeros(0, dtype=np.int64)
+    rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+    per_row = np.bincount(rows, minlength=n)
+    vals = 1.0 / np.sqrt(np.maximum(per_row, 1))[rows]
+    G = np.log1p(np.array([[hits.count(g) for g in GROUPS] for hits in map(matcher.scan, texts)],
+                          dtype=np.float64).reshape(n, len(GROUPS)))
+    return idx, rows, vals, G
+
+
+def group_prior(cfg: dict):
+    """용어군 가중치 초기값 (scoring.*.weight × PRIOR_SCALE, 차단 키워드는 BLOCK_PRIOR)"""
+    from utils.config import get_runtime
+    w = dict(get_runtime(cfg).weights)
+    return _np().array([w.get(g, 0.0) * PRIOR_SCALE for g in SCORING_GROUPS] + [BLOCK_PRIOR])
+
+
+class LocalRelevanceModel:
+    """해시 n-gram + 용어군 로지스틱 회귀 (w: DIM, wg: 용어군, b: 절편)"""
+
+    def __init__(self, w, wg, b: float, meta=None):
+        self.w = w
+        self.wg = wg
+        self.b = float(b)
+        self.meta = meta or {}
+
+    def _logits(self, X, n):
+        np = _np()
+        idx, rows, vals, G = X
+        return np.bincount(rows, weights=self.w[idx] * vals, minlength=n) + G @ self.wg + self.b
+
+    def predict_features(self, X, n):
+        np = _np()
+        return 1.0 / (1.0 + np.exp(-self._logits(X, n)))
+
+    def predict(self, texts: list, matcher) -> list:
+        """texts → 관련 확률 목록 (배치 1회 벡터 연산)"""
+        if not texts:
+            return []
+        return self.predict_features(features(texts, matcher), len(texts)).tolist()
+
+    @classmethod
+    def fit(cls, X, y, prior, epochs=150, lr=0.5, l2=1e-4):
+        """전체 배치 Adagrad (기울기는 버킷별 bincount). 용어군 가중치는 prior 쪽으로 L2"""
+        np = _np()
+        idx, rows, vals, G = X
+        n = len(y)
+        y = np.asarray(y, dtype=np.float64)
+        p0 = min(max(y.mean(), 0.02), 0.98) if n else 0.5
+        model = cls(np.zeros(DIM), prior.astype(np.float64).copy(), np.log(p0 / (1 - p0)))
+        acc_w, acc_g, acc_b = np.full(DIM, 1e-8), np.full(len(prior), 1e-8), 1e-8
+        for _ in range(epochs if n else 0):
+            e = (model.predict_features(X, n) - y) / n
+            gw = np.bincount(idx, weights=vals * e[rows], minlength=DIM) + l2 * model.w
+            gg = G.T @ e + l2 * (model.wg - prior)
+            gb = float(e.sum())
+            acc_w += gw * gw
+            acc_g += gg * gg
+            acc_b += gb * gb
+            model.w -= lr * gw / np.sqrt(acc_w)
+            model.wg -= lr * gg / np.sqrt(acc_g)
+            model.b -= lr * gb / np.sqrt(acc_b)
+        return model
+
+    def save(self, path: str):
+        """임시 파일 → os.replace (w 는 float32 로 저장)"""
+        np = _np()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        meta = dict(self.meta, dim=DIM, ngrams=list(NGRAMS), groups=list(GROUPS))
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, w=self.w.astype(np.float32), wg=self.wg, b=np.array([self.b]),
+                                meta=np.array(json.dumps(meta, ensure_ascii=False)))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str):
+        """저장된 모델 (없거나 특징 구성이 다르면 None)"""
+        np = _np()
+        if np is None or not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as d:
+                meta = json.loads(str(d["meta"]))
+                model = cls(d["w"].astype(np.float64), d["wg"], float(d["b"][0]), meta)
+        except (OSError, ValueError, KeyError) as ex:
+            print(f"[WARN] local model load failed ({path}): {ex}")
+            return None
+        if meta.get("dim") != DIM or meta.get("ngrams") != list(NGRAMS) or meta.get("groups") != list(GROUPS):
+            print(f"[WARN] local model {path} was trained with other features → retrain (--train-local-model)")
+            return None
+        return model
+
+
+def load_local_model(cfg: dict):
+    """openai.local_model 이 켜져 있으면 저장된 모델, 아니면 None"""
+    if not (cfg.get("openai", {}) or {}).get("local_model", False):
+        return None
+    if _np() is None:
+        print(f"[WARN] openai.local_model enabled but numpy cannot be imported ({_NP_ERROR}) → API only "
+              f"(pip install -r requirements.txt)")
+        return None
+    path = model_file(cfg)
+    model = LocalRelevanceModel.load(path)
+    if model is None and not os.path.exists(path):
+        print(f"[WARN] openai.local_model enabled but {path} not found → API only (--train-local-model)")
+    return model
+
+
+# ---- 판정 로그 ----
+
+def append_log(path: str, rows: list):
+    """판정 로그에 추가 (JSONL, 한 줄 = {t, model, text, score})"""
+    if not rows:
+        return
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows))
+    except OSError as ex:
+        print(f"[WARN] verdict log write failed ({path}): {ex}")
+
+
+def read_log(path: str, max_rows=None) -> dict:
+    """판정 로그 → {텍스트: 점수} (같은 텍스트는 마지막 판정, 깨진 줄은 건너뜀)"""
+    out = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    r = json.loads(line)
+                    s = float(r["score"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if s >= 0 and r.get("text"):
+                    out.pop(r["text"], None)
+                    out[r["text"]] = s
+    except OSError:
+        return {}
+    if max_rows and len(out) > max_rows:
+        out = dict(list(out.items())[-max_rows:])
+    return out
+
+
+def is_holdout(text: str) -> bool:
+    """텍스트 해시로 고정한 20% 검증 표본"""
+    return hashlib.sha1(text.encode("utf-8")).digest()[0] % 5 == 0
+
+
+def agreement(probs, labels, low: float, high: float) -> dict:
+    """AI 라벨 대비 일치율 + 확신 구간(≤low / ≥high) 비율·정확도 = API 호출 절감 추정"""
+    np = _np()
+    p = np.asarray(probs, dtype=np.float64)
+    y = np.asarray(labels, dtype=bool)
+    pred = p >= 0.5
+    sure = (p <= low) | (p >= high)
+    tp = int((pred & y).sum())
+    n = len(y)
+
+    def ratio(a, b):
+        return round(a / b, 4) if b else None
+
+    return {"samples": n, "positive_rate": ratio(int(y.sum()), n),
+            "accuracy": ratio(int((pred == y).sum()), n),
+            "precision": ratio(tp, int(pred.sum())), "recall": ratio(tp, int(y.sum())),
+            "confident": int(sure.sum()), "confident_rate": ratio(int(sure.sum()), n),
+            "confident_accuracy": ratio(int(((p >= high) == y)[sure].sum()), int(sure.sum())),
+            "api_calls_saved": ratio(int(sure.sum()), n)}
+
+
+def _bands(cfg: dict):
+    from utils.config import get_runtime
+    o = cfg.get("openai", {}) or {}
+    thr = get_runtime(cfg).relevance_threshold
+    return thr, float(o.get("local_model_low", 0.15)), max(float(o.get("local_model_high", 0.85)), thr)
+
+
+def _print_report(title: str, rep: dict):
+    print(f"[LOCAL] {title}: " + ", ".join(f"{k}={v}" for k, v in rep.items()))
+
+
+def train_from_log(cfg: dict, epochs=150) -> int:
+    """--train-local-model: 판정 로그 80% 로 학습 → holdout 20% 리포트 → 모델 저장. 종료 코드 반환"""
+    if _np() is None:
+        print("❌ numpy is not installed (pip install numpy)")
+        return 1
+    from utils.config import get_runtime
+    o = cfg.get("openai", {}) or {}
+    matcher = get_runtime(cfg).matcher
+    thr, low, high = _bands(cfg)
+    log = read_log(log_file(cfg), int(o.get("local_model_max_samples", 50000)))
+    train = [(t, s >= thr) for t, s in log.items() if not is_holdout(t)]
+    hold = [(t, s >= thr) for t, s in log.items() if is_holdout(t)]
+    if len(train) < 20 or len({y for _, y in train}) < 2:
+        print(f"❌ not enough verdicts in {log_file(cfg)} ({len(log)} rows, need both labels)")
+        return 1
+    t0 = time.perf_counter()
+    texts, labels = zip(*train)
+    model = LocalRelevanceModel.fit(features(list(texts), matcher), labels, group_prior(cfg), epochs=epochs)
+    secs = time.perf_counter() - t0
+    rep = {"train": len(train), "train_secs": round(secs, 2)}
+    if hold:
+        t0 = time.perf_counter()
+        probs = model.predict([t for t, _ in hold], matcher)
+        rep["score_ms_per_100"] = round((time.perf_counter() - t0) * 1000 / len(hold) * 100, 2)
+        rep.update(agreement(probs, [y for _, y in hold], low, high))
+    model.meta = {"trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "threshold": thr, "holdout": rep}
+    path = model_file(cfg)
+    model.save(path)
+    _print_report(f"holdout (low={low}, high={high})", rep)
+    print(f"[OK] saved {path}")
+    return 0
+
+
+def report_from_log(cfg: dict) -> int:
+    """--local-model-report: 저장된 모델을 현재 로그의 holdout 표본으로 평가. 종료 코드 반환"""
+    if _np() is None:
+        print("❌ numpy is not installed (pip install numpy)")
+        return 1
+    from utils.config import get_runtime
+    model = LocalRelevanceModel.load(model_file(cfg))
+    if model is None:
+        print(f"❌ no usable model at {model_file(cfg)} (--train-local-model)")
+        return 1
+    thr, low, high = _bands(cfg)
+    hold = [(t, s >= thr) for t, s in read_log(log_file(cfg)).items() if is_holdout(t)]
+    if not hold:
+        print(f"❌ no holdout verdicts in {log_file(cfg)}")
+        return 1
+    probs = model.predict([t for t, _ in hold], get_runtime(cfg).matcher)
+    print(f"[LOCAL] model trained_at={model.meta.get('trained_at')}, threshold={model.meta.get('threshold')}")
+    _print_report(f"holdout (low={low}, high={high})", agreement(probs, [y for _, y in hold], low, high))
+    return 0
@@ -0,0 +1,248 @@
+# utils/mailer.py
+"""
+SMTP 다이제스트 발송기
+- 설정: config.yaml email 블록 (smtp_host, smtp_port, use_tls, username, from_name, from_addr,
+  to_addrs, reply_to, delivery, teams, subject_prefix ...). 배포 secrets 환경변수가 있으면 우선:
+    GMAIL_USER → username/from_addr 이고 비밀번호는 GMAIL_PASS, TO_LIST → to_addrs
+    GMAIL_USER 가 없을 때만 설정 username + password_env 가 가리키는 변수(없으면 GMAIL_PASS)
+- 인증된 연결 1개를 여러 메시지에 재사용 (max_per_connection 통마다 새 연결), 끊기면 재연결 + 재시도
+- delivery: single(전체 수신자 1통, 기존 방식) / per_recipient(수신자별 1통) / teams(팀별 맞춤 다이제스트)
+- 수신자별 결과(ok / refused / failed)와 메시지별 발송 지연을 보고
+"""
+import os, time, smtplib
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import formataddr
+
+from utils.metrics import get_metrics
+
+SUBJECT_PREFIX = "[특수영업팀 Daily 뉴스클리핑]"     # email.subject_prefix 가 없을 때
+PLAIN_TEXT = "[이원호 사원의 특수영업팀 일일 정유 뉴스] (HTML 버전 참조)"
+DELIVERY_MODES = ("single", "per_recipient", "teams")
+
+
+def _addrs(v) -> list:
+    if isinstance(v, str):
+        v = v.split(",")
+    return [a.strip() for a in (v or []) if a and a.strip()]
+
+
+def mail_settings(cfg: dict) -> dict:
+    e = cfg.get("email", {}) or {}
+    env = os.environ
+    # 계정과 비밀번호는 같은 출처에서: GMAIL_USER 가 있으면 GMAIL_PASS, 없으면 설정 username + password_env
+    if env.get("GMAIL_USER"):
+        username = env["GMAIL_USER"]
+        password = env.get("GMAIL_PASS", "")
+    else:
+        username = e.get("username", "")
+        password = env.get(e.get("password_env") or "SMTP_PASSWORD") or env.get("GMAIL_PASS", "")
+    delivery = (e.get("delivery") or "single").lower()
+    if delivery not in DELIVERY_MODES:
+        print(f"[WARN] unknown email.delivery={delivery} → single")
+        delivery = "single"
+    return {
+        "host": e.get("smtp_host", "smtp.gmail.com"),
+        "port": int(e.get("smtp_port", 587)),
+        "use_tls": bool(e.get("use_tls", True)),
+        "username": username,
+        "password": password,
+        "from_addr": env.get("GMAIL_USER") or e.get("from_addr") or username,
+        "from_name": e.get("from_name", ""),
+        "reply_to": e.get("reply_to"),
+        "subject_prefix": e.get("subject_prefix") or SUBJECT_PREFIX,
+        "to_addrs": _addrs(env.get("TO_LIST")) or _addrs(e.get("to_addrs")),
+        "delivery": delivery,
+        "teams": e.get("teams") or [],
+        "retries": max(0, int(e.get("retries", 3))),
+        "backoff": float(e.get("retry_backoff_secs", 2)),
+        "timeout": float(e.get("timeout_secs", 30)),
+        "max_per_connection": max(1, int(e.get("max_per_connection", 50))),
+    }
+
+
+def daily_subject(st: dict) -> str:
+    """일일 다이제스트 제목 (subject_prefix + 날짜)"""
+    return f"{st.get('subject_prefix') or SUBJECT_PREFIX} {datetime.now().strftime('%Y-%m-%d')}"
+
+
+def build_message(st: dict, html: str, to_addrs, subject=None, text=None) -> MIMEMultipart:
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject or daily_subject(st)
+    msg["From"] = formataddr((st["from_name"], st["from_addr"])) if st["from_name"] else st["from_addr"]
+    msg["To"] = ", ".join(to_addrs)
+    if st.get("reply_to"):
+        msg["Reply-To"] = st["reply_to"]
+    msg.attach(MIMEText(text or PLAIN_TEXT, "plain", "utf-8"))
+    msg.attach(MIMEText(html, "html", "utf-8"))
+    return msg
+
+
+class Mailer:
+    """인증된 SMTP 연결 재사용 발송기 (with Mailer(st) as m: m.send(msg, rcpts))"""
+
+    def __init__(self, st: dict):
+        self.st = st
+        self.conn = None
+        self.connects = 0
+        self._on_conn = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _connect(self):
+        self._drop()
+        st, m = self.st, get_metrics()
+        with m.timer("mail.connect"):
+            conn = smtplib.SMTP(st["host"], st["port"], timeout=st["timeout"])
+            try:
+                if st["use_tls"]:
+                    conn.starttls()
+                if st["username"] and st["password"]:
+                    conn.login(st["username"], st["password"])
+            except BaseException:
+                conn.close()
+                raise
+        self.conn, self._on_conn = conn, 0
+        self.connects += 1
+        m.incr("mail.connects")
+
+    def _drop(self):
+        """응답을 기다리지 않고 연결 폐기 (오류 후 재연결 전)"""
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.conn = None
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._drop()
+
+    def send(self, msg, rcpts) -> dict:
+        """
+        rcpts 에게 msg 1통 발송 → {수신자: (상태, 사유)}
+        - 연결 끊김/4xx 일시 오류: 재연결 후 retries 회까지 재시도 (지수 backoff)
+        - 5xx(인증/발신자 거부 등): 재시도 없이 failed, 일부 수신자 거부: 해당 수신자만 refused
+        """
+        st, m = self.st, get_metrics()
+        data = msg.as_string()
+        last = None
+        for attempt in range(st["retries"] + 1):
+            if attempt:
+                m.incr("mail.retries")
+                time.sleep(st["backoff"] * (2 ** (attempt - 1)))
+            try:
+                if self.conn is None or self._on_conn >= st["max_per_connection"]:
+                    self.close()
+                    self._connect()
+                t0 = time.perf_counter()
+                refused = self.conn.sendmail(st["from_addr"], rcpts, data)
+                m.observe("mail.latency", time.perf_counter() - t0)
+                self._on_conn += 1
+                return {r: ("refused", f"{refused[r][0]} {refused[r][1]!r}") if r in refused else ("ok", "")
+                        for r in rcpts}
+            except smtplib.SMTPRecipientsRefused as ex:
+                return {r: ("refused", f"{ex.recipients.get(r, ('', ''))[0]}") for r in rcpts}
+            except smtplib.SMTPResponseException as ex:
+                last = ex
+                self._drop()
+                if not 400 <= ex.smtp_code < 500:
+                    break
+            except (smtplib.SMTPException, OSError) as ex:
+                last = ex
+                self._drop()
+        return {r: ("failed", f"{type(last).__name__}: {last}") for r in rcpts}
+
+
+class DeliveryReport:
+    def __init__(self):
+        self.outcomes = {}      # 수신자 → (상태, 사유)
+        self.messages = []      # {"digest", "rcpts", "secs", "ok"}
+        self.connects = 0
+
+    @property
+    def delivered(self) -> int:
+        return sum(1 for s, _ in self.outcomes.values() if s == "ok")
+
+    def failures(self) -> dict:
+        return {r: o for r, o in self.outcomes.items() if o[0] != "ok"}
+
+    def as_dict(self) -> dict:
+        return {
+            "delivered": self.delivered,
+            "failed": {r: f"{s}: {why}" for r, (s, why) in self.failures().items()},
+            "messages": self.messages,
+            "connects": self.connects,
+        }
+
+
+def _subset(grouped: dict, majors=None, minors=None) -> dict:
+    """팀 관심 대분류/소분류만 남긴 grouped (없으면 전체)"""
+    out = {}
+    for major, mins in grouped.items():
+        if majors and major not in majors:
+            continue
+        for minor, items in mins.items():
+            if minors and minor not in minors:
+                continue
+            out.setdefault(major, {})[minor] = items
+    return out
+
+
+def plan_digests(st: dict, html: str, grouped=None, render=None, text=None, subject=None) -> list:
+    """
+    발송 계획 → [(이름, 제목 또는 None, html, text, [수신자])] (subject 가 없으면 일일 다이제스트 제목)
+    - single: 전체 수신자에게 1통 / per_recipient: 수신자별 1통 (같은 본문, To 헤더 개인화)
+    - teams: to_addrs 는 전체 다이제스트, teams[*] 는 majors/minors 로 거른 맞춤 다이제스트
+      (grouped/render 가 없으면 팀에도 전체 본문. render 는 html 문자열 또는 .html/.text 를 가진 객체 반환)
+    """
+    mode, to_addrs = st["delivery"], st["to_addrs"]
+    if mode == "per_recipient":
+        return [(addr, subject, html, text, [addr]) for addr in to_addrs]
+    digests = [("all", subject, html, text, to_addrs)] if to_addrs else []
+    if mode == "teams":
+        for i, team in enumerate(st["teams"]):
+            rcpts = _addrs(team.get("to_addrs"))
+            if not rcpts:
+                continue
+            name = team.get("name") or f"team{i + 1}"
+            body, body_text = html, text
+            if grouped is not None and render is not None:
+                body = render(_subset(grouped, team.get("majors"), team.get("minors")))
+                if not isinstance(body, str):
+                    body, body_text = body.html, body.text
+            base = subject or daily_subject(st)
+            digests.append((name, f"{base} ({name})", body, body_text, rcpts))
+    return digests
+
+
+def send_digests(st: dict, digests) -> DeliveryReport:
+    """계획된 다이제스트를 연결 하나로 순서대로 발송"""
+    report = DeliveryReport()
+    m = get_metrics()
+    with Mailer(st) as mailer:
+        for name, subject, html, text, rcpts in digests:
+            if not rcpts:
+                continue
+            t0 = time.perf_counter()
+            outcome = mailer.send(build_message(st, html, rcpts, subject=subject, text=text), rcpts)
+            secs = time.perf_counter() - t0
+            ok = sum(1 for s, _ in outcome.values() if s == "ok")
+            report.outcomes.update(outcome)
+            report.messages.append({"digest": name, "rcpts": len(rcpts), "secs": round(secs, 4), "ok": ok})
+            m.incr("mail.sent", ok)
+            m.incr("mail.refused", sum(1 for s, _ in outcome.values() if s == "refused"))
+            m.incr("mail.failed", sum(1 for s, _ in outcome.values() if s == "failed"))
+        report.connects = mailer.connects
+    m.extra["mail"] = report.as_dict()
+    return report
@@ -0,0 +1,133 @@
+# utils/matcher.py
+"""
+설정 용어 목록 → Aho–Corasick 다중 패턴 매처
+- scoring 6개 용어군 + filters.block_keywords + taxonomy 키워드를 한 오토마톤으로 컴파일
+- 텍스트 1회 순회로 "어떤 용어가 등장했는가"를 구하고, 용어군별 적중 수를 계산
+- 판정 의미는 기존 `t.lower() in text.lower()` 부분문자열 검사와 동일
+  (용어 목록에 같은 용어가 중복되어 있으면 기존처럼 중복 횟수만큼 센다)
+"""
+
+SCORING_GROUPS = ("fuel_core_terms", "demand_signals", "price_signals",
+                  "ops_supply_signals", "soft_penalty", "noise_tokens")
+BLOCK_GROUP = "block_keywords"
+TAXONOMY_GROUP = "taxonomy_keywords"
+
+
+class ScanResult:
+    """scan() 결과: 등장한 패턴 id 집합 + 용어군별 적중 수 조회"""
+    __slots__ = ("_m", "found", "_counts")
+
+    def __init__(self, matcher, found):
+        self._m = matcher
+        self.found = found
+        self._counts = None
+
+    @property
+    def counts(self) -> dict:
+        """용어군 → 적중 용어 수 (등장한 패턴만 순회, 최초 1회 계산)"""
+        if self._counts is None:
+            counts = {}
+            pid_groups = self._m.pid_groups
+            for pid in self.found:
+                for g, n in pid_groups[pid]:
+                    counts[g] = counts.get(g, 0) + n
+            self._counts = counts
+        return self._counts
+
+    def count(self, group: str) -> int:
+        return self.counts.get(group, 0)
+
+    def any(self, group: str) -> bool:
+        return self.counts.get(group, 0) > 0
+
+    def contains(self, term: str):
+        """term 이 등장했는지. 오토마톤에 없는 용어면 None (호출 측이 직접 검사)"""
+        pid = self._m.pattern_ids.get(term.lower())
+        if pid is None:
+            return None
+        return pid in self.found
+
+
+class TermMatcher:
+    def __init__(self, groups: dict):
+        self.pattern_ids = {}     # 소문자 패턴 → id
+        self.groups = {}          # 용어군 → [패턴 id, ...] (중복 용어는 중복 보존)
+        for name, terms in groups.items():
+            ids = []
+            for t in terms or []:
+                p = str(t).lower()
+                ids.append(self.pattern_ids.setdefault(p, len(self.pattern_ids)))
+            self.groups[name] = ids
+        # 패턴 id → ((용어군, 중복 횟수), ...)
+        acc = [{} for _ in self.pattern_ids]
+        for name, ids in self.groups.items():
+            for pid in ids:
+                acc[pid][name] = acc[pid].get(name, 0) + 1
+        self.pid_groups = [tuple(d.items()) for d in acc]
+        self._build()
+
+    def _build(self):
+        goto, fail, out = [{}], [0], [[]]
+        for p, pid in self.pattern_ids.items():
+            s = 0
+            for ch in p:
+                nxt = goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[s][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    out.append([])
+                s = nxt
+            out[s].append(pid)
+        # BFS 로 실패 링크 계산 + 출력 병합
+        queue = list(goto[0].values())
+        for s in queue:
+            for ch, nxt in goto[s].items():
+                queue.append(nxt)
+                f = fail[s]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                cand = goto[f].get(ch, 0)
+                fail[nxt] = cand if cand != nxt else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+        self._always = frozenset(out[0])   # 빈 문자열 패턴은 항상 등장
+
+    def scan(self, text: str) -> ScanResult:
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        found = set(self._always)
+        s = 0
+        for ch in (text or "").lower():
+            if s:
+                while s and ch not in goto[s]:
+                    s = fail[s]
+                s = goto[s].get(ch, 0)
+            else:
+                s = root.get(ch, 0)
+            if out[s]:
+                found.update(out[s])
+        return ScanResult(self, found)
+
+
+def compile_matcher(cfg: dict) -> TermMatcher:
+    sc = cfg.get("scoring", {})
+    groups = {g: sc.get(g, {}).get("terms", []) for g in SCORING_GROUPS}
+    groups[BLOCK_GROUP] = cfg.get("filters", {}).get("block_keywords", [])
+    groups[TAXONOMY_GROUP] = [kw for tax in cfg.get("taxonomy", []) for kw in tax.get("keywords", [])]
+    return TermMatcher(groups)
+
+
+def get_matcher(cfg: dict) -> TermMatcher:
+    """설정 로드 1회당 1번만 컴파일 (cfg['_matcher'] 에 보관, 얕은 복사 cfg 에도 공유)"""
+    m = cfg.get("_matcher")
+    if m is None:
+        m = cfg["_matcher"] = compile_matcher(cfg)
+    return m
+
+
+def scan_text(text: str, cfg: dict) -> ScanResult:
+    return get_matcher(cfg).scan(text)
@@ -0,0 +1,138 @@
+# utils/metrics.py
+"""
+실행 계측: 단계별 타이머/카운터 + JSON 실행 리포트
+- get_metrics().timer("fetch", kw="유가") / .incr("fetch.bytes", n) / .observe("ai.latency", secs)
+- 라벨이 붙은 값은 "이름{k=v,...}" 키로 따로 집계
+- 선택적 프로파일 모드(cProfile / tracemalloc) 결과도 리포트에 포함
+"""
+import os, io, json, time, threading
+from contextlib import contextmanager
+
+PROFILE_ENV = "NEWSBOT_PROFILE"
+
+
+def _key(name: str, labels: dict) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={labels[k]}" for k in sorted(labels)) + "}"
+
+
+class Metrics:
+    def __init__(self):
+        self.started = time.time()
+        self.timers = {}      # key → {"count", "total", "max"}
+        self.counters = {}    # key → 누적 값
+        self.samples = {}     # key → [값, ...] (지연 분포용)
+        self.extra = {}
+        self._lock = threading.Lock()
+
+    def add_time(self, name: str, secs: float, **labels):
+        k = _key(name, labels)
+        with self._lock:
+            t = self.timers.setdefault(k, {"count": 0, "total": 0.0, "max": 0.0})
+            t["count"] += 1
+            t["total"] += secs
+            t["max"] = max(t["max"], secs)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - t0, **labels)
+
+    def incr(self, name: str, n=1, **labels):
+        k = _key(name, labels)
+        with self._lock:
+            self.counters[k] = self.counters.get(k, 0) + n
+
+    def observe(self, name: str, value: float, **labels):
+        k = _key(name, labels)
+        with self._lock:
+            self.samples.setdefault(k, []).append(value)
+
+    def report(self) -> dict:
+        def _dist(vals):
+            v = sorted(vals)
+            pick = lambda q: v[min(len(v) - 1, int(q * len(v)))]
+            return {"count": len(v), "p50": pick(0.5), "p95": pick(0.95), "max": v[-1]}
+        with self._lock:
+            return {
+                "started_at": self.started,
+                "elapsed_secs": round(time.time() - self.started, 3),
+                "timers": {k: {"count": t["count"], "total": round(t["total"], 4), "max": round(t["max"], 4)}
+                           for k, t in sorted(self.timers.items())},
+                "counters": dict(sorted(self.counters.items())),
+                "distributions": {k: _dist(v) for k, v in sorted(self.samples.items()) if v},
+                **self.extra,
+            }
+
+    def write(self, path: str):
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, ensure_ascii=False, indent=1)
+            print(f"[INFO] Saved {path}")
+        except OSError as ex:
+            print(f"[WARN] run report save failed: {ex}")
+
+
+_current = Metrics()
+
+
+def get_metrics() -> Metrics:
+    return _current
+
+
+def reset_metrics() -> Metrics:
+    """실행(run) 시작마다 새 집계기로 교체"""
+    global _current
+    _current = Metrics()
+    return _current
+
+
+@contextmanager
+def profiled(mode: str, metrics: Metrics, prof_path: str = "run_profile.prof", top: int = 25):
+    """
+    mode: "cprofile" → prof_path 에 통계 덤프 + 누적 시간 상위 함수를 리포트에 포함
+          "tracemalloc" → 최대 메모리 + 할당 상위 위치를 리포트에 포함
+          그 외/빈 값 → 아무것도 하지 않음
+    """
+    mode = (mode or "").lower()
+    if mode == "cprofile":
+        import cProfile, pstats
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            prof.dump_stats(prof_path)
+            buf = io.StringIO()
+            pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(top)
+            metrics.extra["profile"] = {"mode": mode, "file": prof_path, "top": buf.getvalue().splitlines()}
+    elif mode == "tracemalloc":
+        import tracemalloc
+        tracemalloc.start(10)
+        try:
+            yield
+        finally:
+            snap = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            metrics.extra["profile"] = {
+                "mode": mode,
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top": [str(s) for s in snap.statistics("lineno")[:top]],
+            }
+    else:
+        yield
+
+
+def profile_mode(argv) -> str:
+    """--profile=cprofile|tracemalloc 인자 또는 NEWSBOT_PROFILE 환경변수"""
+    for a in argv:
+        if a.startswith("--profile="):
+            return a.split("=", 1)[1]
+    return os.environ.get(PROFILE_ENV, "")
@@ -0,0 +1,83 @@
+# utils/ratelimit.py
+"""
+asyncio 토큰 버킷 (요청/분 제한 + 429 Retry-After 반영). asyncio 는 처음 대기할 때 로드
+- adaptive=True: 429 마다 속도를 절반으로 줄이고(min_rate 까지), 성공할 때마다 설정 속도의 1/10 씩 회복 (AIMD)
+- TokenBucket: 스레드용 같은 버킷 (수집 스레드 풀에서 소스별 요청/분 제한)
+"""
+import time, threading
+
+
+class AsyncTokenBucket:
+    def __init__(self, rate_per_sec: float, burst: float = 1.0, adaptive: bool = False):
+        self.rate = self.max_rate = max(rate_per_sec, 1e-6)
+        self.min_rate = self.max_rate / 16
+        self.adaptive = adaptive
+        self.capacity = max(burst, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.not_before = 0.0     # Retry-After 로 지정된 재개 시각
+
+    @classmethod
+    def per_minute(cls, rpm: float, burst: float = 1.0, adaptive: bool = False):
+        return cls(rpm / 60.0, burst, adaptive)
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, n: float = 1.0):
+        import asyncio
+        while True:
+            now = time.monotonic()
+            if now < self.not_before:
+                await asyncio.sleep(self.not_before - now)
+                continue
+            self._refill(now)
+            if self.tokens >= n:
+                self.tokens -= n
+                return
+            await asyncio.sleep((n - self.tokens) / self.rate)
+
+    def pause(self, secs: float):
+        """서버가 요구한 대기(Retry-After) 동안 모든 호출자를 멈춘다"""
+        now = time.monotonic()
+        self.not_before = max(self.not_before, now + max(secs, 0.0))
+        if self.adaptive:
+            self._refill(now)       # 지금까지는 이전 속도로 채우고 이후부터 절반 속도
+            self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0.0
+
+    def succeeded(self):
+        """요청 성공 → (adaptive) 줄였던 속도를 조금씩 회복"""
+        if self.adaptive and self.rate < self.max_rate:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 (acquire 는 토큰이 생길 때까지 블록)"""
+
+    def __init__(self, rate_per_sec: float, burst: float = 1.0):
+        self.rate = max(rate_per_sec, 1e-6)
+        self.capacity = max(burst, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waited = 0.0         # acquire 로 기다린 누적 시간 (초)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, rpm: float, burst: float = 1.0):
+        return cls(rpm / 60.0, burst)
+
+    def acquire(self, n: float = 1.0):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                wait = (n - self.tokens) / self.rate
+                self.waited += wait
+            time.sleep(wait)
@@ -1,8 +1,11 @@
 import os, re, time
-try:
-    from openai import OpenAI
-except Exception:
-    OpenAI = None
+from utils.matcher import scan_text, BLOCK_GROUP
+from utils.kvcache import JsonCache, cache_path
+from utils.ai_batch import BatchChatEngine, openai_sdk, parse_json_array
+from utils.metrics import get_metrics
+from utils.config import get_runtime
+from utils.local_model import load_local_model, append_log, log_file, LOG_FILE
+
 
 AI_SYSTEM = """너는 정유사 영업/기획 담당자다.
 아래 텍스트가 '연료 수요 증가' 또는 '유종 가격 변동'과 직접적으로 연관되면 relevant=True.
@@ -16,10 +19,10 @@ def ai_relevance_score(text: str, cfg: dict) -> float:
     if not cfg.get("openai", {}).get("enable_ai_filter", False):
         return -1.0
     api_key = os.getenv(cfg["openai"].get("api_key_env", "OPENAI_API_KEY") or "")
-    if not api_key or OpenAI is None:
+    if not api_key or openai_sdk() is None:
         return -1.0
 
-    client = OpenAI(api_key=api_key)
+    client = openai_sdk().OpenAI(api_key=api_key)
     model = cfg["openai"].get("relevance_model", "gpt-4o-mini")
     backoff = float(cfg["openai"].get("relevance_backoff_secs", 8))
 
@@ -43,23 +46,147 @@ def ai_relevance_score(text: str, cfg: dict) -> float:
             return -1.0
         return -1.0
 
-def is_relevant(text: str, cfg: dict) -> bool:
-    """AI 점수 또는 휴리스틱으로 기사 관련 여부 판별"""
-    thr = float(cfg["openai"].get("relevance_threshold", 0.65))
-    low = (text or "").lower()
+AI_BATCH_SYSTEM = AI_SYSTEM.rsplit("\n", 1)[0] + """
+입력은 [{"id": 번호, "text": 기사}] 형태의 JSON 배열이다. 기사마다 독립적으로 판단하라.
+JSON 배열 하나로만 답하라: [{"id": 번호, "relevant": true/false, "confidence": 0~1}, ...]"""
+
+TEXT_LIMIT = 1800
+
+
+def _verdict_score(relevant, confidence) -> float:
+    """ai_relevance_score 와 같은 규칙: 관련이면 confidence(없으면 0.8), 아니면 0.0"""
+    if not relevant:
+        return 0.0
+    try:
+        return float(confidence)
+    except (TypeError, ValueError):
+        return 0.8
+
+
+def _parse_verdict(v: dict) -> float:
+    return _verdict_score(v.get("relevant") is True or str(v.get("relevant")).lower() == "true", v.get("confidence"))
+
+
+def parse_batch_answer(ans: str, n: int) -> list:
+    """배치 응답 JSON 배열 → 입력 순서의 점수 목록 (빠진 항목은 -1.0)"""
+    return parse_json_array(ans, n, _parse_verdict, -1.0)
+
+
+class RelevanceEngine(BatchChatEngine):
+    """
+    배치·동시 AI 관련성 판별기 (요청·재시도·동시 실행은 utils.ai_batch.BatchChatEngine, openai.relevance_*)
+    - 판정은 sha256(모델·프롬프트·텍스트) 키로 디스크 캐시 → 이전 실행에서 본 기사는 재판정하지 않음
+    - openai.base_url 로 로컬 스텁 엔드포인트 지정 가능
+    - openai.local_model: 캐시에 없는 기사를 먼저 로컬 분류기(utils.local_model)로 한 번에 점수 매기고,
+      확신 구간(≤local_model_low / ≥local_model_high) 밖의 애매한 기사만 API 로 보냄
+      (선발 단계는 local_scores 로 소분류 bucket 전체를 먼저 걸러 애매한 기사만 AI 예산에 넣음)
+    - 새로 받은 AI 판정은 로컬 분류기 학습용 로그(cache.dir/verdict_log.jsonl)에도 남김 (openai.verdict_log)
+    """
+
+    KIND = "relevance"
+    SYSTEM = AI_BATCH_SYSTEM
+    TEXT_LIMIT = TEXT_LIMIT
+    MISSING = -1.0
+
+    def __init__(self, cfg: dict):
+        o = cfg.get("openai", {}) or {}
+        super().__init__(cfg, "relevance", o.get("relevance_model", "gpt-4o-mini"), batch_size=10, backoff=8)
+        self.cache = JsonCache(cache_path(cfg, "verdicts.json"),
+                               ttl_secs=float(o.get("verdict_ttl_days", 30)) * 86400,
+                               max_items=int(o.get("verdict_max_items", 50000)))
+        self.local_decided = 0  # 로컬 분류기가 확정한 기사 수
+        self.local = load_local_model(cfg)
+        if self.local is not None:
+            rt = get_runtime(cfg)
+            self._matcher = rt.matcher
+            self.local_low = float(o.get("local_model_low", 0.15))
+            self.local_high = max(float(o.get("local_model_high", 0.85)), rt.relevance_threshold)
+        # 판정 로그는 디스크 캐시를 쓸 때만 (cache.enabled)
+        self.log_path = log_file(cfg) if cache_path(cfg, LOG_FILE) and o.get("verdict_log", True) else None
+        self._log = []
+
+    def parse_item(self, v: dict) -> float:
+        return _parse_verdict(v)
+
+    def lookup(self, text: str):
+        """캐시된 판정 점수 (없으면 None)"""
+        return self.cache.get(self.key(text))
+
+    def classify(self, texts: list, local: bool = True) -> list:
+        """
+        texts 를 판정해 점수 목록 반환 (0~1, 실패는 -1.0). 캐시 적중분·로컬 확정분은 호출하지 않음
+        local=False: 이미 local_scores 로 걸러낸 애매한 기사 → 로컬 분류기를 다시 돌리지 않음
+        """
+        scores = [self.lookup(t) for t in texts]
+        todo = [i for i, s in enumerate(scores) if s is None]
+        if todo and local and self.local is not None:
+            todo = self._local_pass(texts, todo, scores)
+        if todo and self.available:
+            fresh = self.request_all([texts[i] for i in todo])
+            for i, s in zip(todo, fresh):
+                scores[i] = s
+                if s >= 0:
+                    self.cache.set(self.key(texts[i]), s)
+                    if self.log_path:
+                        self._log.append({"t": round(time.time()), "model": self.model,
+                                          "text": (texts[i] or "")[:TEXT_LIMIT], "score": s})
+        return [(-1.0 if s is None else s) for s in scores]
+
+    def local_scores(self, texts: list) -> list:
+        """
+        로컬 분류기로 texts 를 한 번에 점수 매김 → 확신 구간이면 점수(≥high: 확률, ≤low: 0.0), 애매하면 None
+        로컬 분류기가 없으면 모두 None. 캐시·판정 로그에는 남기지 않음
+        """
+        if self.local is None or not texts:
+            return [None] * len(texts)
+        m = get_metrics()
+        t0 = time.perf_counter()
+        probs = self.local.predict(texts, self._matcher)
+        m.observe("ai.local_latency", time.perf_counter() - t0, kind="relevance")
+        out = [round(p, 4) if p >= self.local_high else 0.0 if p <= self.local_low else None for p in probs]
+        decided = sum(s is not None for s in out)
+        self.local_decided += decided
+        m.incr("ai.local_decided", decided, kind="relevance")
+        return out
+
+    def _local_pass(self, texts, todo, scores) -> list:
+        """todo 중 로컬 분류기 확신 구간은 scores 에 채움 → 남은(애매한) 번호 목록"""
+        rest = []
+        for i, s in zip(todo, self.local_scores([texts[i] for i in todo])):
+            if s is None:
+                rest.append(i)
+            else:
+                scores[i] = s
+        return rest
+
+    def flush(self):
+        """판정 캐시 저장 (클라이언트/이벤트 루프는 유지 → 상주 실행에서 다음 실행이 재사용)"""
+        get_metrics().incr("cache.verdict_hits", self.cache.hits)
+        self.cache.save()
+        if self._log:
+            append_log(self.log_path, self._log)
+            self._log = []
+
+
+def is_relevant(text: str, cfg: dict, hits=None, ai_score=None) -> bool:
+    """
+    AI 점수 또는 휴리스틱으로 기사 관련 여부 판별
+    - hits: scan_text() 결과 재사용
+    - ai_score: 이미 구한 AI 점수(RelevanceEngine). 음수면 AI 실패/미사용 → 휴리스틱
+    """
+    thr = get_runtime(cfg).relevance_threshold
+    if hits is None:
+        hits = scan_text(text, cfg)
 
     # 블랙리스트 즉시 차단
-    for w in cfg["filters"].get("block_keywords", []):
-        if w.lower() in low:
-            return False
+    if hits.any(BLOCK_GROUP):
+        return False
 
-    score = ai_relevance_score(text, cfg)
+    score = ai_relevance_score(text, cfg) if ai_score is None else ai_score
     if score >= 0:
         return score >= thr
 
     # AI 실패 시 휴리스틱 fallback
-    sig = cfg["scoring"]
-    def _hit(terms): return any(t.lower() in low for t in terms)
-    if _hit(sig["price_signals"]["terms"]) or _hit(sig["demand_signals"]["terms"]) or _hit(sig["ops_supply_signals"]["terms"]):
+    if hits.any("price_signals") or hits.any("demand_signals") or hits.any("ops_supply_signals"):
         return True
     return False
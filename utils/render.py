@@ -0,0 +1,141 @@
+# utils/render.py
+"""
+다이제스트 렌더링 (Jinja2, templates/ 디렉터리)
+- 템플릿은 프로세스당 한 번 컴파일해 재사용 (jinja2 도 첫 렌더 때 로드), HTML 은 autoescape (제목의 <, & 등)
+- 바이트 예산(email.max_html_bytes): Gmail 은 본문이 약 102KB 를 넘으면 잘라 보이므로
+  카드별 크기를 재서 소분류마다 순위 순으로 번갈아 채우고, 못 넣은 하위 기사는 "N건 더 보기" 링크로 대체
+- HTML 과 text/plain 본문을 같은 항목 목록으로 함께 생성
+- 요약 단계가 채운 기사 요약(brief)이 있으면 카드/텍스트에 함께 표시
+"""
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from urllib.parse import quote_plus
+
+from utils.article import NO_TIME
+from utils.metrics import get_metrics
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+DEFAULT_MAX_BYTES = 100_000
+DEFAULT_HEADING = "[이원호 사원의 특수영업팀 일일 정유 뉴스]"
+_MORE_KEYWORDS = 5
+_SEP = "\x00"
+
+
+@dataclass
+class Digest:
+    html: str
+    text: str
+    shown: int = 0
+    total: int = 0
+    hidden: dict = field(default_factory=dict)    # (major, minor) → 생략 건수
+    bytes: int = 0
+
+
+@lru_cache(maxsize=None)
+def _env(template_dir: str = TEMPLATE_DIR) -> "Environment":
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=False),
+        trim_blocks=True, lstrip_blocks=True,
+    )
+    return env
+
+
+def _size(s) -> int:
+    return len(str(s).encode("utf-8"))
+
+
+def more_url(cfg: dict, major: str, minor: str) -> str:
+    """소분류 키워드로 Google News 검색 (생략된 기사 확인용)"""
+    kws = next((t["keywords"] for t in cfg.get("taxonomy", [])
+                if t.get("major") == major and t.get("minor") == minor), None) or [minor]
+    gn = cfg.get("sources", {}).get("google_news", {})
+    q = " OR ".join(kws[:_MORE_KEYWORDS])
+    return (f"https://news.google.com/search?q={quote_plus(q)}"
+            f"&hl={gn.get('hl', 'ko')}&gl={gn.get('gl', 'KR')}&ceid={quote_plus(gn.get('ceid', 'KR:ko'))}")
+
+
+def _fit(sections, budget):
+    """
+    소분류마다 순위 1위부터 라운드로빈으로 카드를 넣다가 예산을 넘는 소분류는 거기서 멈춤
+    (위 소분류가 아래 소분류 자리를 다 차지하지 않도록)
+    """
+    minors = [m for sec in sections for m in sec["minors"]]
+    used, depth = 0, 0
+    open_ = list(minors)
+    while open_:
+        nxt = []
+        for m in open_:
+            if depth >= len(m["sizes"]):
+                continue
+            size = m["sizes"][depth]
+            if budget is not None and used + size > budget:
+                continue
+            used += size
+            nxt.append(m)
+        for m in nxt:
+            m["n"] = depth + 1
+        open_ = nxt
+        depth += 1
+    return used
+
+
+def render_digest(grouped: dict, cfg: dict, start_dt, end_dt, heading: str = DEFAULT_HEADING,
+                  template_dir: str = TEMPLATE_DIR) -> Digest:
+    from markupsafe import Markup
+    env = _env(template_dir)
+    cards_t = env.get_template("_cards.html")
+    max_bytes = int(cfg.get("email", {}).get("max_html_bytes", DEFAULT_MAX_BYTES) or 0)
+    ctx = {"heading": heading, "start": start_dt.strftime('%Y-%m-%d %H:%M'), "end": end_dt.strftime('%Y-%m-%d %H:%M')}
+
+    sections, total = [], 0
+    for major, minors in grouped.items():
+        sec = {"major": major, "minors": []}
+        for minor, items in minors.items():
+            if not items:
+                continue
+            # 표시 값(제목, 링크, 게시 시각, 요약)은 HTML/text 가 함께 쓰도록 한 번만 계산
+            rows = [(it["title"], it["link"], it.get("published_local") or NO_TIME, it.get("brief") or "")
+                    for it in items]
+            # 소분류 카드를 한 번에 렌더해 구분자로 나눔 (카드별 매크로 호출보다 빠름)
+            cards = cards_t.render(rows=rows, sep=_SEP).split(_SEP)[:-1]
+            sizes = [_size(c) + 1 for c in cards]
+            total += len(items)
+            sec["minors"].append({"minor": minor, "all": rows, "all_cards": cards, "sizes": sizes, "n": len(items),
+                                  "hidden": 0, "more_url": more_url(cfg, major, minor)})
+        sections.append(sec)
+
+    html_t, text_t = env.get_template("digest.html"), env.get_template("digest.txt")
+
+    def _skeleton(more):
+        """카드 없이 렌더한 골격 크기 (more: 모든 소분류에 더 보기 링크 포함 → 상한)"""
+        return _size(html_t.render(sections=[
+            {"major": s["major"], "minors": [{**m, "cards": "", "hidden": len(m["all"]) if more else 0}
+                                             for m in s["minors"]]}
+            for s in sections], **ctx))
+
+    minors_all = [m for sec in sections for m in sec["minors"]]
+    if max_bytes and _skeleton(False) + sum(sum(m["sizes"]) for m in minors_all) > max_bytes:
+        for m in minors_all:
+            m["n"] = 0
+        _fit(sections, max(0, max_bytes - _skeleton(True)))
+    for m in minors_all:
+        m["cards"] = Markup("".join(c + "\n" for c in m["all_cards"][:m["n"]]))   # _cards.html 에서 이미 escape
+        m["shown"] = m["all"][:m["n"]]
+        m["hidden"] = len(m["all"]) - m["n"]
+    html = html_t.render(sections=sections, **ctx)
+    if max_bytes and _size(html) > max_bytes:
+        print(f"[WARN] digest still exceeds budget: {_size(html)} > {max_bytes} bytes")
+    text = text_t.render(sections=sections, **ctx)
+
+    hidden = {(s["major"], m["minor"]): m["hidden"] for s in sections for m in s["minors"] if m["hidden"]}
+    d = Digest(html=html, text=text, total=total, shown=total - sum(hidden.values()), hidden=hidden,
+               bytes=_size(html))
+    m = get_metrics()
+    m.observe("render.bytes", d.bytes)
+    if hidden:
+        m.incr("render.truncated", total - d.shown)
+        print(f"[RENDER] budget {max_bytes}B: {d.shown}/{total} items shown, {total - d.shown} behind 'more' links")
+    return d
@@ -0,0 +1,138 @@
+# utils/replay.py
+"""
+녹화된 RSS 응답 재생(replay) 전송 계층
+- 픽스처 디렉터리: manifest.json + 키워드별 XML 파일
+    {"created_at": ..., "feeds": {"유가": {"file": "<sha1>.xml", "status": 200, "headers": {...}}}}
+- ReplayAdapter 를 requests 세션에 마운트하면 google_news_rss 가 네트워크 대신 픽스처를 읽는다
+  (config: fetch.replay_dir). 요청 URL 의 q 파라미터(" when:1d" 제외)로 키워드를 찾는다
+- scale > 1 이면 항목을 배수로 복제(링크/제목 변형)해 부하 시험용 대용량 피드를 만든다
+- 녹화 시각(created_at) 기준 pubDate 를 현재 시각으로 평행 이동해 시간창 필터를 그대로 통과시킨다
+"""
+import os, re, json, time, hashlib
+from email.utils import parsedate_to_datetime, format_datetime
+from datetime import timedelta
+from urllib.parse import urlparse, parse_qs
+
+import requests
+from requests.adapters import BaseAdapter
+
+MANIFEST = "manifest.json"
+_ITEM_RE = re.compile(r"<item\b.*?</item>", re.S)
+_PUBDATE_RE = re.compile(r"<pubDate>([^<]*)</pubDate>")
+
+
+def query_keyword(url: str) -> str:
+    q = parse_qs(urlparse(url).query).get("q", [""])[0]
+    return re.sub(r"\s+when:\S+$", "", q)
+
+
+def fixture_name(keyword: str) -> str:
+    return hashlib.sha1(keyword.encode("utf-8")).hexdigest()[:16] + ".xml"
+
+
+def load_manifest(fixture_dir: str) -> dict:
+    with open(os.path.join(fixture_dir, MANIFEST), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_fixture(fixture_dir: str, keyword: str, body: bytes, status: int = 200, headers=None, created_at=None):
+    """키워드 응답 1건 저장 + manifest 갱신 (created_at: 새 manifest 의 녹화 시각, 기본 현재)"""
+    os.makedirs(fixture_dir, exist_ok=True)
+    path = os.path.join(fixture_dir, MANIFEST)
+    try:
+        manifest = load_manifest(fixture_dir)
+    except (OSError, ValueError):
+        manifest = {"created_at": time.time() if created_at is None else created_at, "feeds": {}}
+    name = fixture_name(keyword)
+    with open(os.path.join(fixture_dir, name), "wb") as f:
+        f.write(body)
+    manifest["feeds"][keyword] = {"file": name, "status": status, "headers": dict(headers or {})}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+
+def scale_feed(xml: str, scale: int) -> str:
+    """<item> 을 scale 배로 복제. 복제본은 링크/GUID/제목이 달라 별개 기사로 취급된다"""
+    if scale <= 1:
+        return xml
+    items = _ITEM_RE.findall(xml)
+    if not items:
+        return xml
+    def _link(m, i):
+        sep = "&amp;" if "?" in m.group(1) else "?"
+        return f"<link>{m.group(1)}{sep}rep={i}</link>"
+
+    copies = []
+    for i in range(1, scale):
+        for it in items:
+            it2 = re.sub(r"<link>([^<]*)</link>", lambda m: _link(m, i), it, count=1)
+            it2 = re.sub(r"(<guid[^>]*>[^<]*?)(</guid>)", rf"\g<1>-r{i}\g<2>", it2, count=1)
+            it2 = re.sub(r"(<title>[^<]*?)(</title>)", rf"\g<1> #{i}\g<2>", it2, count=1)
+            copies.append(it2)
+    end = xml.rfind("</channel>")
+    return xml[:end] + "".join(copies) + xml[end:]
+
+
+def shift_dates(xml: str, delta_secs: float) -> str:
+    """모든 <pubDate> 를 delta_secs 만큼 이동 (해석 불가 날짜는 그대로)"""
+    if abs(delta_secs) < 1:
+        return xml
+    delta = timedelta(seconds=delta_secs)
+
+    def _shift(m):
+        try:
+            return f"<pubDate>{format_datetime(parsedate_to_datetime(m.group(1)) + delta)}</pubDate>"
+        except (TypeError, ValueError):
+            return m.group(0)
+    return _PUBDATE_RE.sub(_shift, xml)
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests 전송 어댑터: 요청을 픽스처 응답으로 대체 (없는 키워드는 404)"""
+
+    def __init__(self, fixture_dir: str, scale: int = 1, rebase: bool = True):
+        super().__init__()
+        manifest = load_manifest(fixture_dir)
+        self.fixture_dir = fixture_dir
+        self.scale = max(1, int(scale))
+        self.feeds = manifest.get("feeds", {})
+        self.delta = (time.time() - manifest.get("created_at", time.time())) if rebase else 0.0
+        self._bodies = {}
+
+    def _body(self, keyword: str, meta: dict) -> bytes:
+        body = self._bodies.get(keyword)
+        if body is None:
+            with open(os.path.join(self.fixture_dir, meta["file"]), "rb") as f:
+                raw = f.read()
+            if self.scale > 1 or self.delta:
+                xml = shift_dates(raw.decode("utf-8"), self.delta)
+                raw = scale_feed(xml, self.scale).encode("utf-8")
+            body = self._bodies[keyword] = raw
+        return body
+
+    def send(self, request, **kwargs):
+        keyword = query_keyword(request.url)
+        meta = self.feeds.get(keyword)
+        resp = requests.Response()
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self
+        if meta is None:
+            resp.status_code = 404
+            resp._content = b""
+        else:
+            resp.status_code = int(meta.get("status", 200))
+            resp.headers.update(meta.get("headers", {}))
+            resp._content = self._body(keyword, meta)
+        resp.encoding = "utf-8"
+        return resp
+
+    def close(self):
+        pass
+
+
+def mount_replay(session: requests.Session, fixture_dir: str, scale: int = 1, rebase: bool = True) -> requests.Session:
+    adapter = ReplayAdapter(fixture_dir, scale=scale, rebase=rebase)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
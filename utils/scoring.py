@@ -1,27 +1,32 @@
-def _count_hits(text_low: str, terms: list) -> int:
-    return sum(1 for t in terms if t.lower() in text_low)
+from utils.config import get_runtime
 
-def compute_score(text: str, cfg: dict) -> float:
-    tl = (text or "").lower()
+def compute_score(text: str, cfg: dict, hits=None) -> float:
+    """
+    hits: 같은 텍스트의 scan_text() 결과(있으면 재사용, 없으면 1회 스캔)
+    가중치는 RuntimeConfig.weights (fuel_core/demand/price/ops_supply 가산, soft_penalty/noise_tokens 감산)
+    """
+    rt = get_runtime(cfg)
+    if hits is None:
+        hits = rt.matcher.scan(text)
     S = 0.0
-    S += cfg["scoring"].get("base", 0.0)
-
-    S += cfg["scoring"]["fuel_core_terms"]["weight"] * _count_hits(tl, cfg["scoring"]["fuel_core_terms"]["terms"])
-    S += cfg["scoring"]["demand_signals"]["weight"] * _count_hits(tl, cfg["scoring"]["demand_signals"]["terms"])
-    S += cfg["scoring"]["price_signals"]["weight"]  * _count_hits(tl, cfg["scoring"]["price_signals"]["terms"])
-    S += cfg["scoring"]["ops_supply_signals"]["weight"] * _count_hits(tl, cfg["scoring"]["ops_supply_signals"]["terms"])
-
-    # 연성/정치 잡음 페널티
-    S += cfg["scoring"]["soft_penalty"]["weight"] * _count_hits(tl, cfg["scoring"]["soft_penalty"]["terms"])
-
-    # 노이즈 토큰 소폭 페널티
-    S += cfg["scoring"]["noise_tokens"]["weight"] * _count_hits(tl, cfg["scoring"]["noise_tokens"]["terms"])
+    S += rt.base_score
+    counts = hits.counts
+    for group, weight in rt.weights:
+        S += weight * counts.get(group, 0)
     return S
 
-def apply_unrelated_penalty(hit_keywords: set, text: str, cfg: dict) -> float:
+def apply_unrelated_penalty(hit_keywords: set, text: str, cfg: dict, hits=None) -> float:
     """키워드 한두 개만 걸리고 유종/시그널 연관이 거의 없으면 소폭 페널티(선택)."""
     # 간단히 보수적 처리: 키워드 매칭 없으면 -0.5
-    tl = (text or "").lower()
-    if not any(k.lower() in tl for k in hit_keywords):
-        return -0.5
-    return 0.0
+    if hits is None:
+        hits = get_runtime(cfg).matcher.scan(text)
+    tl = None
+    for k in hit_keywords:
+        hit = hits.contains(k)
+        if hit is None:   # taxonomy 밖의 키워드 → 직접 부분문자열 검사
+            if tl is None:
+                tl = (text or "").lower()
+            hit = k.lower() in tl
+        if hit:
+            return 0.0
+    return -0.5
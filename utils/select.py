@@ -0,0 +1,89 @@
+# utils/select.py
+"""
+스트리밍 선발용 유한 크기 자료구조
+- TopK: 순위 키 상위 cap 개만 보관하는 min-heap (heap[0] 이 보관 중 최하위)
+- BorderlinePool: 상위 k 컷오프 ± margin 근처 항목만 남기는 풀 (AI 판정 후보 계획용)
+- 같은 키면 먼저 도착한(seq 가 작은) 항목이 앞선다 → 기존 안정 정렬과 같은 순서
+"""
+import heapq
+
+
+class TopK:
+    def __init__(self, cap: int):
+        self.cap = max(0, int(cap))
+        self.heap = []      # (key, -seq, item)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, key, seq: int, item):
+        """보관하면 밀려난 (seq, item) 또는 None, 순위 밖이면 (seq, item) 자신을 반환"""
+        entry = (key, -seq, item)
+        if len(self.heap) < self.cap:
+            heapq.heappush(self.heap, entry)
+            return None
+        if not self.heap or entry[:2] <= self.heap[0][:2]:
+            return seq, item
+        _, neg, old = heapq.heapreplace(self.heap, entry)
+        return -neg, old
+
+    def ranked(self):
+        """[(seq, item), ...] 순위 순 (최상위 먼저)"""
+        return [(-neg, item) for key, neg, item in sorted(self.heap, key=lambda e: e[:2], reverse=True)]
+
+
+class BorderlinePool:
+    """
+    점수 상위 k 번째와 k+1 번째의 중간(컷오프)에서 margin 이내인 항목을 찾기 위한 풀.
+    - 상위 k+1 개 점수만 유지. 현재 k+1 번째 점수 - margin 보다 낮은 항목은 버린다
+      (컷오프 ≥ k+1 번째 점수이고 이 점수는 커지기만 하므로, 버린 항목은 끝까지 후보가 될 수 없다)
+    - 버린 항목보다 높은 점수는 모두 풀에 남으므로 풀 안의 순위 = 전체 순위
+    """
+
+    _EPS = 1e-9    # 부동소수 경계 오차 여유
+
+    def __init__(self, k: int, margin: float):
+        self.k = max(0, int(k))
+        self.margin = float(margin)
+        self.tops = []      # 상위 k+1 점수 (min-heap)
+        self.pool = []      # [score, seq, item, decided]
+        self.count = 0
+        self._limit = 64
+
+    def _floor(self):
+        if len(self.tops) <= self.k:
+            return None
+        return self.tops[0] - self.margin - self._EPS
+
+    def push(self, score: float, seq: int, item, decided: bool = False):
+        """버려진 항목 [(seq, item, decided), ...] 반환"""
+        self.count += 1
+        if len(self.tops) <= self.k:
+            heapq.heappush(self.tops, score)
+        elif score > self.tops[0]:
+            heapq.heapreplace(self.tops, score)
+        floor = self._floor()
+        if floor is not None and score < floor:
+            return [(seq, item, decided)]
+        self.pool.append([score, seq, item, decided])
+        if len(self.pool) <= self._limit or floor is None:
+            return []
+        kept, dropped = [], []
+        for e in self.pool:
+            (kept if e[0] >= floor else dropped).append(e)
+        self.pool = kept
+        self._limit = max(64, 2 * len(kept))
+        return [(seq, item, decided) for _, seq, item, decided in dropped]
+
+    def cutoff(self):
+        """컷오프 점수 (항목이 없으면 None)"""
+        if not self.tops:
+            return None
+        if self.count > self.k:
+            s = sorted(self.tops, reverse=True)
+            return (s[self.k - 1] + s[self.k]) / 2.0 if self.k else s[0]
+        return self.tops[0]
+
+    def ranked(self):
+        """[(rank, entry), ...] 점수 내림차순 (동점은 도착 순). entry = [score, seq, item, decided]"""
+        return list(enumerate(sorted(self.pool, key=lambda e: (-e[0], e[1]))))
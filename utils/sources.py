@@ -0,0 +1,294 @@
+# utils/sources.py
+"""
+수집 소스 어댑터 + 병렬 수집 스케줄러
+- 어댑터는 모두 정규화 entry(feedparser 호환, feed_cache.ENTRY_FIELDS 만) 목록을 가진 피드를 반환
+    google_news : 소분류 키워드마다 검색 RSS 1건 (기존 수집, sources.google_news)
+    rss         : 언론사/기관 고정 RSS·Atom 1건 (url: http(s) 또는 path: 로컬 파일)
+    archive     : 로컬 JSON / JSONL 기사 목록 [{title, link, summary, id, published(ISO8601 또는 epoch)}]
+  고정 피드(rss/archive)의 기사는 제목·요약에 소분류 키워드가 들어 있을 때만 그 소분류 후보가 된다
+- 설정: sources 아래 이름별 블록 (kind 생략 시 이름이 곧 kind)
+    rpm: 소스별 분당 요청 상한, timeout_secs: 요청 1건 타임아웃, minors: 이 소분류에만 사용, enabled: false 로 끔
+- 스케줄러(fetch_sources): 전 소스의 요청을 한 스레드 풀(fetch_all)에서 동시 실행 + 소스별 상태(health) 집계
+- 소스 간 같은 기사는 EntryIndex 에서 정규화 URL / 제목 지문(bare_title)으로 파싱 전에 합친다
+"""
+import os, json, time, threading, statistics
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from urllib.parse import quote_plus, urlparse
+
+from utils.fetch import fetch_all, USER_AGENT
+from utils.feed_cache import compact_feed, _fp
+from utils.metrics import get_metrics
+from utils.ratelimit import TokenBucket
+
+SOURCE_KINDS = ("google_news", "rss", "archive")
+_PUBLISHER_MAX = 30      # "제목 - 매체명" 꼬리로 볼 최대 길이
+
+
+def bare_title(title: str) -> str:
+    """Google News 식 "제목 - 매체명" 에서 매체명 꼬리를 뗀 제목 (소스 간 제목 지문 비교용)"""
+    head, sep, tail = (title or "").rpartition(" - ")
+    if sep and head.strip() and len(tail) <= _PUBLISHER_MAX:
+        return head
+    return title or ""
+
+
+def google_news_url(query, cfg):
+    base = cfg["sources"]["google_news"]["base"]
+    params = {
+        "q": f'{query} when:1d',
+        "hl": cfg["sources"]["google_news"]["hl"],
+        "gl": cfg["sources"]["google_news"]["gl"],
+        "ceid": cfg["sources"]["google_news"]["ceid"],
+    }
+    q = "&".join([f"{k}={quote_plus(v)}" for k, v in params.items()])
+    return f"{base}?{q}"
+
+
+def fetch_feed(url, session=None, timeout=15, cache=None, parser=None):
+    """
+    HTTP(S) RSS/Atom 1건 → 정규화 피드
+    - cache: FeedCache (조건부 GET, 304 면 저장된 entries), parser: ItemParseCache (상주 실행, 본 item 재파싱 없음)
+    """
+    headers = {"User-Agent": USER_AGENT}
+    if cache is not None:
+        headers.update(cache.conditional_headers(url))
+    m = get_metrics()
+    if session is None:
+        import requests as session
+    r = session.get(url, headers=headers, timeout=timeout)
+    m.incr("fetch.requests")
+    if r.status_code == 304 and cache is not None:
+        d = cache.cached_feed(url, r.headers)
+        if d is not None:
+            m.incr("cache.feed_hits")
+            return d
+        # 캐시가 그 사이 사라졌으면 조건 없이 다시 받는다
+        r = session.get(url, headers={"User-Agent": USER_AGENT}, timeout=timeout)
+    r.raise_for_status()
+    m.incr("fetch.bytes", len(r.content))
+    with m.timer("parse.feed"):
+        if parser is not None:
+            d = parser.parse(r.text)
+        else:
+            d = _fp().parse(r.text)
+    m.incr("fetch.entries", len(d.entries))
+    if cache is not None:
+        cache.store(url, r.headers, d)
+    return d if parser is not None else compact_feed(d)    # 소분류 처리 전까지 보관되므로 쓰는 필드만 남긴다
+
+
+def google_news_rss(query, cfg, session=None, timeout=15, cache=None, parser=None):
+    """parser: ItemParseCache (상주 실행) → 이전에 본 item 은 재파싱하지 않음"""
+    return fetch_feed(google_news_url(query, cfg), session, timeout, cache, parser)
+
+
+def _epoch(v):
+    """ISO8601 문자열 / epoch 숫자 → epoch (해석 불가면 None, 시간대 없으면 UTC)"""
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        return float(v)
+    if not isinstance(v, str) or not v.strip():
+        return None
+    try:
+        dt = datetime.fromisoformat(v.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def normalize_entry(d: dict):
+    """기사 dict → 정규화 entry (published_parsed 는 UTC struct_time)"""
+    e = _fp().FeedParserDict({k: d[k] for k in ("title", "summary", "link", "id") if d.get(k)})
+    ts = _epoch(d.get("published"))
+    if ts is not None:
+        e["published"] = datetime.fromtimestamp(ts, timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT")
+        e["published_parsed"] = time.gmtime(ts)
+    return e
+
+
+@dataclass
+class SourceHealth:
+    """실행 1회 동안의 소스 상태"""
+    requests: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    entries: int = 0
+    latency: list = field(default_factory=list)
+    last_error: str = ""
+
+    def line(self) -> str:
+        p50 = f"{statistics.median(self.latency) * 1000:.0f}ms" if self.latency else "-"
+        err = f", last_error={self.last_error}" if self.last_error else ""
+        return (f"requests={self.requests}, failed={self.failed}, timed_out={self.timed_out}, "
+                f"entries={self.entries}, p50={p50}{err}")
+
+
+class Source:
+    """
+    소스 어댑터 기반 클래스
+    - per_query: True 면 소분류 키워드마다 요청, False 면 고정 피드 1건을 키워드로 소분류에 배정
+    - fetch(query, session, timeout, cache, parser) → 정규화 피드 (entries 속성)
+    """
+    kind = ""
+    per_query = False
+
+    def __init__(self, name: str, spec: dict, cfg: dict):
+        self.name = name
+        self.spec = spec
+        self.cfg = cfg
+        self.timeout = float(spec["timeout_secs"]) if spec.get("timeout_secs") else None
+        rpm = float(spec.get("rpm") or 0)
+        self.limiter = TokenBucket.per_minute(rpm) if rpm > 0 else None
+        self.minors = frozenset(spec.get("minors") or ())
+        self.health = SourceHealth()
+        self._lock = threading.Lock()
+
+    def serves(self, tax) -> bool:
+        return not self.minors or tax["minor"] in self.minors
+
+    def queries(self, tax) -> list:
+        return list(tax["keywords"]) if self.per_query else [""]
+
+    def url_of(self, query) -> str:
+        raise NotImplementedError
+
+    def fetch(self, query, session, timeout, cache=None, parser=None):
+        raise NotImplementedError
+
+    def record(self, secs=None, entries=0, error=None, timed_out=False):
+        with self._lock:
+            h = self.health
+            h.requests += 1
+            if secs is not None:
+                h.latency.append(secs)
+            h.entries += entries
+            if error is not None:
+                h.failed += 1
+                h.timed_out += int(timed_out)
+                h.last_error = f"{type(error).__name__}: {error}"[:200]
+
+
+class GoogleNewsSource(Source):
+    kind = "google_news"
+    per_query = True
+
+    def url_of(self, query):
+        return google_news_url(query, self.cfg)
+
+    def fetch(self, query, session, timeout, cache=None, parser=None):
+        return google_news_rss(query, self.cfg, session=session, timeout=timeout, cache=cache, parser=parser)
+
+
+class RSSSource(Source):
+    """고정 RSS/Atom (url 이 http(s) 면 공유 세션·피드 캐시 사용, path / file:// 이면 로컬 파일)"""
+    kind = "rss"
+
+    def __init__(self, name, spec, cfg):
+        super().__init__(name, spec, cfg)
+        self.location = spec.get("url") or spec.get("path") or ""
+
+    @property
+    def is_http(self) -> bool:
+        return urlparse(self.location).scheme in ("http", "https")
+
+    def url_of(self, query):
+        return self.location if self.is_http else "file://" + os.path.abspath(self._path())
+
+    def _path(self):
+        loc = self.location
+        return urlparse(loc).path if loc.startswith("file://") else loc
+
+    def fetch(self, query, session, timeout, cache=None, parser=None):
+        if self.is_http:
+            return fetch_feed(self.location, session, timeout, cache, parser)
+        with open(self._path(), "r", encoding="utf-8") as f:
+            text = f.read()
+        m = get_metrics()
+        m.incr("fetch.bytes", len(text.encode("utf-8")))
+        with m.timer("parse.feed"):
+            d = parser.parse(text) if parser is not None else compact_feed(_fp().parse(text))
+        m.incr("fetch.entries", len(d.entries))
+        return d
+
+
+class ArchiveSource(Source):
+    """로컬 JSON 배열 / JSONL 기사 목록"""
+    kind = "archive"
+
+    def __init__(self, name, spec, cfg):
+        super().__init__(name, spec, cfg)
+        self.path = spec.get("path") or ""
+
+    def url_of(self, query):
+        return "file://" + os.path.abspath(self.path)
+
+    def fetch(self, query, session, timeout, cache=None, parser=None):
+        with open(self.path, "r", encoding="utf-8") as f:
+            text = f.read()
+        if text.lstrip().startswith("["):
+            rows = json.loads(text)
+        else:
+            rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+        entries = [normalize_entry(r) for r in rows if isinstance(r, dict)]
+        get_metrics().incr("fetch.entries", len(entries))
+        return _fp().FeedParserDict(entries=entries)
+
+
+ADAPTERS = {"google_news": GoogleNewsSource, "rss": RSSSource, "archive": ArchiveSource}
+
+
+def sources_from_config(cfg: dict) -> list:
+    """sources 블록 → 어댑터 목록 (설정 순서, enabled: false 제외)"""
+    out = []
+    for name, spec in (cfg.get("sources") or {}).items():
+        spec = spec or {}
+        if spec.get("enabled", True) is False:
+            continue
+        out.append(ADAPTERS[spec.get("kind") or name](name, spec, cfg))
+    return out
+
+
+def minor_feeds(sources, tax) -> list:
+    """소분류가 읽을 피드 키 [(소스, 쿼리)] (소스 순 → 키워드 순)"""
+    return [(src, q) for src in sources if src.serves(tax) for q in src.queries(tax)]
+
+
+def fetch_sources(sources, taxonomy, cfg, session=None, cache=None, parser=None) -> dict:
+    """
+    전 소스 × 쿼리를 동시에 수집 → {(소스 이름, 쿼리): 피드 또는 Exception}
+    - 호스트별 동시 요청 수·전체 데드라인은 fetch 블록, 소스별 rpm/timeout_secs 는 각 소스 블록
+    - 소스별 상태는 src.health (실행마다 새로 집계)
+    """
+    by_name = {src.name: src for src in sources}
+    keys = list(dict.fromkeys((src.name, q) for tax in taxonomy for src, q in minor_feeds(sources, tax)))
+    for src in sources:
+        src.health = SourceHealth()
+
+    def _one(key, session, timeout):
+        src = by_name[key[0]]
+        if src.limiter is not None:
+            src.limiter.acquire()
+        t0 = time.perf_counter()
+        try:
+            d = src.fetch(key[1], session, src.timeout or timeout, cache=cache, parser=parser)
+        except Exception as ex:
+            src.record(time.perf_counter() - t0, error=ex)
+            raise
+        src.record(time.perf_counter() - t0, entries=len(d.entries))
+        return d
+
+    feeds = fetch_all(keys, _one, lambda key: by_name[key[0]].url_of(key[1]), cfg, session=session,
+                      label_of=lambda key: key[1] if by_name[key[0]].per_query else key[0])
+    for key, v in feeds.items():
+        if isinstance(v, TimeoutError) and str(v).startswith("deadline"):     # fetch_all 데드라인 초과분
+            by_name[key[0]].record(error=v, timed_out=True)
+    m = get_metrics()
+    for src in sources:
+        h = src.health
+        m.incr("source.requests", h.requests, source=src.name)
+        m.incr("source.failed", h.failed, source=src.name)
+        m.incr("source.entries", h.entries, source=src.name)
+        print(f"[SOURCE] {src.name} ({src.kind}): {h.line()}")
+    return feeds
@@ -0,0 +1,116 @@
+# utils/state.py
+"""
+실행 간 기사 상태 저장소 (SQLite, 단일 파일)
+- 키: 정규화 URL, 보조 키: 제목 지문(토큰 집합 해시)
+- 기록: 최초/최근 발견 시각, 사전 점수, AI 판정 점수, 발송 시각
+- 이미 발송된 기사는 다음 실행에서 파싱/점수/AI 이전에 제외
+- TTL 압축으로 크기 유지 (GitHub Actions 에서는 cache.dir 과 함께 actions/cache 로 보존)
+"""
+import os, time, sqlite3, hashlib
+
+from utils.dedupe import _tokenize_title
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url_key      TEXT PRIMARY KEY,
+    title_fp     TEXT,
+    first_seen   REAL NOT NULL,
+    last_seen    REAL NOT NULL,
+    pre_score    REAL,
+    ai_score     REAL,
+    delivered_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_title_fp ON articles(title_fp);
+CREATE INDEX IF NOT EXISTS idx_articles_last_seen ON articles(last_seen);
+"""
+
+
+def title_fingerprint(title: str) -> str:
+    """어순/불용어/구두점 차이에 둔감한 제목 지문 (토큰이 없으면 빈 문자열)"""
+    toks = sorted(set(_tokenize_title(title or "")))
+    if not toks:
+        return ""
+    return hashlib.sha1(" ".join(toks).encode("utf-8")).hexdigest()[:20]
+
+
+class StateStore:
+    def __init__(self, path: str, ttl_days: float = 7):
+        self.path = path
+        self.ttl_secs = float(ttl_days) * 86400
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # 상주 실행에서는 스케줄러 작업 스레드마다 사용하고 메인 스레드에서 닫음 (동시 사용은 ctx.lock 으로 직렬화)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.skipped = 0
+        self._load()
+
+    @classmethod
+    def from_config(cls, cfg: dict):
+        """state.enabled 가 꺼져 있으면 None"""
+        st = cfg.get("state", {}) or {}
+        if not st.get("enabled", False):
+            return None
+        path = st.get("path") or os.path.join((cfg.get("cache", {}) or {}).get("dir", ".cache"), "state.sqlite3")
+        return cls(path, ttl_days=st.get("ttl_days", 7))
+
+    def _load(self):
+        """발송 이력/AI 판정은 실행 시작 시 메모리로 올려 조회 비용 제거"""
+        self.delivered_urls, self.delivered_fps, self.ai_scores = set(), set(), {}
+        for url_key, fp, ai, delivered in self.conn.execute(
+                "SELECT url_key, title_fp, ai_score, delivered_at FROM articles"):
+            if delivered is not None:
+                self.delivered_urls.add(url_key)
+                if fp:
+                    self.delivered_fps.add(fp)
+            if ai is not None:
+                self.ai_scores[url_key] = ai
+
+    def is_delivered(self, url_key: str, title: str = "") -> bool:
+        if url_key in self.delivered_urls:
+            return True
+        fp = title_fingerprint(title)
+        return bool(fp) and fp in self.delivered_fps
+
+    def ai_score(self, url_key: str):
+        return self.ai_scores.get(url_key)
+
+    def record(self, rows, now=None):
+        """rows: (url_key, title, pre_score, ai_score) 반복자. 있으면 최근 발견 시각/점수만 갱신"""
+        now = now or time.time()
+        data = [(k, title_fingerprint(t), now, now, ps, (ai if ai is not None and ai >= 0 else None))
+                for k, t, ps, ai in rows if k]
+        self.conn.executemany(
+            """INSERT INTO articles (url_key, title_fp, first_seen, last_seen, pre_score, ai_score)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(url_key) DO UPDATE SET
+                   last_seen = excluded.last_seen,
+                   pre_score = COALESCE(excluded.pre_score, pre_score),
+                   ai_score  = COALESCE(excluded.ai_score, ai_score)""", data)
+        self.conn.commit()
+
+    def mark_delivered(self, rows, now=None):
+        """rows: (url_key, title) 반복자"""
+        now = now or time.time()
+        data = [(k, title_fingerprint(t), now, now, now) for k, t in rows if k]
+        self.conn.executemany(
+            """INSERT INTO articles (url_key, title_fp, first_seen, last_seen, delivered_at)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(url_key) DO UPDATE SET delivered_at = excluded.delivered_at,
+                                                  last_seen = excluded.last_seen""", data)
+        self.conn.commit()
+        for k, fp, *_ in data:
+            self.delivered_urls.add(k)
+            if fp:
+                self.delivered_fps.add(fp)
+
+    def compact(self, now=None) -> int:
+        """TTL 지난 기사 삭제 + 파일 정리. 삭제 수 반환"""
+        now = now or time.time()
+        cur = self.conn.execute("DELETE FROM articles WHERE last_seen < ?", (now - self.ttl_secs,))
+        self.conn.commit()
+        if cur.rowcount:
+            self.conn.execute("VACUUM")
+        return cur.rowcount
+
+    def close(self):
+        self.conn.close()
@@ -1,11 +1,17 @@
 # utils/summarize.py
+"""
+기사 1~2문장 요약
+- summarize_1_2: 기사 1건 (기존 단건 API)
+- SummaryEngine: 최종 다이제스트 기사만 배치·동시 요약 (utils.ai_batch.BatchChatEngine, openai.summarize_*)
+  적응형 토큰 버킷(429 → Retry-After 대기 + 속도 절반), 요약은 디스크 캐시.
+  빠지거나 실패한 기사만 _heuristic 으로 대체
+"""
 import os, time, re
-try:
-    from openai import OpenAI
-    import openai as openai_pkg
-except Exception:
-    OpenAI = None
-    openai_pkg = None
+
+from utils.kvcache import JsonCache, cache_path
+from utils.ai_batch import BatchChatEngine, openai_sdk, parse_json_array
+from utils.metrics import get_metrics
+
 
 SYSTEM_PROMPT = """너는 정유사 내부 전파용 뉴스 요약 비서다.
 - 정유/석유제품/유통/조달/채널 관련 핵심 사실만 1~2문장으로.
@@ -25,13 +31,13 @@ def _heuristic(text: str) -> str:
 
 def summarize_openai(text: str, cfg: dict, delay_secs: float, backoff_secs: float):
     """OpenAI로 1~2문장 요약. 429일 때 백오프."""
-    if OpenAI is None:
+    if openai_sdk() is None:
         return _heuristic(text)
     api_key = os.getenv(cfg["openai"].get("api_key_env", "OPENAI_API_KEY") or "")
     if not api_key:
         return _heuristic(text)
 
-    client = OpenAI(api_key=api_key)
+    client = openai_sdk().OpenAI(api_key=api_key)
     prompt = f"다음 기사를 1~2문장으로 요약:\n\n{(text or '')[:4000]}"
 
     for attempt in range(3):
@@ -71,3 +77,72 @@ def summarize_1_2(text: str, cfg: dict):
     delay = float(cfg["openai"].get("summarize_delay_secs", 1.5))
     backoff = float(cfg["openai"].get("summarize_backoff_secs", 20))
     return summarize_openai(text, cfg, delay, backoff)
+
+
+SUMMARY_BATCH_SYSTEM = SYSTEM_PROMPT + """
+입력은 [{"id": 번호, "text": 기사}] 형태의 JSON 배열이다. 기사마다 따로 요약하라.
+JSON 배열 하나로만 답하라: [{"id": 번호, "summary": "요약"}, ...]"""
+
+TEXT_LIMIT = 1500
+
+
+def _parse_summary(v: dict):
+    text = v.get("summary")
+    return text.strip() if isinstance(text, str) and text.strip() else None
+
+
+def parse_summaries(ans: str, n: int) -> list:
+    """배치 응답 JSON 배열 → 입력 순서의 요약 목록 (빠지거나 빈 항목은 None)"""
+    return parse_json_array(ans, n, _parse_summary)
+
+
+class SummaryEngine(BatchChatEngine):
+    """
+    배치·동시 요약기
+    - provider=heuristic, API 키/SDK 없음 → 모든 기사 _heuristic
+    - 캐시에는 모델 요약만 저장 (휴리스틱 대체분은 다음 실행에서 다시 시도)
+    """
+
+    KIND = "summarize"
+    SYSTEM = SUMMARY_BATCH_SYSTEM
+    TEXT_LIMIT = TEXT_LIMIT
+    TEMPERATURE = 0.2
+    TOKENS_PER_ITEM = 120
+
+    def __init__(self, cfg: dict):
+        o = cfg.get("openai", {}) or {}
+        super().__init__(cfg, "summarize", o.get("summarize_model") or o.get("model", "gpt-4o-mini"),
+                         batch_size=8, backoff=20, adaptive=True)
+        self.provider = (o.get("provider") or "openai").lower()
+        self.cache = JsonCache(cache_path(cfg, "summaries.json"),
+                               ttl_secs=float(o.get("summary_ttl_days", 30)) * 86400,
+                               max_items=int(o.get("summary_max_items", 20000)))
+        self.fallbacks = 0      # _heuristic 으로 대체한 기사 수
+
+    @property
+    def available(self) -> bool:
+        return self.provider != "heuristic" and super().available
+
+    def parse_item(self, v: dict):
+        return _parse_summary(v)
+
+    def summarize(self, texts: list) -> list:
+        """texts → 요약 목록 (캐시 적중분은 호출하지 않음, 실패분은 _heuristic)"""
+        out = [self.cache.get(self.key(t)) for t in texts]
+        todo = [i for i, s in enumerate(out) if s is None]
+        if todo and self.available:
+            fresh = self.request_all([texts[i] for i in todo])
+            for i, s in zip(todo, fresh):
+                if s is not None:
+                    out[i] = s
+                    self.cache.set(self.key(texts[i]), s)
+        for i, s in enumerate(out):
+            if s is None:
+                self.fallbacks += 1
+                out[i] = _heuristic(texts[i])
+        return out
+
+    def flush(self):
+        """요약 캐시 저장 (클라이언트/이벤트 루프는 유지)"""
+        get_metrics().incr("cache.summary_hits", self.cache.hits)
+        self.cache.save()